@@ -0,0 +1,298 @@
+"""Per-client admission control: cost-based token buckets and in-flight limits.
+
+Each client (a known API key, otherwise the client IP) has a token bucket
+that refills at ``rate`` tokens per second up to ``burst``. A request is
+charged by its estimated cost, not counted once, so a 10 MB upload drains
+far more than pasted text. Extra work discovered later, such as the number
+of PDF pages actually read, is charged after the fact and may leave the
+bucket in debt. In-flight limits are per process. Stores that do network
+I/O are called from a thread so they never block the event loop.
+"""
+import asyncio
+import hashlib
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from fastapi.responses import JSONResponse
+
+from cache import LocalCache
+
+# Scope key under which the middleware records who a request is charged to
+CLIENT_SCOPE_KEY = "admission.client"
+
+
+class TokenBucketStore:
+    """Storage interface for token buckets, so limits can be shared across processes"""
+
+    # True when ``take`` waits on I/O and must not run on the event loop
+    blocking = False
+
+    def take(self, key: str, cost: float, rate: float, burst: float, force: bool = False) -> float:
+        """Remove ``cost`` tokens and return 0, or return seconds until they would be available.
+
+        With ``force`` the tokens are always removed, even into debt.
+        """
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        return 0
+
+
+class LocalTokenBucketStore(TokenBucketStore):
+    """In-process buckets; idle buckets expire once they would have refilled, as in Redis"""
+
+    def __init__(self, maxsize: int = 100_000):
+        self._buckets = LocalCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+
+    def take(self, key: str, cost: float, rate: float, burst: float, force: bool = False) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key) or (burst, now)
+            tokens = min(burst, tokens + (now - updated) * rate)
+            wait = 0.0
+            if tokens >= cost or force:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / rate
+            # A full bucket is the same as none; one second of slack as in the Redis script
+            self._buckets.set(key, (tokens, now), ttl=(burst - tokens) / rate + 1)
+        return wait
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class RedisTokenBucketStore(TokenBucketStore):
+    """Buckets in Redis, shared by every worker and replica; needs the redis package"""
+
+    blocking = True
+
+    SCRIPT = """
+    local now = redis.call('TIME')
+    now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+    local cost, rate, burst, force = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), ARGV[4] == '1'
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = tonumber(state[1]) or burst
+    local updated = tonumber(state[2]) or now
+    tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+    local wait = 0
+    if tokens >= cost or force then
+        tokens = tokens - cost
+    else
+        wait = (cost - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+    redis.call('PEXPIRE', KEYS[1], math.ceil((burst - tokens) / rate * 1000) + 1000)
+    return tostring(wait)
+    """
+
+    def __init__(self, url: str, prefix: str = "resumescore:ratelimit:"):
+        import redis
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+        self._script = self._client.register_script(self.SCRIPT)
+
+    def take(self, key: str, cost: float, rate: float, burst: float, force: bool = False) -> float:
+        return float(self._script(keys=[self.prefix + key], args=[cost, rate, burst, int(force)]))
+
+    def clear(self) -> None:
+        for key in self._client.scan_iter(self.prefix + "*"):
+            self._client.delete(key)
+
+
+@dataclass
+class Rejection:
+    """Why a request was refused and when the client may retry"""
+    reason: str
+    retry_after: int
+    detail: str
+
+
+class AdmissionController:
+    """Decides whether a client may start another analysis.
+
+    ``rate`` of 0 turns off the token buckets; a ``max_in_flight`` or
+    ``max_in_flight_per_client`` of 0 turns off that limit.
+    """
+
+    def __init__(self, store: Optional[TokenBucketStore] = None, rate: float = 1.0, burst: float = 120.0,
+                 max_in_flight: int = 0, max_in_flight_per_client: int = 4):
+        self.store = store if store is not None else LocalTokenBucketStore()
+        self.rate = rate
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self.max_in_flight_per_client = max_in_flight_per_client
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, int] = {}
+        self.rejections: Dict[str, int] = {"rate": 0, "in_flight": 0, "client_in_flight": 0}
+
+    def admit(self, client: str, cost: float) -> Optional[Rejection]:
+        """Reserve an in-flight slot and charge ``cost`` tokens, or say why not"""
+        with self._lock:
+            total = sum(self._in_flight.values())
+            if self.max_in_flight and total >= self.max_in_flight:
+                return self._reject("in_flight", 1, "Server is at capacity. Retry shortly.")
+            if self.max_in_flight_per_client and self._in_flight.get(client, 0) >= self.max_in_flight_per_client:
+                return self._reject(
+                    "client_in_flight", 1,
+                    f"Too many concurrent analyses (limit {self.max_in_flight_per_client} per client)."
+                )
+            self._in_flight[client] = self._in_flight.get(client, 0) + 1
+
+        if self.rate > 0:
+            # A request costing more than a full bucket is admitted only when the bucket is full
+            wait = self.store.take(client, min(cost, self.burst), self.rate, self.burst)
+            if wait > 0:
+                self.release(client)
+                with self._lock:
+                    return self._reject("rate", math.ceil(wait), "Rate limit exceeded.")
+        return None
+
+    async def admit_async(self, client: str, cost: float) -> Optional[Rejection]:
+        """``admit`` for the event loop"""
+        if self.store.blocking and self.rate > 0:
+            return await asyncio.to_thread(self.admit, client, cost)
+        return self.admit(client, cost)
+
+    def _reject(self, reason: str, retry_after: int, detail: str) -> Rejection:
+        self.rejections[reason] += 1
+        return Rejection(reason=reason, retry_after=max(1, retry_after), detail=detail)
+
+    def release(self, client: str):
+        """Free the in-flight slot taken by ``admit``"""
+        with self._lock:
+            count = self._in_flight.get(client, 0) - 1
+            if count > 0:
+                self._in_flight[client] = count
+            else:
+                self._in_flight.pop(client, None)
+
+    def charge(self, client: Optional[str], cost: float):
+        """Charge work discovered after admission; the bucket may go into debt"""
+        if client and self.rate > 0 and cost > 0:
+            self.store.take(client, cost, self.rate, self.burst, force=True)
+
+    async def charge_async(self, client: Optional[str], cost: float):
+        """``charge`` for the event loop"""
+        if self.store.blocking and client and self.rate > 0 and cost > 0:
+            await asyncio.to_thread(self.charge, client, cost)
+        else:
+            self.charge(client, cost)
+
+    def reset(self):
+        with self._lock:
+            self._in_flight.clear()
+        self.store.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            in_flight = sum(self._in_flight.values())
+            clients = len(self._in_flight)
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "in_flight": in_flight,
+            "clients_in_flight": clients,
+            "max_in_flight": self.max_in_flight,
+            "max_in_flight_per_client": self.max_in_flight_per_client,
+            "rejections": dict(self.rejections),
+        }
+
+
+def hash_api_key(api_key: str) -> str:
+    """Short stable id for an API key, so raw keys are never stored or logged"""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+class AdmissionControlMiddleware:
+    """Apply an AdmissionController to matching requests before their bodies are read.
+
+    Only requests whose method is in ``methods`` and whose path starts with
+    one of ``path_prefixes`` are controlled. The up-front cost is
+    ``base_cost`` (or the method's entry in ``method_base_costs``) plus one
+    token per ``bytes_per_token`` of declared body;
+    bodies sent without Content-Length are charged as they arrive.
+    Requests with an API key listed in ``api_keys`` get their own bucket;
+    everyone else is limited by IP. Behind ``trusted_proxies`` reverse
+    proxies the IP is read from X-Forwarded-For, counting that many entries
+    from the right: entries further left are whatever the client sent.
+    """
+
+    def __init__(self, app, controller: AdmissionController, path_prefixes: Iterable[str],
+                 methods: Iterable[str] = ("POST",), base_cost: float = 1.0,
+                 bytes_per_token: int = 64 * 1024, api_keys: Iterable[str] = (),
+                 trusted_proxies: int = 0, method_base_costs: Optional[Dict[str, float]] = None):
+        self.app = app
+        self.controller = controller
+        self.path_prefixes = tuple(path_prefixes)
+        self.methods = tuple(methods)
+        self.base_cost = base_cost
+        self.method_base_costs = dict(method_base_costs or {})
+        self.bytes_per_token = bytes_per_token
+        self.api_keys = {hash_api_key(key) for key in api_keys}
+        self.trusted_proxies = trusted_proxies
+
+    def client_id(self, scope) -> Tuple[str, int]:
+        """Who the request is charged to, and its declared body size"""
+        api_key = None
+        forwarded = []
+        content_length = 0
+        for name, value in scope.get("headers", []):
+            if name == b"x-api-key":
+                api_key = value.decode("latin-1")
+            elif name == b"x-forwarded-for":
+                forwarded += value.decode("latin-1").split(",")
+            elif name == b"content-length" and value.isdigit():
+                content_length = int(value)
+        if api_key and hash_api_key(api_key) in self.api_keys:
+            return "key:" + hash_api_key(api_key), content_length
+        # Each proxy appends the address it received the request from
+        if self.trusted_proxies and len(forwarded) >= self.trusted_proxies:
+            return "ip:" + forwarded[-self.trusted_proxies].strip(), content_length
+        client = scope.get("client")
+        return "ip:" + (client[0] if client else "unknown"), content_length
+
+    async def __call__(self, scope, receive, send):
+        if (scope["type"] != "http" or scope["method"] not in self.methods
+                or not scope["path"].startswith(self.path_prefixes)):
+            await self.app(scope, receive, send)
+            return
+
+        client, content_length = self.client_id(scope)
+        base_cost = self.method_base_costs.get(scope["method"], self.base_cost)
+        rejection = await self.controller.admit_async(client, base_cost + content_length / self.bytes_per_token)
+        if rejection is not None:
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": rejection.detail},
+                headers={"Retry-After": str(rejection.retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def counting_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+            return message
+
+        scope[CLIENT_SCOPE_KEY] = client
+        try:
+            await self.app(scope, counting_receive if not content_length else receive, send)
+        finally:
+            self.controller.release(client)
+            if not content_length:
+                await self.controller.charge_async(client, received / self.bytes_per_token)
@@ -0,0 +1,123 @@
+"""Deterministic synthetic resumes and PDF/DOCX fixtures"""
+import io
+import random
+from typing import List
+
+from docx import Document
+
+SIZES = {
+    'small': 8,
+    'medium': 40,
+    'large': 200,
+}
+
+_VERBS = [
+    'Developed', 'Led', 'Implemented', 'Managed', 'Designed', 'Improved',
+    'Reduced', 'Created', 'Coordinated', 'Analyzed', 'Organized', 'Trained'
+]
+_SKILLS = [
+    'Python', 'Java', 'React', 'SQL', 'AWS', 'Docker', 'Kubernetes', 'machine learning',
+    'data science', 'Agile', 'project management', 'financial modeling', 'Figma',
+    'budgeting', 'patient care', 'compliance', 'PostgreSQL', 'microservices'
+]
+_OBJECTS = [
+    'a customer-facing reporting platform', 'the internal billing service',
+    'quarterly planning across three teams', 'an onboarding program for new hires',
+    'the data pipeline feeding executive dashboards', 'a migration to managed cloud services'
+]
+_OUTCOMES = [
+    'cutting processing time by 40%', 'serving over 2 million monthly users',
+    'saving $250K annually', 'improving retention by 15 points',
+    'with zero downtime', 'ahead of schedule and under budget'
+]
+
+
+def synthetic_resume(bullets: int, seed: int = 0) -> str:
+    """Generate a plausible resume with the given number of experience bullets"""
+    rng = random.Random(seed)
+    lines = [
+        "Jordan Avery",
+        "Senior Software Engineer",
+        "jordan.avery@example.com | 555-123-4567",
+        "",
+        "SUMMARY",
+        "Engineer with a decade of experience building reliable, well-tested systems. "
+        "Comfortable owning projects from design through delivery.",
+        "",
+        "EXPERIENCE",
+    ]
+    for i in range(bullets):
+        if i % 6 == 0:
+            lines.append(f"Company {i // 6 + 1}, Engineer, {2010 + i // 6}-{2011 + i // 6}")
+        lines.append(
+            f"• {rng.choice(_VERBS)} {rng.choice(_OBJECTS)} using "
+            f"{rng.choice(_SKILLS)} and {rng.choice(_SKILLS)}, {rng.choice(_OUTCOMES)}."
+        )
+    lines += [
+        "",
+        "EDUCATION",
+        "B.S. Computer Science, State University, 2010",
+        "",
+        "SKILLS",
+        "• " + ", ".join(rng.sample(_SKILLS, 8)),
+        "",
+        "PROJECTS",
+        "• Open-source contributor to data tooling projects.",
+    ]
+    return "\n".join(lines)
+
+
+def make_pdf(pages: List[str]) -> bytes:
+    """Build a minimal PDF with Helvetica text, one entry per page.
+
+    Each line of a page's text is drawn on its own baseline so extractors
+    return it as a separate line.
+    """
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"]
+    kids = []
+    for text in pages:
+        shown = []
+        for line in text.split("\n"):
+            escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            shown.append(f"({escaped}) Tj")
+        ops = "BT /F1 10 Tf 12 TL 50 760 Td " + " T* ".join(shown) + " ET"
+        stream = ops.encode("cp1252", "replace")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % k for k in kids), len(kids))
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def make_docx(paragraphs: List[str]) -> bytes:
+    """Build a DOCX file with one paragraph per entry"""
+    doc = Document()
+    for paragraph in paragraphs:
+        doc.add_paragraph(paragraph)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def resume_pdf(text: str, lines_per_page: int = 50) -> bytes:
+    """Lay resume text out over as many PDF pages as it needs"""
+    lines = text.split("\n")
+    pages = ["\n".join(lines[i:i + lines_per_page]) for i in range(0, len(lines), lines_per_page)]
+    return make_pdf(pages)
+
+
+def resume_docx(text: str) -> bytes:
+    """Resume text as a DOCX with one paragraph per line"""
+    return make_docx(text.split("\n"))
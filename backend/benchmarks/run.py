@@ -0,0 +1,340 @@
+"""Benchmark the scoring pipeline and compare against a saved baseline.
+
+Runs entirely in-process with no network access. From ``backend/``::
+
+    python -m benchmarks.run                          # print a results table
+    python -m benchmarks.run --output results.json    # also save results
+    python -m benchmarks.run --save-baseline          # record benchmarks/baseline.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json --tolerance 0.25
+    python -m benchmarks.run --load --concurrency 16 --requests 200
+
+With ``--baseline`` the run exits non-zero when any benchmark's p50 latency
+is more than ``tolerance`` slower than the recorded value.
+"""
+import argparse
+import asyncio
+import difflib
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from benchmarks.fixtures import SIZES, resume_docx, resume_pdf, synthetic_resume
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+PDF_WORKERS = min(4, os.cpu_count() or 1)
+
+# (name, setup, fn): setup runs untimed before every call to fn
+Benchmark = Tuple[str, Optional[Callable[[], None]], Callable[[], object]]
+
+
+def summarize(samples: List[float], peak_bytes: int) -> Dict[str, float]:
+    """Latency percentiles (ms), throughput (ops/s) and peak traced memory (KiB)"""
+    timings = np.array(samples)
+    return {
+        "iterations": len(samples),
+        "p50_ms": round(float(np.percentile(timings, 50)) * 1000, 3),
+        "p95_ms": round(float(np.percentile(timings, 95)) * 1000, 3),
+        "p99_ms": round(float(np.percentile(timings, 99)) * 1000, 3),
+        "mean_ms": round(float(timings.mean()) * 1000, 3),
+        "throughput_per_s": round(len(samples) / float(timings.sum()), 2) if timings.sum() else 0.0,
+        "peak_memory_kib": round(peak_bytes / 1024, 1),
+    }
+
+
+def measure(fn: Callable[[], object], setup: Optional[Callable[[], None]] = None,
+            iterations: int = 20, warmup: int = 2) -> Dict[str, float]:
+    """Time ``fn`` over several iterations, then trace one extra call for peak memory"""
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+
+    samples = []
+    for _ in range(iterations):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+
+    # Memory is traced separately because tracemalloc slows every allocation
+    if setup:
+        setup()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return summarize(samples, peak)
+
+
+@contextmanager
+def admission_control_disabled():
+    """Every benchmark request comes from one client; measure the pipeline, not the rate limiter"""
+    import main
+    admission = main.admission
+    limits = admission.rate, admission.max_in_flight, admission.max_in_flight_per_client
+    admission.rate = admission.max_in_flight = admission.max_in_flight_per_client = 0
+    try:
+        yield
+    finally:
+        admission.rate, admission.max_in_flight, admission.max_in_flight_per_client = limits
+
+
+def build_benchmarks(sizes: List[str]) -> List[Benchmark]:
+    """Benchmarks for each analyzer, extractor and endpoint at every resume size.
+
+    Run the endpoint benchmarks inside ``admission_control_disabled``.
+    """
+    from fastapi.testclient import TestClient
+    import main
+    from document import parse_document
+    from extraction import DOCX_CONTENT_TYPE, PDF_CONTENT_TYPE, PdfOptions, extract_text
+    from pdf_extractors import available_pdf_extractors
+    from matching import JobIndex
+    from resources import get_stop_words
+
+    client = TestClient(main.app)
+    PARALLEL_PDF_OPTIONS = PdfOptions(workers=PDF_WORKERS, parallel_min_pages=2)
+
+    def clear_caches():
+        main.result_cache.clear()
+        main.extraction_cache.clear()
+
+    def post_ok(*args, **kwargs):
+        response = client.post(*args, **kwargs)
+        if response.status_code != 200:
+            raise RuntimeError(f"{args[0]} returned {response.status_code}: {response.text}")
+
+    def keystroke(session):
+        """Type or delete one character at the end of a warm editing session"""
+        end = len(session.text)
+        session.apply([(end - 1, end, "") if session.text.endswith("!") else (end, end, "!")])
+        main.score_session(session)
+
+    stop_words = get_stop_words()
+    job = JobIndex.build(synthetic_resume(SIZES["small"], seed=-1), stop_words)
+
+    benchmarks: List[Benchmark] = []
+    for size in sizes:
+        text = main.validate_resume_text(synthetic_resume(SIZES[size]))
+        doc = parse_document(text)
+        pdf = resume_pdf(text)
+        docx = resume_docx(text)
+        session = main.EditSession(text)
+        main.score_session(session)
+        benchmarks += [
+            (f"parse_document/{size}", None, lambda text=text: parse_document(text)),
+            (f"parse_document_fast/{size}", None, lambda text=text: parse_document(text, "fast")),
+            (f"analyze_grammar/{size}", None, lambda doc=doc: main.analyze_grammar(doc)),
+            (f"analyze_readability/{size}", None, lambda doc=doc: main.analyze_readability(doc)),
+            (f"analyze_keywords/{size}", None, lambda doc=doc: main.analyze_keywords(doc)),
+            (f"analyze_structure/{size}", None, lambda doc=doc: main.analyze_structure(doc)),
+            (f"run_analysis/{size}", None, lambda text=text: main.run_analysis(text)),
+            (f"session_keystroke/{size}", None, lambda session=session: keystroke(session)),
+            (f"match_job_x100/{size}", None,
+             lambda text=text: job.score([text] * 100, stop_words)),
+            (f"extract_pdf/{size}", None, lambda pdf=pdf: extract_text(PDF_CONTENT_TYPE, pdf)),
+            *[(f"extract_pdf_{backend}/{size}", None,
+               lambda pdf=pdf, options=PdfOptions(backend=backend):
+               extract_text(PDF_CONTENT_TYPE, pdf, pdf_options=options))
+              for backend in available_pdf_extractors() if backend != "pypdf2"],
+            (f"extract_pdf_parallel/{size}", None,
+             lambda pdf=pdf: extract_text(PDF_CONTENT_TYPE, pdf, pdf_options=PARALLEL_PDF_OPTIONS)),
+            (f"extract_docx/{size}", None, lambda docx=docx: extract_text(DOCX_CONTENT_TYPE, docx)),
+            (f"endpoint_analyze/{size}", clear_caches,
+             lambda text=text: post_ok("/analyze", json={"text": text})),
+            (f"endpoint_analyze_file_pdf/{size}", clear_caches,
+             lambda pdf=pdf: post_ok("/analyze/file",
+                                     files={"file": ("resume.pdf", pdf, PDF_CONTENT_TYPE)})),
+        ]
+    return benchmarks
+
+
+async def drive_analyze(client, texts: List[str], concurrency: int) -> Dict:
+    """POST every text to /analyze from ``concurrency`` workers sharing an httpx.AsyncClient"""
+    queue: "asyncio.Queue[str]" = asyncio.Queue()
+    for text in texts:
+        queue.put_nowait(text)
+    samples: List[float] = []
+    statuses: Dict[int, int] = {}
+
+    async def worker():
+        while not queue.empty():
+            text = queue.get_nowait()
+            start = time.perf_counter()
+            response = await client.post("/analyze", json={"text": text})
+            if response.status_code == 200:
+                samples.append(time.perf_counter() - start)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    if not samples:
+        raise RuntimeError(f"No request succeeded during the load test: {statuses}")
+    # Latency and throughput cover successful requests; 503s show up in status_codes
+    stats = summarize(samples, 0)
+    stats.pop("peak_memory_kib")
+    stats["throughput_per_s"] = round(len(samples) / elapsed, 2)
+    stats["concurrency"] = concurrency
+    stats["status_codes"] = {str(code): count for code, count in sorted(statuses.items())}
+    return stats
+
+
+async def _load_test(concurrency: int, total_requests: int, size: str) -> Dict[str, float]:
+    import httpx
+    import main
+
+    # Distinct resumes so the result cache does not short-circuit the pipeline
+    texts = [synthetic_resume(SIZES[size], seed=i) for i in range(total_requests)]
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        with admission_control_disabled():
+            return await drive_analyze(client, texts, concurrency)
+
+
+def run_load_test(concurrency: int, total_requests: int, size: str = "medium") -> Dict[str, float]:
+    """Drive /analyze with concurrent in-process clients and report latency and throughput"""
+    return asyncio.run(_load_test(concurrency, total_requests, size))
+
+
+def text_quality(source: str, extracted: str) -> Dict[str, float]:
+    """How many source words survived extraction, and how well their order did"""
+    source_words = source.split()
+    extracted_words = extracted.split()
+    remaining: Dict[str, int] = {}
+    for word in extracted_words:
+        remaining[word] = remaining.get(word, 0) + 1
+    found = 0
+    for word in source_words:
+        if remaining.get(word):
+            remaining[word] -= 1
+            found += 1
+    matcher = difflib.SequenceMatcher(None, source_words, extracted_words, autojunk=False)
+    return {
+        "word_recall": found / max(len(source_words), 1),
+        "order_ratio": matcher.ratio(),
+    }
+
+
+def measure_pdf_quality(sizes: List[str]) -> Dict[str, Dict[str, float]]:
+    """Text quality of every installed PDF backend on the fixture resumes"""
+    from extraction import PdfOptions, extract_text_from_pdf
+    from pdf_extractors import available_pdf_extractors
+
+    quality = {}
+    for size in sizes:
+        text = synthetic_resume(SIZES[size])
+        pdf = resume_pdf(text)
+        for backend in available_pdf_extractors():
+            extracted = extract_text_from_pdf(pdf, options=PdfOptions(backend=backend)).text
+            quality[f"{backend}/{size}"] = text_quality(text, extracted)
+    return quality
+
+
+def compare_to_baseline(results: Dict[str, Dict], baseline: Dict[str, Dict],
+                        tolerance: float) -> List[str]:
+    """Describe every benchmark whose p50 regressed by more than ``tolerance``"""
+    regressions = []
+    for name, stats in sorted(results.items()):
+        reference = baseline.get(name)
+        if not reference or "p50_ms" not in reference:
+            continue
+        allowed = reference["p50_ms"] * (1 + tolerance)
+        if stats["p50_ms"] > allowed:
+            regressions.append(
+                f"{name}: p50 {stats['p50_ms']:.2f} ms vs baseline {reference['p50_ms']:.2f} ms "
+                f"(+{(stats['p50_ms'] / reference['p50_ms'] - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def print_table(results: Dict[str, Dict]):
+    print(f"{'benchmark':<36} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ops/s':>9} {'peak KiB':>9}")
+    for name, stats in results.items():
+        print(f"{name:<36} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f} "
+              f"{stats['throughput_per_s']:>9.1f} {stats.get('peak_memory_kib', 0):>9.1f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the resume scoring pipeline")
+    parser.add_argument("--sizes", default=",".join(SIZES),
+                        help=f"comma-separated resume sizes ({', '.join(SIZES)})")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--output", help="write results JSON to this path")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help=f"write results to {DEFAULT_BASELINE}")
+    parser.add_argument("--baseline", help="fail if p50 regresses against this results JSON")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed p50 slowdown against the baseline (0.25 = 25%%)")
+    parser.add_argument("--load", action="store_true", help="also run the concurrent load test")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.WARNING)
+    sizes = [size for size in args.sizes.split(",") if size]
+    unknown = set(sizes) - set(SIZES)
+    if unknown:
+        parser.error(f"unknown sizes: {', '.join(sorted(unknown))}")
+
+    results: Dict[str, Dict] = {}
+    with admission_control_disabled():
+        for name, setup, fn in build_benchmarks(sizes):
+            if args.filter in name:
+                results[name] = measure(fn, setup, iterations=args.iterations)
+    if args.load:
+        results[f"load_analyze/c{args.concurrency}"] = run_load_test(args.concurrency, args.requests)
+
+    print_table(results)
+    quality = {}
+    if any(name.startswith("extract_pdf") for name in results):
+        quality = measure_pdf_quality(sizes)
+        print(f"\n{'pdf backend':<36} {'words %':>9} {'order %':>9}")
+        for name, scores in quality.items():
+            print(f"{name:<36} {scores['word_recall'] * 100:>9.1f} {scores['order_ratio'] * 100:>9.1f}")
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "executor": os.environ.get("ANALYSIS_EXECUTOR", "thread"),
+            "iterations": args.iterations,
+        },
+        "results": results,
+        "quality": quality,
+    }
+    for path in filter(None, [args.output, DEFAULT_BASELINE if args.save_baseline else None]):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"Wrote {path}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print("\nPerformance regressions:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions beyond {args.tolerance:.0%} of {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""Measure how throughput and memory scale with the number of gunicorn workers.
+
+Starts the API under gunicorn (``gunicorn_conf.py``) once per worker count,
+drives it over real HTTP from this process and reports requests/second,
+latency, time to become healthy and memory. From ``backend/``::
+
+    python -m benchmarks.scaling --workers 1,2,4 --concurrency 16 --requests 400
+    python -m benchmarks.scaling --workers 1,2,4 --no-preload    # compare memory and startup
+
+Memory is the proportional set size (PSS) summed over the master and its
+workers: pages shared copy-on-write are split between the processes
+sharing them, so the total shows what preloading actually saves, where
+summed RSS would count shared pages once per worker. Rate limiting and
+the result cache are switched off so every request runs the analyzers.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.fixtures import SIZES, synthetic_resume
+from benchmarks.run import drive_analyze
+from gunicorn_conf import available_cpus
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def process_tree(pid: int) -> List[int]:
+    """``pid`` and all of its descendants (Linux /proc)"""
+    pids = [pid]
+    for child in pids:
+        try:
+            with open(f"/proc/{child}/task/{child}/children") as f:
+                pids += [int(p) for p in f.read().split()]
+        except OSError:
+            pass
+    return pids
+
+
+def pss_bytes(pid: int) -> Optional[int]:
+    """Proportional set size of one process, or None where /proc does not report it"""
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def start_server(workers: int, port: int, preload: bool = True,
+                 timeout: float = 60.0) -> Tuple[subprocess.Popen, float]:
+    """Start gunicorn with ``workers`` workers and wait until /health answers"""
+    import httpx
+    env = {
+        **os.environ,
+        "WEB_CONCURRENCY": str(workers),
+        "PORT": str(port),
+        "RATE_LIMIT_TOKENS_PER_SECOND": "0",
+        "MAX_IN_FLIGHT_ANALYSES_PER_CLIENT": "0",
+        "RESULT_CACHE_SIZE": "0",
+        "MAX_REQUESTS": "0",
+        "PRELOAD_APP": "true" if preload else "false",
+    }
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn_conf.py", "--bind", f"127.0.0.1:{port}", "main:app"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = started + timeout
+    while time.perf_counter() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with status {server.returncode}")
+        try:
+            # Every worker must be up, not just the first one to accept
+            if (httpx.get(f"http://127.0.0.1:{port}/health").status_code == 200
+                    and len(process_tree(server.pid)) > workers):
+                return server, time.perf_counter() - started
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError(f"gunicorn with {workers} workers was not healthy after {timeout}s")
+
+
+async def drive(port: int, texts: List[str], concurrency: int) -> Dict:
+    """Load the server on ``port`` over real HTTP, one connection per concurrent client"""
+    import httpx
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+        return await drive_analyze(client, texts, concurrency)
+
+
+def measure_workers(workers: int, texts: List[str], concurrency: int, preload: bool = True) -> Dict:
+    port = free_port()
+    server, startup = start_server(workers, port, preload)
+    try:
+        # One warm-up pass so every worker has loaded its lazy state
+        asyncio.run(drive(port, texts[:concurrency * 2], concurrency))
+        stats = asyncio.run(drive(port, texts, concurrency))
+        pss = [pss_bytes(pid) for pid in process_tree(server.pid)]
+        stats["startup_s"] = round(startup, 2)
+        stats["pss_mib"] = round(sum(pss) / 2 ** 20, 1) if None not in pss else None
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Throughput and memory versus gunicorn worker count")
+    parser.add_argument("--workers", default="1,2,4", help="comma-separated worker counts")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--size", default="medium", choices=list(SIZES))
+    parser.add_argument("--no-preload", action="store_true",
+                        help="load the app separately in every worker, for comparison")
+    parser.add_argument("--output", help="write results JSON to this path")
+    args = parser.parse_args(argv)
+
+    # Distinct resumes so nothing is served from a cache
+    texts = [synthetic_resume(SIZES[args.size], seed=i) for i in range(args.requests)]
+    results = {}
+    print(f"{'workers':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'startup s':>10} {'PSS MiB':>9}")
+    for workers in [int(count) for count in args.workers.split(",") if count]:
+        stats = measure_workers(workers, texts, args.concurrency, preload=not args.no_preload)
+        results[str(workers)] = stats
+        print(f"{workers:>7} {stats['throughput_per_s']:>9.1f} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} "
+              f"{stats['startup_s']:>10.2f} {stats['pss_mib'] if stats['pss_mib'] is not None else '-':>9}")
+    print(f"CPUs available: {available_cpus()}; throughput cannot scale past that many workers")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"concurrency": args.concurrency, "size": args.size, "preload": not args.no_preload,
+                       "results": results}, f, indent=2)
+        print(f"Wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
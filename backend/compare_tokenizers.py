@@ -0,0 +1,112 @@
+"""Compare scores from the nltk and fast tokenizers on a corpus of resumes.
+
+Scores every resume with both tokenizers and reports how far they diverge
+per category and overall, plus the time each spent tokenizing, so the
+fast tokenizer can be checked against real data before switching
+TOKENIZER. Reads the same sources as ``rescore.py``. From ``backend/``::
+
+    python compare_tokenizers.py resumes/
+    python compare_tokenizers.py export.jsonl --limit 500 --max-mean-diff 2
+
+With ``--max-mean-diff`` the exit status is 1 when the mean absolute
+difference in overall score exceeds it.
+"""
+import argparse
+import itertools
+import json
+import logging
+import sys
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException
+
+from extraction import ExtractionError, extract_text
+from main import run_analysis_timed, validate_resume_text
+from rescore import iter_source
+
+CATEGORIES = ("overall", "grammar", "readability", "keywords", "structure")
+BASELINE, CANDIDATE = "nltk", "fast"
+
+
+def _scores(result: Dict) -> Dict[str, int]:
+    return {"overall": result["overall_score"], **result["breakdown"]}
+
+
+def compare(source: str, limit: Optional[int] = None, worst: int = 5) -> Dict:
+    """Score each resume with both tokenizers and summarize the differences"""
+    diffs: Dict[str, List[int]] = {category: [] for category in CATEGORIES}
+    seconds = {BASELINE: 0.0, CANDIDATE: 0.0}
+    outliers = []
+    skipped = 0
+    for key, content_type, load in itertools.islice(iter_source(source), limit):
+        try:
+            payload = load()
+            text = payload if content_type is None else extract_text(content_type, payload).text
+            text = validate_resume_text(text)
+        except (HTTPException, ExtractionError, ValueError):
+            skipped += 1
+            continue
+        scores = {}
+        for tokenizer in (BASELINE, CANDIDATE):
+            result, timings = run_analysis_timed(text, tokenizer)
+            scores[tokenizer] = _scores(result)
+            seconds[tokenizer] += timings["tokenize"]
+        for category in CATEGORIES:
+            diffs[category].append(scores[CANDIDATE][category] - scores[BASELINE][category])
+        outliers.append((abs(diffs["overall"][-1]), key, scores))
+
+    compared = len(diffs["overall"])
+    report = {"compared": compared, "skipped": skipped, "categories": {}, "tokenize_seconds": seconds}
+    for category, values in diffs.items():
+        absolute = [abs(value) for value in values]
+        report["categories"][category] = {
+            "mean_abs_diff": round(sum(absolute) / compared, 2) if compared else 0.0,
+            "max_abs_diff": max(absolute, default=0),
+            "mean_diff": round(sum(values) / compared, 2) if compared else 0.0,
+            "identical": round(absolute.count(0) / compared, 3) if compared else 1.0,
+            "within_5": round(sum(value <= 5 for value in absolute) / compared, 3) if compared else 1.0,
+        }
+    outliers.sort(key=lambda outlier: outlier[0], reverse=True)
+    report["largest_differences"] = [
+        {"key": key, BASELINE: scores[BASELINE], CANDIDATE: scores[CANDIDATE]}
+        for diff, key, scores in outliers[:worst] if diff
+    ]
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare nltk and fast tokenizer scores on a corpus")
+    parser.add_argument("source", help="directory, .zip/.tar(.gz) archive or .jsonl file")
+    parser.add_argument("--limit", type=int, help="compare at most this many resumes")
+    parser.add_argument("--worst", type=int, default=5, help="list this many of the largest differences")
+    parser.add_argument("--max-mean-diff", type=float,
+                        help="exit 1 if the mean absolute overall difference exceeds this")
+    parser.add_argument("--output", help="write the report JSON to this path")
+    args = parser.parse_args(argv)
+
+    logging.getLogger().setLevel(logging.WARNING)
+    report = compare(args.source, args.limit, args.worst)
+    print(f"Compared {report['compared']} resumes ({report['skipped']} skipped), {CANDIDATE} minus {BASELINE}")
+    print(f"{'category':<12} {'mean |diff|':>11} {'max |diff|':>10} {'mean diff':>9} {'identical':>9} {'within 5':>8}")
+    for category, stats in report["categories"].items():
+        print(f"{category:<12} {stats['mean_abs_diff']:>11.2f} {stats['max_abs_diff']:>10} {stats['mean_diff']:>9.2f} "
+              f"{stats['identical']:>9.1%} {stats['within_5']:>8.1%}")
+    seconds = report["tokenize_seconds"]
+    speedup = seconds[BASELINE] / seconds[CANDIDATE] if seconds[CANDIDATE] else 0
+    print(f"Tokenizing took {seconds[BASELINE]:.3f}s with {BASELINE}, "
+          f"{seconds[CANDIDATE]:.3f}s with {CANDIDATE} ({speedup:.1f}x)")
+    for outlier in report["largest_differences"]:
+        print(f"  {outlier['key']}: {outlier[BASELINE]} -> {outlier[CANDIDATE]}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    mean_diff = report["categories"]["overall"]["mean_abs_diff"]
+    if args.max_mean_diff is not None and mean_diff > args.max_mean_diff:
+        print(f"Mean overall difference {mean_diff} exceeds {args.max_mean_diff}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
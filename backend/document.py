@@ -0,0 +1,191 @@
+"""Parsed resume document shared by all analyzers"""
+import re
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+import pyphen
+
+from tokenizers import get_tokenizer
+
+# Same hyphenation dictionary textstat uses, without its runtime cmudict download
+_hyphenator = pyphen.Pyphen(lang='en_US')
+
+_LINE_PATTERN = re.compile(r"[^\n]+")
+
+# Section name a line heads, or None; see sections.heading_name
+HeadingName = Callable[[str], Optional[str]]
+# (offset of a heading's first character, section name it heads)
+Heading = Tuple[int, str]
+
+
+@lru_cache(maxsize=65536)
+def count_syllables(word: str) -> int:
+    """Syllables in a single lowercase word, memoized across requests"""
+    return len(_hyphenator.positions(word)) + 1
+
+
+def is_word(token: str) -> bool:
+    """True for tokens that contain at least one letter or digit"""
+    return any(char.isalnum() for char in token)
+
+
+@dataclass
+class ParsedDocument:
+    """Resume text tokenized exactly once, kept as counts rather than token lists.
+
+    Built per request by ``parse_document`` and handed to every analyzer so
+    none of them re-tokenizes the text. Only the text itself and a few small
+    integers per sentence are retained; lowercased copies and line lists
+    are produced on demand and dropped by the analyzer that needs them.
+    """
+    text: str
+    # Tokens in each sentence, punctuation included
+    sentence_lengths: array
+    word_count: int
+    syllable_count: int
+    # Offset in ``text`` where each sentence starts, and its words and syllables
+    sentence_starts: array = field(default_factory=lambda: array('I'))
+    sentence_words: array = field(default_factory=lambda: array('I'))
+    sentence_syllables: array = field(default_factory=lambda: array('I'))
+    # Headings found while tokenizing, or None when they were not looked for
+    headings: Optional[List[Heading]] = None
+
+    @property
+    def sentence_count(self) -> int:
+        return len(self.sentence_lengths)
+
+    def iter_line_spans(self) -> Iterator[Tuple[int, int]]:
+        """Start and end offsets of each non-empty line"""
+        for match in _LINE_PATTERN.finditer(self.text):
+            if not match.group().isspace():
+                yield match.span()
+
+    def iter_lines(self) -> Iterator[str]:
+        """Non-empty lines, without building a list of every line"""
+        for start, end in self.iter_line_spans():
+            yield self.text[start:end]
+
+    def span(self, start: int, end: int) -> "ParsedDocument":
+        """The part of the document from ``start`` to ``end``, without re-tokenizing.
+
+        Holds the sentences that start inside the span; offsets in the
+        result are relative to ``start``.
+        """
+        first = bisect_left(self.sentence_starts, start)
+        last = bisect_left(self.sentence_starts, end)
+        words = self.sentence_words[first:last]
+        syllables = self.sentence_syllables[first:last]
+        return ParsedDocument(
+            text=self.text[start:end],
+            sentence_lengths=self.sentence_lengths[first:last],
+            word_count=sum(words),
+            syllable_count=sum(syllables),
+            sentence_starts=array('I', (offset - start for offset in self.sentence_starts[first:last])),
+            sentence_words=words,
+            sentence_syllables=syllables,
+        )
+
+
+@dataclass
+class TokenizedBlock:
+    """Sentence lengths, words and syllables of one block from ``split_blocks``"""
+    sentence_lengths: array
+    word_count: int
+    syllable_count: int
+    # Per sentence, with starts relative to the block
+    sentence_starts: array
+    sentence_words: array
+    sentence_syllables: array
+    # Characters in the block, its trailing separator included
+    length: int
+    # Headings in the block, offsets relative to it; None when not looked for
+    headings: Optional[List[Heading]] = None
+
+
+def split_blocks(text: str, heading_name: Optional[HeadingName] = None) -> List[str]:
+    """Split text at blank lines and, with ``heading_name``, before every heading line.
+
+    Each block keeps the separator that follows it, so the blocks concatenate
+    back to ``text``. No sentence crosses a block boundary, which keeps a
+    section's tokens valid while another section is edited.
+    """
+    blocks = []
+    start = 0
+    for paragraph in text.split('\n\n'):
+        end = start + len(paragraph) + 2
+        if heading_name is not None:
+            line_start = start
+            for line in paragraph.split('\n'):
+                if line_start > start and heading_name(line) is not None:
+                    blocks.append(text[start:line_start])
+                    start = line_start
+                line_start += len(line) + 1
+        blocks.append(text[start:end])
+        start = end
+    return blocks
+
+
+def tokenize_block(block: str, tokenizer: str = "nltk",
+                   heading_name: Optional[HeadingName] = None) -> TokenizedBlock:
+    """Tokenize a single block from ``split_blocks``.
+
+    With ``heading_name`` the heading the block opens with, if any, is
+    recorded; blocks split with it hold no other heading line.
+    Tokens are counted one sentence at a time and never kept.
+    """
+    headings = None
+    if heading_name is not None:
+        first_line = block.split('\n', 1)[0]
+        name = heading_name(first_line)
+        headings = [] if name is None else [(len(first_line) - len(first_line.lstrip()), name)]
+    sentence_lengths, sentence_starts = array('I'), array('I')
+    sentence_words, sentence_syllables = array('I'), array('I')
+    for start, tokens in get_tokenizer(tokenizer)(block):
+        words = syllables = 0
+        for token in tokens:
+            if is_word(token):
+                words += 1
+                syllables += count_syllables(token.lower())
+        sentence_lengths.append(len(tokens))
+        sentence_starts.append(start)
+        sentence_words.append(words)
+        sentence_syllables.append(syllables)
+    return TokenizedBlock(
+        sentence_lengths=sentence_lengths,
+        word_count=sum(sentence_words),
+        syllable_count=sum(sentence_syllables),
+        sentence_starts=sentence_starts,
+        sentence_words=sentence_words,
+        sentence_syllables=sentence_syllables,
+        length=len(block),
+        headings=headings,
+    )
+
+
+def assemble_document(text: str, blocks: Iterable[TokenizedBlock]) -> ParsedDocument:
+    """Build a ParsedDocument from the already tokenized blocks of ``text``, in order"""
+    doc = ParsedDocument(text=text, sentence_lengths=array('I'), word_count=0, syllable_count=0)
+    offset = 0
+    for block in blocks:
+        if block.headings is not None:
+            if doc.headings is None:
+                doc.headings = []
+            doc.headings.extend((offset + start, name) for start, name in block.headings)
+        doc.sentence_lengths.extend(block.sentence_lengths)
+        doc.sentence_starts.extend(offset + start for start in block.sentence_starts)
+        doc.sentence_words.extend(block.sentence_words)
+        doc.sentence_syllables.extend(block.sentence_syllables)
+        doc.word_count += block.word_count
+        doc.syllable_count += block.syllable_count
+        offset += block.length
+    return doc
+
+
+def parse_document(text: str, tokenizer: str = "nltk",
+                   heading_name: Optional[HeadingName] = None) -> ParsedDocument:
+    """Tokenize resume text once into a ParsedDocument, block by block"""
+    return assemble_document(text, (tokenize_block(block, tokenizer, heading_name)
+                                    for block in split_blocks(text, heading_name)))
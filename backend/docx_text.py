@@ -0,0 +1,142 @@
+"""Streaming text extraction from DOCX files.
+
+Reads the WordprocessingML parts straight from the zip with an incremental
+XML parser, so images and other media are never decompressed and memory
+follows the amount of text rather than the file size. Produces one line
+per paragraph; table rows become one line with cells separated by tabs.
+"""
+import posixpath
+import zipfile
+from typing import IO, Iterator, List, Optional
+from xml.etree import ElementTree
+
+DOCUMENT_PART = "word/document.xml"
+RELATIONSHIPS_PART = "word/_rels/document.xml.rels"
+HEADER_RELATIONSHIP = "/header"
+FOOTER_RELATIONSHIP = "/footer"
+
+
+WORD_NAMESPACES = (
+    "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}",
+    "{http://purl.oclc.org/ooxml/wordprocessingml/main}",
+)
+FALLBACK_TAG = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+
+def _word_name(tag: str) -> str:
+    """Local name of a WordprocessingML tag (transitional or strict); other tags are returned whole"""
+    for namespace in WORD_NAMESPACES:
+        if tag.startswith(namespace):
+            return tag[len(namespace):]
+    return tag
+
+
+def _related_parts(archive: zipfile.ZipFile, suffix: str) -> List[str]:
+    """Header or footer part names referenced by the main document, in name order"""
+    try:
+        with archive.open(RELATIONSHIPS_PART) as f:
+            relationships = ElementTree.parse(f).getroot()
+    except KeyError:
+        return []
+    parts = []
+    for relationship in relationships:
+        if relationship.get("Type", "").endswith(suffix) and relationship.get("TargetMode") != "External":
+            target = relationship.get("Target", "")
+            if target.startswith("/"):
+                name = target.lstrip("/")
+            else:
+                name = posixpath.normpath(posixpath.join("word", target))
+            if name in archive.NameToInfo and name not in parts:
+                parts.append(name)
+    return sorted(parts, key=lambda name: (len(name), name))
+
+
+def iter_part_lines(stream: IO[bytes]) -> Iterator[str]:
+    """Lines of text from one WordprocessingML part, in reading order.
+
+    Text boxes are read from their DrawingML content; the VML fallback copy
+    of the same box is skipped.
+    """
+    paragraphs: List[List[str]] = []
+    # One entry per open table cell: the finished paragraphs in that cell
+    cells: List[List[str]] = []
+    # One entry per open table row: the finished cells in that row
+    rows: List[List[str]] = []
+    skip_depth = 0
+    depth = 0
+    container: Optional[ElementTree.Element] = None
+    container_depth = 0
+
+    for event, element in ElementTree.iterparse(stream, events=("start", "end")):
+        name = _word_name(element.tag)
+        if event == "start":
+            depth += 1
+            if name in ("body", "hdr", "ftr"):
+                container, container_depth = element, depth
+            if name == FALLBACK_TAG:
+                skip_depth += 1
+            elif skip_depth:
+                continue
+            elif name == "p":
+                paragraphs.append([])
+            elif name == "tc":
+                cells.append([])
+            elif name == "tr":
+                rows.append([])
+            continue
+
+        depth -= 1
+        if name == FALLBACK_TAG:
+            skip_depth -= 1
+        elif skip_depth:
+            pass
+        elif name == "t" and paragraphs:
+            paragraphs[-1].append(element.text or "")
+        elif name == "tab" and paragraphs:
+            paragraphs[-1].append("\t")
+        elif name in ("br", "cr") and paragraphs:
+            paragraphs[-1].append("\n")
+        elif name == "p" and paragraphs:
+            text = "".join(paragraphs.pop())
+            if cells:
+                cells[-1].append(text)
+            else:
+                yield text
+        elif name == "tc" and cells:
+            cell = " ".join(text for text in cells.pop() if text.strip())
+            if rows:
+                rows[-1].append(cell)
+        elif name == "tr" and rows:
+            line = "\t".join(rows.pop())
+            if cells:
+                cells[-1].append(line)
+            else:
+                yield line
+        # Drop each finished paragraph or table so the parsed tree never grows with the document
+        if container is not None and depth == container_depth:
+            container.clear()
+
+
+def iter_docx_lines(data: IO[bytes]) -> Iterator[str]:
+    """Headers, then the document body, then footers.
+
+    Text that repeats across header or footer parts (the same letterhead on
+    first and following pages) is only returned once.
+    """
+    with zipfile.ZipFile(data) as archive:
+        seen = set()
+        for part in _related_parts(archive, HEADER_RELATIONSHIP):
+            with archive.open(part) as f:
+                for line in iter_part_lines(f):
+                    if line not in seen:
+                        seen.add(line)
+                        yield line
+        with archive.open(DOCUMENT_PART) as f:
+            yield from iter_part_lines(f)
+        seen = set()
+        for part in _related_parts(archive, FOOTER_RELATIONSHIP):
+            with archive.open(part) as f:
+                for line in iter_part_lines(f):
+                    if line not in seen:
+                        seen.add(line)
+                        yield line
@@ -0,0 +1,142 @@
+"""Bounded executors for running CPU-bound analysis off the event loop"""
+import asyncio
+import functools
+import logging
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_MODES = ("inline", "thread", "process")
+
+
+class ExecutorBusyError(Exception):
+    """Raised when the analysis queue is full and a job cannot be admitted"""
+
+
+class AnalysisExecutor:
+    """Run blocking callables in a thread or process pool with a bounded queue.
+
+    ``max_queue`` caps the number of jobs that are running or waiting for a
+    worker. Once it is reached, ``run`` raises ``ExecutorBusyError`` right away
+    instead of letting requests pile up behind a slow document.
+    """
+
+    def __init__(self, mode: str = "thread", max_workers: Optional[int] = None,
+                 max_queue: Optional[int] = None, name: str = "analysis"):
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(f"Unknown executor mode '{mode}', expected one of {EXECUTOR_MODES}")
+        self.mode = mode
+        self.name = name
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue or self.max_workers * 4
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_env(cls, prefix: str = "ANALYSIS", name: str = "analysis") -> "AnalysisExecutor":
+        """Build an executor from <prefix>_EXECUTOR, <prefix>_WORKERS and <prefix>_QUEUE_SIZE"""
+        workers = os.environ.get(f"{prefix}_WORKERS")
+        queue_size = os.environ.get(f"{prefix}_QUEUE_SIZE")
+        return cls(
+            mode=os.environ.get(f"{prefix}_EXECUTOR", "thread").lower(),
+            max_workers=int(workers) if workers else None,
+            max_queue=int(queue_size) if queue_size else None,
+            name=name,
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of jobs currently running or waiting for a worker"""
+        return self._pending
+
+    def _get_pool(self) -> Executor:
+        with self._lock:
+            if self._pool is None:
+                if self.mode == "process":
+                    self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+                else:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix=self.name
+                    )
+                logger.info(f"Started {self.mode} {self.name} pool with {self.max_workers} workers")
+            return self._pool
+
+    def _acquire(self):
+        with self._lock:
+            if self._pending >= self.max_queue:
+                self.rejected += 1
+                raise ExecutorBusyError(
+                    f"{self.name.capitalize()} queue is full ({self._pending}/{self.max_queue} jobs pending)"
+                )
+            self._pending += 1
+
+    def _release(self):
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run ``fn(*args, **kwargs)`` on the pool and await its result"""
+        self._acquire()
+        try:
+            if self.mode == "inline":
+                return fn(*args, **kwargs)
+            loop = asyncio.get_running_loop()
+            call = functools.partial(fn, *args, **kwargs)
+            try:
+                return await loop.run_in_executor(self._get_pool(), call)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM-killed); start a fresh pool for the next job
+                logger.error(f"{self.name.capitalize()} process pool is broken, restarting it")
+                self.reset()
+                raise
+        finally:
+            self._release()
+
+    async def run_local(self, fn: Callable, *args, **kwargs) -> Any:
+        """Like ``run``, for jobs that must see or update this process's state.
+
+        A process pool cannot run those, so in process mode they run in a
+        thread instead, still counted against the same queue bound.
+        """
+        if self.mode != "process":
+            return await self.run(fn, *args, **kwargs)
+        self._acquire()
+        try:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+        finally:
+            self._release()
+
+    def reset(self, cancel_futures: bool = True):
+        """Discard the current pool so the next job starts a new one.
+
+        With ``cancel_futures=False`` jobs already submitted still finish on
+        the old pool, which is how workers are recycled without dropping work.
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=cancel_futures)
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker pool"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of executor configuration and load"""
+        return {
+            "name": self.name,
+            "mode": self.mode,
+            "workers": self.max_workers,
+            "queue_depth": self._pending,
+            "queue_size": self.max_queue,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,340 @@
+"""Bounded text extraction from uploaded resume files.
+
+PDF backends are imported on first use so processes that only score
+pasted text never pay for loading them.
+"""
+import io
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Any, List, Optional, Set, Tuple
+
+from docx_text import iter_docx_lines
+from pdf_extractors import PdfExtractor, get_pdf_extractor
+
+logger = logging.getLogger(__name__)
+
+PDF_CONTENT_TYPE = "application/pdf"
+DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+TEXT_CONTENT_TYPE = "text/plain"
+SUPPORTED_CONTENT_TYPES = (PDF_CONTENT_TYPE, DOCX_CONTENT_TYPE, TEXT_CONTENT_TYPE)
+CONTENT_TYPES_BY_EXTENSION = {
+    ".pdf": PDF_CONTENT_TYPE,
+    ".docx": DOCX_CONTENT_TYPE,
+    ".txt": TEXT_CONTENT_TYPE,
+}
+
+
+def content_type_for(filename: str) -> Optional[str]:
+    """Content type implied by a file name's extension, or None if unsupported"""
+    return CONTENT_TYPES_BY_EXTENSION.get(os.path.splitext(filename)[1].lower())
+
+
+class ExtractionError(Exception):
+    """Raised when text cannot be extracted from an uploaded document.
+
+    A plain exception (rather than HTTPException) so it can cross the
+    process-pool boundary; endpoints translate it into a 400 response.
+    """
+
+
+@dataclass(frozen=True)
+class ExtractionLimits:
+    """Caps applied while extracting text from a single document"""
+    max_pdf_pages: int = 20
+    max_chars: int = 100_000
+    timeout: float = 10.0
+
+    @classmethod
+    def from_env(cls) -> "ExtractionLimits":
+        """Read MAX_PDF_PAGES, MAX_EXTRACTED_CHARS and EXTRACTION_TIMEOUT"""
+        return cls(
+            max_pdf_pages=int(os.environ.get("MAX_PDF_PAGES", cls.max_pdf_pages)),
+            max_chars=int(os.environ.get("MAX_EXTRACTED_CHARS", cls.max_chars)),
+            timeout=float(os.environ.get("EXTRACTION_TIMEOUT", cls.timeout)),
+        )
+
+
+DEFAULT_LIMITS = ExtractionLimits.from_env()
+
+
+@dataclass(frozen=True)
+class PdfOptions:
+    """Which PDF backend to use and when to spread pages across processes"""
+    backend: str = "pypdf2"
+    fallback: Optional[str] = None
+    workers: int = 0
+    parallel_min_pages: int = 8
+
+    @classmethod
+    def from_env(cls) -> "PdfOptions":
+        """Read PDF_EXTRACTOR, PDF_FALLBACK_EXTRACTOR, PDF_WORKERS and PDF_PARALLEL_MIN_PAGES"""
+        return cls(
+            backend=os.environ.get("PDF_EXTRACTOR", cls.backend).lower(),
+            fallback=os.environ.get("PDF_FALLBACK_EXTRACTOR", "").lower() or None,
+            workers=int(os.environ.get("PDF_WORKERS", cls.workers)),
+            parallel_min_pages=int(os.environ.get("PDF_PARALLEL_MIN_PAGES", cls.parallel_min_pages)),
+        )
+
+    def check(self):
+        """Raise ValueError if a configured backend is unknown or not installed"""
+        get_pdf_extractor(self.backend)
+        if self.fallback:
+            get_pdf_extractor(self.fallback)
+
+
+DEFAULT_PDF_OPTIONS = PdfOptions.from_env()
+
+# Shared by all documents that qualify for parallel page extraction
+_page_pool: Optional[ProcessPoolExecutor] = None
+_page_pool_lock = threading.Lock()
+
+
+def _get_page_pool(workers: int) -> ProcessPoolExecutor:
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None:
+            _page_pool = ProcessPoolExecutor(max_workers=workers)
+        return _page_pool
+
+
+def shutdown_page_pool():
+    """Stop the parallel page extraction workers, if any were started"""
+    global _page_pool
+    with _page_pool_lock:
+        pool, _page_pool = _page_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+@dataclass
+class ExtractedText:
+    """Extracted document text and whether limits cut it short"""
+    text: str
+    truncated: bool = False
+    truncation_reason: Optional[str] = None
+    # PDF pages read, for cost accounting
+    pages: int = 0
+
+
+class _TextCollector:
+    """Collect text chunks up to a character budget and join them once"""
+
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self.parts: List[str] = []
+        self.size = 0
+
+    def add(self, chunk: str) -> bool:
+        """Append a chunk; returns False once the budget is used up"""
+        remaining = self.max_chars - self.size
+        if len(chunk) > remaining:
+            self.parts.append(chunk[:remaining])
+            self.size = self.max_chars
+            return False
+        self.parts.append(chunk)
+        self.size += len(chunk)
+        return True
+
+    def text(self) -> str:
+        """Join the collected chunks, releasing them"""
+        text = "\n".join(self.parts).strip()
+        self.parts = []
+        return text
+
+
+class _PageReader:
+    """Read page text from a primary backend, retrying failed pages with a fallback"""
+
+    def __init__(self, data: bytes, backend: str, fallback: Optional[str] = None):
+        self.data = data
+        self.primary: PdfExtractor = get_pdf_extractor(backend)
+        self.fallback: Optional[PdfExtractor] = get_pdf_extractor(fallback) if fallback else None
+        self._fallback_document: Any = None
+        self.failed_pages = 0
+        self.document = self.primary.open(data)
+
+    def page_count(self) -> int:
+        return self.primary.page_count(self.document)
+
+    def text(self, index: int) -> str:
+        try:
+            return self.primary.page_text(self.document, index)
+        except Exception as e:
+            logger.warning(f"{self.primary.name} failed on PDF page {index + 1}: {e}")
+        if self.fallback is not None:
+            try:
+                if self._fallback_document is None:
+                    self._fallback_document = self.fallback.open(self.data)
+                return self.fallback.page_text(self._fallback_document, index)
+            except Exception as e:
+                logger.warning(f"{self.fallback.name} also failed on PDF page {index + 1}: {e}")
+        self.failed_pages += 1
+        return ""
+
+
+def _open_pdf(data: bytes, options: PdfOptions) -> _PageReader:
+    """Open with the primary backend, or the fallback if the primary cannot parse the file"""
+    try:
+        return _PageReader(data, options.backend, options.fallback)
+    except Exception as e:
+        if not options.fallback:
+            raise
+        logger.warning(f"{options.backend} could not open PDF, using {options.fallback}: {e}")
+        return _PageReader(data, options.fallback)
+
+
+def extract_page_range(data: bytes, options: PdfOptions, start: int, stop: int) -> Tuple[List[str], List[int]]:
+    """Text of pages ``start``..``stop - 1`` and the indices of those that failed; runs in page workers"""
+    reader = _open_pdf(data, options)
+    texts, failed = [], []
+    for index in range(start, stop):
+        texts.append(reader.text(index))
+        if reader.failed_pages > len(failed):
+            failed.append(index)
+    return texts, failed
+
+
+def _extract_pages_parallel(data: bytes, options: PdfOptions, page_count: int,
+                            deadline: float) -> Tuple[List[str], Set[int], bool]:
+    """Split pages into contiguous ranges across the page pool; stops at the deadline"""
+    pool = _get_page_pool(options.workers)
+    step = -(-page_count // options.workers)
+    futures = [pool.submit(extract_page_range, data, options, start, min(start + step, page_count))
+               for start in range(0, page_count, step)]
+    pages: List[str] = []
+    failed: Set[int] = set()
+    for future in futures:
+        try:
+            texts, range_failed = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            for pending in futures:
+                pending.cancel()
+            return pages, failed, True
+        pages += texts
+        failed.update(range_failed)
+    return pages, failed, False
+
+
+def extract_text_from_pdf(file_content: bytes, limits: Optional[ExtractionLimits] = None,
+                          options: Optional[PdfOptions] = None) -> ExtractedText:
+    """Extract text from PDF file, stopping at the page, character or time limit.
+
+    Pages that fail in the configured backend are retried with the fallback
+    backend; long documents are split across the page pool when
+    ``options.workers`` is set.
+    """
+    limits = limits or DEFAULT_LIMITS
+    options = options or DEFAULT_PDF_OPTIONS
+    deadline = time.monotonic() + limits.timeout
+    collector = _TextCollector(limits.max_chars)
+    reason = None
+    timed_out = False
+    try:
+        reader = _open_pdf(file_content, options)
+        page_count = reader.page_count()
+        pages_to_read = min(page_count, limits.max_pdf_pages)
+        if page_count > limits.max_pdf_pages:
+            reason = f"Only the first {limits.max_pdf_pages} of {page_count} pages were analyzed."
+        
+        # Only pages that were read count as failed, not ones skipped after a limit
+        pages_read = failed_pages = 0
+        if options.workers > 1 and pages_to_read >= options.parallel_min_pages:
+            pages, failed, timed_out = _extract_pages_parallel(
+                file_content, options, pages_to_read, deadline
+            )
+            for number, text in enumerate(pages):
+                pages_read += 1
+                failed_pages += number in failed
+                if not collector.add(text):
+                    reason = f"Text was cut off at {limits.max_chars} characters."
+                    break
+        else:
+            # Pages are read on a helper thread so one slow page cannot outlast the
+            # deadline, and go straight into the collector so only one copy is held
+            page_thread = ThreadPoolExecutor(max_workers=1)
+            try:
+                for number in range(pages_to_read):
+                    if time.monotonic() > deadline:
+                        timed_out = True
+                        break
+                    try:
+                        text = page_thread.submit(reader.text, number).result(
+                            timeout=max(0.0, deadline - time.monotonic())
+                        )
+                    except FutureTimeoutError:
+                        timed_out = True
+                        break
+                    pages_read += 1
+                    failed_pages = reader.failed_pages
+                    if not collector.add(text):
+                        reason = f"Text was cut off at {limits.max_chars} characters."
+                        break
+            finally:
+                # A page still being read is abandoned; its result is never used
+                page_thread.shutdown(wait=False, cancel_futures=True)
+        if timed_out:
+            reason = f"Extraction time limit reached after {pages_read} of {page_count} pages."
+    except Exception as e:
+        logger.error(f"Error extracting PDF text: {e}")
+        raise ExtractionError("Unable to extract text from PDF")
+
+    text = collector.text()
+    if timed_out and not text:
+        raise ExtractionError("Timed out extracting text from PDF")
+    if pages_read and failed_pages == pages_read:
+        raise ExtractionError("Unable to extract text from PDF")
+    return ExtractedText(text=text, truncated=reason is not None, truncation_reason=reason, pages=pages_read)
+
+
+def extract_text_from_docx(file_content: bytes, limits: Optional[ExtractionLimits] = None) -> ExtractedText:
+    """Extract text from DOCX file, stopping at the character or time limit.
+
+    Paragraphs, table rows, text boxes, headers and footers are streamed
+    from the document XML; embedded media is never read.
+    """
+    limits = limits or DEFAULT_LIMITS
+    deadline = time.monotonic() + limits.timeout
+    collector = _TextCollector(limits.max_chars)
+    reason = None
+    timed_out = False
+    try:
+        for line in iter_docx_lines(io.BytesIO(file_content)):
+            if time.monotonic() > deadline:
+                timed_out = True
+                reason = "Extraction time limit reached before the end of the document."
+                break
+            if not collector.add(line):
+                reason = f"Text was cut off at {limits.max_chars} characters."
+                break
+    except Exception as e:
+        logger.error(f"Error extracting DOCX text: {e}")
+        raise ExtractionError("Unable to extract text from DOCX")
+
+    text = collector.text()
+    if timed_out and not text:
+        raise ExtractionError("Timed out extracting text from DOCX")
+    return ExtractedText(text=text, truncated=reason is not None, truncation_reason=reason)
+
+
+def extract_text(content_type: str, file_content: bytes, limits: Optional[ExtractionLimits] = None,
+                 pdf_options: Optional[PdfOptions] = None) -> ExtractedText:
+    """Extract text from an uploaded file based on its content type"""
+    limits = limits or DEFAULT_LIMITS
+    if content_type == PDF_CONTENT_TYPE:
+        return extract_text_from_pdf(file_content, limits, pdf_options)
+    if content_type == DOCX_CONTENT_TYPE:
+        return extract_text_from_docx(file_content, limits)
+    if content_type == TEXT_CONTENT_TYPE:
+        try:
+            text = file_content.decode('utf-8')
+        except UnicodeDecodeError:
+            raise ExtractionError("Unable to decode text file as UTF-8")
+        if len(text) > limits.max_chars:
+            reason = f"Text was cut off at {limits.max_chars} characters."
+            return ExtractedText(text=text[:limits.max_chars], truncated=True, truncation_reason=reason)
+        return ExtractedText(text=text)
+    raise ExtractionError("Unsupported file type. Please upload PDF, DOCX, or TXT files.")
@@ -0,0 +1,61 @@
+"""Gunicorn settings for running the API with several uvicorn worker processes.
+
+    gunicorn -c gunicorn_conf.py main:app
+
+The app is imported once in the master (``preload_app``), so NLTK data,
+the scoring config and its compiled keyword matchers are loaded a single
+time and shared with every worker copy-on-write after fork. Workers can be
+recycled after a jittered number of requests, finishing in-flight requests
+first, to bound slow memory growth.
+
+Edit sessions, background tasks and registered jobs live in a worker's
+memory, so both default to off: one worker, never recycled.
+"""
+import gc
+import math
+import os
+
+
+def available_cpus() -> int:
+    """CPUs this process may actually use: affinity mask and cgroup quota, not the host count"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+# "auto" runs one worker per usable CPU, as analysis is CPU-bound
+concurrency = os.environ.get("WEB_CONCURRENCY", "1").lower()
+workers = available_cpus() if concurrency == "auto" else int(concurrency)
+preload_app = os.environ.get("PRELOAD_APP", "true").lower() in ("1", "true", "yes")
+
+# Replace each worker after this many requests (0 disables), staggered by the jitter;
+# a replaced worker takes its sessions, tasks and registered jobs with it
+max_requests = int(os.environ.get("MAX_REQUESTS", 0))
+max_requests_jitter = int(os.environ.get("MAX_REQUESTS_JITTER", max_requests // 10))
+# Seconds a recycled or stopping worker gets to finish in-flight requests
+graceful_timeout = int(os.environ.get("GRACEFUL_TIMEOUT", 30))
+timeout = int(os.environ.get("WORKER_TIMEOUT", 120))
+keepalive = 5
+
+
+def when_ready(server):
+    """Runs in the master after the app is preloaded, before any worker is forked"""
+    # Move everything loaded so far out of the garbage collector's view, so
+    # collections in the workers never write to (and un-share) those pages
+    gc.collect()
+    gc.freeze()
+    if os.environ.get("ANALYSIS_EXECUTOR", "thread").lower() == "process":
+        server.log.warning("ANALYSIS_EXECUTOR=process starts a process pool in every worker; "
+                           "prefer the thread executor with several gunicorn workers")
+    server.log.info(f"Preloaded app shared by {server.num_workers} workers")
@@ -0,0 +1,88 @@
+"""Single-pass keyword matching over a fixed, categorized vocabulary"""
+import re
+from collections import Counter
+from typing import Dict, Iterable, Iterator, Tuple
+
+# Marks the end of a term inside the trie
+_END = ""
+
+
+def _build_trie(terms: Iterable[str]) -> Dict:
+    trie: Dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[_END] = True
+    return trie
+
+
+def _trie_to_regex(node: Dict) -> str:
+    """Render a character trie as a regex without redundant alternation.
+
+    Shared prefixes are factored out, so the engine does one walk down the
+    trie per text position instead of trying every term. A term that is a
+    prefix of a longer one becomes an optional (greedy) suffix, which makes
+    the longest term win.
+    """
+    branches = [re.escape(char) + _trie_to_regex(child)
+                for char, child in sorted(node.items()) if char != _END]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if _END in node:
+        body = "(?:" + body + ")?"
+    return body
+
+
+class KeywordMatcher:
+    """Compiled, word-bounded matcher for a categorized vocabulary.
+
+    Built once from ``{category: [terms]}``. Matching is a single
+    ``finditer`` over the text no matter how many terms there are, and terms
+    only match as whole words, so 'ai' does not match inside 'maintained'.
+    Terms are matched case-insensitively against lowercased text.
+    """
+
+    def __init__(self, categories: Dict[str, Iterable[str]]):
+        self.categories: Dict[str, frozenset] = {}
+        term_categories: Dict[str, list] = {}
+        for category, terms in categories.items():
+            normalized = frozenset(t.strip().lower() for t in terms if t and t.strip())
+            self.categories[category] = normalized
+            for term in normalized:
+                term_categories.setdefault(term, []).append(category)
+        self._term_categories: Dict[str, Tuple[str, ...]] = {
+            term: tuple(cats) for term, cats in term_categories.items()
+        }
+        if self._term_categories:
+            body = _trie_to_regex(_build_trie(self._term_categories))
+            self._pattern = re.compile(r"(?<!\w)" + body + r"(?!\w)")
+        else:
+            self._pattern = None
+
+    def __len__(self) -> int:
+        return len(self._term_categories)
+
+    def categories_for(self, term: str) -> Tuple[str, ...]:
+        """Categories a term belongs to"""
+        return self._term_categories.get(term, ())
+
+    def iter_matches(self, text_lower: str) -> Iterator[Tuple[str, int, int]]:
+        """Yield ``(term, start, end)`` for every non-overlapping match"""
+        if self._pattern is None:
+            return
+        for m in self._pattern.finditer(text_lower):
+            yield m.group(), m.start(), m.end()
+
+    def count(self, matches: Iterable[Tuple[str, int, int]]) -> Dict[str, Counter]:
+        """Occurrences of each term in ``matches``, grouped by category"""
+        hits: Dict[str, Counter] = {category: Counter() for category in self.categories}
+        for term, _, _ in matches:
+            for category in self._term_categories[term]:
+                hits[category][term] += 1
+        return hits
+
+    def match(self, text_lower: str) -> Dict[str, Counter]:
+        """Count occurrences of each matched term, grouped by category"""
+        return self.count(self.iter_matches(text_lower))
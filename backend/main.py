@@ -1,55 +1,151 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, HTTPException, UploadFile, File, Header, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 # Removed spacy dependency - using NLTK instead
-import textstat
-import re
-from typing import Dict, List
-import io
+from typing import Dict, List, Optional, Tuple, Union
+import asyncio
+import hmac
+import json
+import time
 import logging
-from docx import Document
-import PyPDF2
-import nltk
 from collections import Counter
-import numpy as np
+from dataclasses import asdict, replace
+from executor import AnalysisExecutor, ExecutorBusyError
+from cache import LocalCache, ResultCache, content_hash
+from document import ParsedDocument, TokenizedBlock, assemble_document, parse_document, tokenize_block
+from tokenizers import resolve_tokenizer
+from sections import SectionIndex
+from extraction import (
+    DEFAULT_LIMITS, DEFAULT_PDF_OPTIONS, DOCX_CONTENT_TYPE, PDF_CONTENT_TYPE, TEXT_CONTENT_TYPE,
+    SUPPORTED_CONTENT_TYPES, ExtractionError, ExtractionLimits, ExtractedText, extract_text, shutdown_page_pool
+)
+from pdf_extractors import available_pdf_extractors
+from matching import JobIndex, match_job_description, score_against_job
+from middleware import BodySizeLimitMiddleware, CompressionMiddleware
+from admission import (
+    CLIENT_SCOPE_KEY, AdmissionControlMiddleware, AdmissionController, LocalTokenBucketStore,
+    RedisTokenBucketStore
+)
+from tasks import Task, TaskQueue, TaskQueueFullError
+from sessions import EditError, EditSession
+from scoring_config import (
+    ACTION_VERB_CATEGORY, DEFAULT_CONFIG_PATH, ConfigError, ConfigStore, ScoringConfig
+)
+from metrics import SIZE_BUCKETS, Registry, StageTimer, call_timed
+from profiling import GROUP_BY, MemoryProfiler
 
-# Download required NLTK data
 import os
+import resources
 
-def ensure_nltk_data():
-    """Ensure NLTK data is downloaded"""
-    try:
-        # Try to download NLTK data
-        import nltk
-        nltk.download('punkt', quiet=True)
-        nltk.download('stopwords', quiet=True) 
-        nltk.download('wordnet', quiet=True)
-        print("NLTK data downloaded successfully")
-        return True
-    except Exception as e:
-        print(f"Warning: Could not download NLTK data: {e}")
-        # Try alternative approach
-        try:
-            import nltk.data
-            nltk.data.find('tokenizers/punkt')
-            print("NLTK punkt tokenizer found")
-            return True
-        except LookupError:
-            print("Warning: NLTK punkt tokenizer not available")
-            return False
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Locate (and unless NLTK_OFFLINE is set, download) NLTK data before serving
+resources.ensure_nltk_resources()
+
+# Sentence/word tokenizer: nltk (punkt), fast (regular expressions, bullet aware, no
+# NLTK data needed) or auto (nltk when punkt is available, otherwise fast)
+TOKENIZER = resolve_tokenizer(os.environ.get("TOKENIZER", "nltk"), resources.is_ready())
+
+# Fail at startup, not on the first upload, if PDF_EXTRACTOR names a missing backend
+DEFAULT_PDF_OPTIONS.check()
 
-# Download NLTK data on startup
-ensure_nltk_data()
+# Opt-in tracemalloc profiling, reported on /admin/memory; admin endpoints
+# require X-Admin-Token and are disabled while ADMIN_TOKEN is unset
+MEMORY_PROFILING = os.environ.get("MEMORY_PROFILING", "false").lower() in ("1", "true", "yes")
+memory_profiler = MemoryProfiler(frames=int(os.environ.get("MEMORY_PROFILING_FRAMES", 1)))
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+
+# Request stages run on separate executors: uploads are read on the event loop, text
+# is extracted from them on the extraction executor (EXTRACTION_EXECUTOR, thread by
+# default) and scored on the analysis executor (ANALYSIS_EXECUTOR=inline|thread|process),
+# so slow uploads being parsed never hold the workers that score pasted text
+analysis_executor = AnalysisExecutor.from_env()
+extraction_executor = AnalysisExecutor.from_env("EXTRACTION", name="extraction")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop application-wide resources"""
+    if MEMORY_PROFILING:
+        memory_profiler.start()
+    task_queue.start()
+    config_watcher = None
+    if SCORING_CONFIG_RELOAD_INTERVAL > 0:
+        config_watcher = asyncio.create_task(watch_scoring_config(SCORING_CONFIG_RELOAD_INTERVAL))
+    yield
+    if config_watcher is not None:
+        config_watcher.cancel()
+    await task_queue.stop()
+    analysis_executor.shutdown(wait=False)
+    extraction_executor.shutdown(wait=False)
+    shutdown_page_pool()
+    if MEMORY_PROFILING:
+        memory_profiler.stop()
 
 # Initialize FastAPI app
 app = FastAPI(
     title="ResumeScore API",
     description="AI-powered resume analysis API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
+)
+
+# Upload limits: per-file bytes, and whole request bodies for other endpoints
+MAX_UPLOAD_BYTES = int(os.environ.get("MAX_UPLOAD_BYTES", 10 * 1024 * 1024))
+MAX_REQUEST_BYTES = int(os.environ.get("MAX_REQUEST_BYTES", 100 * 1024 * 1024))
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# Headroom for multipart boundaries and part headers around a single file
+MULTIPART_OVERHEAD_BYTES = 16 * 1024
+
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_body_bytes=MAX_REQUEST_BYTES,
+    path_limits={"/analyze/file": MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES}
+)
+
+# Compress complete responses of at least this many bytes (0 disables); brotli is
+# negotiated when the brotli package is installed, gzip otherwise
+COMPRESSION_MIN_BYTES = int(os.environ.get("COMPRESSION_MIN_BYTES", 1024))
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=COMPRESSION_MIN_BYTES,
+    gzip_level=int(os.environ.get("COMPRESSION_GZIP_LEVEL", 6)),
+    brotli_quality=int(os.environ.get("COMPRESSION_BROTLI_QUALITY", 4))
 )
 
-# Add CORS middleware
+# Admission control for analysis requests: per-client token buckets charged by
+# estimated cost (1 token per request, per RATE_LIMIT_BYTES_PER_TOKEN of body and
+# per RATE_LIMIT_TOKENS_PER_PAGE PDF page), plus in-flight limits (0 disables)
+RATE_LIMIT_TOKENS_PER_SECOND = float(os.environ.get("RATE_LIMIT_TOKENS_PER_SECOND", 1))
+RATE_LIMIT_BURST = float(os.environ.get("RATE_LIMIT_BURST", 120))
+RATE_LIMIT_BYTES_PER_TOKEN = int(os.environ.get("RATE_LIMIT_BYTES_PER_TOKEN", 64 * 1024))
+RATE_LIMIT_TOKENS_PER_PAGE = float(os.environ.get("RATE_LIMIT_TOKENS_PER_PAGE", 0.5))
+RATE_LIMIT_REDIS_URL = os.environ.get("RATE_LIMIT_REDIS_URL")
+admission = AdmissionController(
+    store=RedisTokenBucketStore(RATE_LIMIT_REDIS_URL) if RATE_LIMIT_REDIS_URL else LocalTokenBucketStore(),
+    rate=RATE_LIMIT_TOKENS_PER_SECOND,
+    burst=RATE_LIMIT_BURST,
+    max_in_flight=int(os.environ.get("MAX_IN_FLIGHT_ANALYSES", 0)),
+    max_in_flight_per_client=int(os.environ.get("MAX_IN_FLIGHT_ANALYSES_PER_CLIENT", 4))
+)
+app.add_middleware(
+    AdmissionControlMiddleware,
+    controller=admission,
+    # Status polling is cheap and not limited; session edits pay for their body up front
+    # and for the share of the text they change in the endpoint
+    path_prefixes=("/analyze", "/match", "/jobs", "/tasks", "/sessions"),
+    methods=("POST", "PATCH"),
+    method_base_costs={"PATCH": 0},
+    bytes_per_token=RATE_LIMIT_BYTES_PER_TOKEN,
+    api_keys=[key.strip() for key in os.environ.get("RATE_LIMIT_API_KEYS", "").split(",") if key.strip()],
+    trusted_proxies=int(os.environ.get("RATE_LIMIT_TRUSTED_PROXIES", 0))
+)
+
+# Add CORS middleware last: the last middleware added is the outermost, so responses
+# produced by the middleware above (413, 429) still carry CORS headers
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -62,148 +158,267 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Retry-After"],
 )
 
-# Initialize NLTK components
-from nltk.tokenize import word_tokenize, sent_tokenize
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-
-# Initialize NLTK components with error handling
-stop_words = set()
-lemmatizer = None
-
-def init_nltk_components():
-    """Initialize NLTK components with proper error handling"""
-    global stop_words, lemmatizer
-    try:
-        stop_words = set(stopwords.words('english'))
-        lemmatizer = WordNetLemmatizer()
-        print("NLTK components initialized successfully")
-    except LookupError as e:
-        print(f"LookupError: {e}. Attempting to download missing data...")
-        try:
-            nltk.download('stopwords', quiet=True)
-            nltk.download('wordnet', quiet=True)
-            stop_words = set(stopwords.words('english'))
-            lemmatizer = WordNetLemmatizer()
-            print("NLTK components initialized after download")
-        except Exception as retry_e:
-            print(f"Failed to initialize NLTK components: {retry_e}")
-            # Fallback to basic stopwords
-            stop_words = set(['the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'])
-            lemmatizer = None
-    except Exception as e:
-        print(f"Unexpected error initializing NLTK: {e}")
-        stop_words = set(['the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'])
-        lemmatizer = None
-
-# Initialize components
-init_nltk_components()
-
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
 # Pydantic models
 class ResumeTextRequest(BaseModel):
     text: str
 
+class TermSpan(BaseModel):
+    term: str
+    start: int
+    end: int
+    categories: List[str] = []
+
+class SectionResult(BaseModel):
+    name: str
+    heading: str
+    start: int
+    end: int
+    scores: Dict[str, int]
+    keywords: List[TermSpan]
+    action_verbs: List[TermSpan]
+
 class AnalysisResponse(BaseModel):
     overall_score: int
     breakdown: Dict[str, int]
     suggestions: Dict[str, str]
+    sections: List[SectionResult] = []
+    config_version: Optional[str] = None
+    truncated: bool = False
+    truncation_reason: Optional[str] = None
 
-# Industry keywords for different sectors
-INDUSTRY_KEYWORDS = {
-    'technology': [
-        'python', 'java', 'javascript', 'react', 'node.js', 'sql', 'aws', 'docker',
-        'kubernetes', 'machine learning', 'ai', 'data science', 'agile', 'scrum',
-        'git', 'api', 'microservices', 'cloud', 'devops', 'ci/cd', 'mongodb',
-        'postgresql', 'redis', 'elasticsearch', 'tensorflow', 'pytorch'
-    ],
-    'business': [
-        'management', 'leadership', 'strategy', 'operations', 'marketing',
-        'sales', 'finance', 'budgeting', 'planning', 'analysis', 'reporting',
-        'project management', 'team building', 'negotiation', 'communication'
-    ],
-    'design': [
-        'ui/ux', 'photoshop', 'illustrator', 'figma', 'sketch', 'prototyping',
-        'wireframing', 'design thinking', 'user research', 'branding', 'typography',
-        'color theory', 'responsive design', 'accessibility'
-    ],
-    'healthcare': [
-        'patient care', 'medical', 'healthcare', 'nursing', 'clinical', 'diagnosis',
-        'treatment', 'emr', 'hipaa', 'medical records', 'pharmacology'
-    ],
-    'finance': [
-        'financial analysis', 'accounting', 'excel', 'financial modeling',
-        'risk management', 'compliance', 'audit', 'gaap', 'sox', 'cpa'
-    ]
-}
+class BatchTextRequest(BaseModel):
+    texts: List[str]
 
-# Common action verbs for resumes
-ACTION_VERBS = [
-    'achieved', 'administered', 'analyzed', 'coordinated', 'created', 'developed',
-    'directed', 'established', 'evaluated', 'executed', 'generated', 'implemented',
-    'improved', 'increased', 'initiated', 'led', 'managed', 'organized', 'planned',
-    'produced', 'reduced', 'resolved', 'supervised', 'trained', 'transformed'
-]
+class BatchItemResult(BaseModel):
+    index: int
+    filename: Optional[str] = None
+    result: Optional[AnalysisResponse] = None
+    error: Optional[str] = None
 
-def extract_text_from_pdf(file_content: bytes) -> str:
-    """Extract text from PDF file"""
-    try:
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text.strip()
-    except Exception as e:
-        logger.error(f"Error extracting PDF text: {e}")
-        raise HTTPException(status_code=400, detail="Unable to extract text from PDF")
+class BatchAnalysisResponse(BaseModel):
+    results: List[BatchItemResult]
 
-def extract_text_from_docx(file_content: bytes) -> str:
-    """Extract text from DOCX file"""
-    try:
-        doc = Document(io.BytesIO(file_content))
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text.strip()
-    except Exception as e:
-        logger.error(f"Error extracting DOCX text: {e}")
-        raise HTTPException(status_code=400, detail="Unable to extract text from DOCX")
+class TaskStatus(BaseModel):
+    task_id: str
+    status: str
+    priority: int
+    total: int
+    completed: int
+    error: Optional[str] = None
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    expires_at: Optional[float] = None
 
-def analyze_grammar(text: str) -> Dict:
-    """Analyze grammar and language quality using NLTK"""
-    sentences = sent_tokenize(text)
-    
-    # Count potential grammar issues
-    issues = []
-    sentence_lengths = []
-    
-    for sentence in sentences:
-        words = word_tokenize(sentence)
-        sentence_lengths.append(len(words))
-        
-        # Check for very long sentences (>30 words)
-        if len(words) > 30:
-            issues.append("Long sentence detected")
-        
-        # Check for incomplete sentences
-        if len(words) < 3:
-            issues.append("Short/incomplete sentence")
+class SessionCreateRequest(BaseModel):
+    text: str
+
+class TextEdit(BaseModel):
+    start: int
+    end: int
+    text: str
+
+class SessionEditRequest(BaseModel):
+    revision: int
+    edits: List[TextEdit] = []
+    text: Optional[str] = None
+
+class SessionResponse(BaseModel):
+    session_id: str
+    revision: int
+    result: Optional[AnalysisResponse] = None
+    error: Optional[str] = None
+
+class MatchRequest(BaseModel):
+    job_description: str
+    resumes: List[str]
+
+class JobRegistrationRequest(BaseModel):
+    job_description: str
+    reference_resumes: List[str] = []
+
+class JobRegistrationResponse(BaseModel):
+    job_id: str
+    term_count: int
+
+class JobMatchRequest(BaseModel):
+    resumes: List[str]
+
+class MatchResult(BaseModel):
+    index: int
+    relevance_score: int
+    matched_terms: List[str]
+    missing_terms: List[str]
+
+class MatchResponse(BaseModel):
+    job_id: Optional[str] = None
+    results: List[MatchResult]
+
+# Batch limits: max items per request, items scored per executor job, and executor
+# jobs one batch request may occupy at a time (one worker is always left free)
+MAX_BATCH_SIZE = int(os.environ.get("MAX_BATCH_SIZE", 1000))
+BATCH_CHUNK_SIZE = int(os.environ.get("BATCH_CHUNK_SIZE", 16))
+BATCH_MAX_IN_FLIGHT = int(os.environ.get("BATCH_MAX_IN_FLIGHT", max(1, analysis_executor.max_workers - 1)))
+
+# Background tasks: tasks run at once, tasks queued or running before 503,
+# seconds results are kept, and executor jobs one task may occupy at a time
+TASK_WORKERS = int(os.environ.get("TASK_WORKERS", 1))
+TASK_QUEUE_SIZE = int(os.environ.get("TASK_QUEUE_SIZE", 100))
+TASK_RESULT_TTL = float(os.environ.get("TASK_RESULT_TTL", 3600))
+TASK_MAX_IN_FLIGHT = int(os.environ.get("TASK_MAX_IN_FLIGHT", max(1, analysis_executor.max_workers // 2)))
+
+# Live editing sessions: sessions kept in memory and idle seconds before they expire
+MAX_EDIT_SESSIONS = int(os.environ.get("MAX_EDIT_SESSIONS", 1000))
+EDIT_SESSION_TTL = float(os.environ.get("EDIT_SESSION_TTL", 1800))
+
+# Job-description matching: registered jobs kept in memory and terms listed per result
+MAX_REGISTERED_JOBS = int(os.environ.get("MAX_REGISTERED_JOBS", 1000))
+JOB_INDEX_TTL = float(os.environ.get("JOB_INDEX_TTL", 86400))
+MATCH_TOP_TERMS = int(os.environ.get("MATCH_TOP_TERMS", 20))
+
+# Keywords, verbs, sections, patterns and weights come from a versioned JSON file,
+# compiled once and hot-swapped on reload (SCORING_CONFIG_PATH)
+SCORING_CONFIG_PATH = os.environ.get("SCORING_CONFIG_PATH", DEFAULT_CONFIG_PATH)
+SCORING_CONFIG_RELOAD_INTERVAL = float(os.environ.get("SCORING_CONFIG_RELOAD_INTERVAL", 0))
+scoring_config = ConfigStore(SCORING_CONFIG_PATH)
+
+# Bump whenever analyzer code changes so cached scores are invalidated; config
+# changes are covered by the config file's own version
+ANALYZER_VERSION = "5"
+
+def on_scoring_config_reloaded():
+    """Recycle worker processes so new ones start with the reloaded config"""
+    if analysis_executor.mode == "process":
+        analysis_executor.reset(cancel_futures=False)
+
+async def watch_scoring_config(interval: float):
+    """Reload the scoring config whenever its file changes"""
+    while True:
+        await asyncio.sleep(interval)
+        # Compiling the keyword patterns takes a while; keep it off the event loop
+        if await asyncio.to_thread(scoring_config.reload_if_changed):
+            on_scoring_config_reloaded()
+
+# Cached analysis results keyed by normalized text, and extracted text keyed by upload bytes
+result_cache = ResultCache("analysis", LocalCache(
+    maxsize=int(os.environ.get("RESULT_CACHE_SIZE", 1024)),
+    ttl=float(os.environ.get("RESULT_CACHE_TTL", 3600))
+))
+extraction_cache = ResultCache("extraction", LocalCache(
+    maxsize=int(os.environ.get("EXTRACTION_CACHE_SIZE", 256)),
+    ttl=float(os.environ.get("EXTRACTION_CACHE_TTL", 3600))
+))
+
+# Job descriptions compiled into TF-IDF vectors, keyed by job_id
+job_indexes = LocalCache(maxsize=MAX_REGISTERED_JOBS, ttl=JOB_INDEX_TTL)
+
+# Live editing sessions keyed by session_id
+edit_sessions = LocalCache(maxsize=MAX_EDIT_SESSIONS, ttl=EDIT_SESSION_TTL)
+
+# Prometheus metrics served on /metrics
+metrics_registry = Registry()
+stage_duration = metrics_registry.histogram(
+    "resumescore_stage_duration_seconds",
+    "Time spent in each stage of the analysis pipeline",
+    ("stage", "file_type")
+)
+input_size = metrics_registry.histogram(
+    "resumescore_input_size_bytes",
+    "Size of submitted resume text or uploaded files",
+    ("file_type",),
+    buckets=SIZE_BUCKETS
+)
+analysis_errors = metrics_registry.counter(
+    "resumescore_analysis_errors_total",
+    "Analysis requests that failed, by endpoint and status code",
+    ("endpoint", "status")
+)
+cache_hits = metrics_registry.counter(
+    "resumescore_cache_hits_total", "Cache lookups that found an entry", ("cache",)
+)
+cache_misses = metrics_registry.counter(
+    "resumescore_cache_misses_total", "Cache lookups that found nothing", ("cache",)
+)
+queue_depth = metrics_registry.gauge(
+    "resumescore_queue_depth", "Jobs running or waiting in the analysis executor"
+)
+queue_rejections = metrics_registry.counter(
+    "resumescore_queue_rejections_total", "Jobs rejected because the analysis queue was full"
+)
+extraction_queue_depth = metrics_registry.gauge(
+    "resumescore_extraction_queue_depth", "Jobs running or waiting in the extraction executor"
+)
+extraction_queue_rejections = metrics_registry.counter(
+    "resumescore_extraction_queue_rejections_total", "Jobs rejected because the extraction queue was full"
+)
+admission_rejections = metrics_registry.counter(
+    "resumescore_admission_rejections_total",
+    "Requests refused with 429 by admission control, by reason",
+    ("reason",)
+)
+not_modified = metrics_registry.counter(
+    "resumescore_not_modified_total",
+    "Analysis requests answered with 304 from If-None-Match, by endpoint",
+    ("endpoint",)
+)
+request_peak_memory = metrics_registry.histogram(
+    "resumescore_request_peak_memory_bytes",
+    "Peak traced memory per analysis request, recorded only while MEMORY_PROFILING is on",
+    ("file_type",),
+    buckets=SIZE_BUCKETS
+)
+background_tasks = metrics_registry.gauge(
+    "resumescore_tasks", "Retained background analysis tasks by status", ("status",)
+)
+
+def collect_runtime_metrics():
+    """Copy cache and executor counters into the registry at scrape time"""
+    for cache in (result_cache, extraction_cache):
+        cache_hits.set_total(cache.hits, cache=cache.name)
+        cache_misses.set_total(cache.misses, cache=cache.name)
+    queue_depth.set(analysis_executor.queue_depth)
+    queue_rejections.set_total(analysis_executor.rejected)
+    extraction_queue_depth.set(extraction_executor.queue_depth)
+    extraction_queue_rejections.set_total(extraction_executor.rejected)
+    for reason, count in admission.rejections.items():
+        admission_rejections.set_total(count, reason=reason)
+    for status, count in task_queue.counts().items():
+        background_tasks.set(count, status=status)
+
+metrics_registry.add_collector(collect_runtime_metrics)
+
+# Report scores, keyword hits and action verbs per resume section, with the
+# character offsets of each section and matched term
+SECTION_DETAILS = os.environ.get("SECTION_DETAILS", "true").lower() in ("1", "true", "yes")
+
+# Add a Server-Timing header with the per-stage breakdown to analysis responses
+SERVER_TIMING = os.environ.get("SERVER_TIMING", "false").lower() in ("1", "true", "yes")
+
+FILE_TYPE_LABELS = {
+    PDF_CONTENT_TYPE: "pdf",
+    DOCX_CONTENT_TYPE: "docx",
+    TEXT_CONTENT_TYPE: "txt"
+}
+
+def analyze_grammar(doc: ParsedDocument) -> Dict:
+    """Analyze grammar and language quality from the per-sentence token counts"""
+    # Count potential grammar issues: very long sentences (>30 words) and incomplete ones
+    lengths = doc.sentence_lengths
+    issue_count = sum(1 for length in lengths if length > 30 or length < 3)
     
     # Calculate average sentence length
-    avg_sentence_length = np.mean(sentence_lengths) if sentence_lengths else 0
+    avg_sentence_length = sum(lengths) / len(lengths) if lengths else 0
     
     # Score based on issues found
-    grammar_score = max(0, 100 - len(issues) * 10)
+    grammar_score = max(0, 100 - issue_count * 10)
     
     suggestions = []
     if avg_sentence_length > 25:
         suggestions.append("Consider breaking down long sentences for better readability.")
-    if len(issues) > 5:
+    if issue_count > 5:
         suggestions.append("Multiple grammar issues detected. Consider proofreading.")
     if not suggestions:
         suggestions.append("Grammar appears to be in good shape!")
@@ -213,12 +428,14 @@ def analyze_grammar(text: str) -> Dict:
         'suggestion': ' '.join(suggestions)
     }
 
-def analyze_readability(text: str) -> Dict:
-    """Analyze text readability using textstat"""
+def analyze_readability(doc: ParsedDocument) -> Dict:
+    """Analyze text readability from the document's word, sentence and syllable counts"""
     try:
-        # Calculate various readability scores
-        flesch_score = textstat.flesch_reading_ease(text)
-        flesch_kincaid = textstat.flesch_kincaid_grade(text)
+        # Flesch formulas computed from the shared counts instead of re-tokenizing
+        words_per_sentence = doc.word_count / doc.sentence_count
+        syllables_per_word = doc.syllable_count / doc.word_count
+        flesch_score = 206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word
+        flesch_kincaid = 0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59
         
         # Convert Flesch score to our 0-100 scale
         if flesch_score >= 90:
@@ -244,28 +461,32 @@ def analyze_readability(text: str) -> Dict:
             
         return {
             'score': int(readability_score),
-            'suggestion': suggestion
+            'suggestion': suggestion,
+            'grade_level': round(flesch_kincaid, 1)
         }
-    except:
+    except ZeroDivisionError:
         return {
             'score': 70,
             'suggestion': "Unable to calculate readability score. Ensure text has sufficient content."
         }
 
-def analyze_keywords(text: str) -> Dict:
-    """Analyze keyword usage and industry relevance"""
-    text_lower = text.lower()
-    
-    # Count industry keywords
-    all_keywords = []
-    for keywords in INDUSTRY_KEYWORDS.values():
-        all_keywords.extend(keywords)
+def analyze_keywords(doc: ParsedDocument, hits: Optional[Dict[str, Counter]] = None,
+                     config: Optional[ScoringConfig] = None) -> Dict:
+    """Analyze keyword usage and industry relevance.
+
+    ``hits`` may carry matches already found block by block (see sessions).
+    """
+    config = config or scoring_config.current()
+    # The lowercased copy lives only as long as the match
+    hits = dict(hits) if hits is not None else config.keyword_matcher.match(doc.text.lower())
     
-    found_keywords = [kw for kw in all_keywords if kw in text_lower]
-    action_verbs_found = [verb for verb in ACTION_VERBS if verb in text_lower]
+    # Distinct industry keywords and action verbs present as whole words
+    action_verbs_found = hits.pop(ACTION_VERB_CATEGORY)
+    industry_hits = {industry: len(counts) for industry, counts in hits.items()}
+    found_keywords = set().union(*hits.values())
     
     # Calculate keyword density
-    total_words = len(text.split())
+    total_words = doc.word_count
     keyword_density = (len(found_keywords) + len(action_verbs_found)) / max(total_words, 1) * 100
     
     # Score based on keyword presence and density
@@ -283,41 +504,39 @@ def analyze_keywords(text: str) -> Dict:
     
     return {
         'score': int(keyword_score),
-        'suggestion': ' '.join(suggestions)
+        'suggestion': ' '.join(suggestions),
+        'industry_hits': industry_hits
     }
 
-def analyze_structure(text: str) -> Dict:
-    """Analyze resume structure and formatting"""
-    lines = text.split('\n')
-    non_empty_lines = [line for line in lines if line.strip()]
+def analyze_structure(doc: ParsedDocument, config: Optional[ScoringConfig] = None,
+                      index: Optional[SectionIndex] = None) -> Dict:
+    """Analyze resume structure and formatting; sections come from their headings"""
+    config = config or scoring_config.current()
+    index = index or SectionIndex.build(doc, config.sections, config.bullet_prefixes)
+    found_sections = set(index.names())
     
-    # Check for common resume sections
-    sections = ['experience', 'education', 'skills', 'summary', 'objective', 'projects']
-    found_sections = []
-    
-    for line in non_empty_lines:
-        line_lower = line.lower()
-        for section in sections:
-            if section in line_lower:
-                found_sections.append(section)
-    
-    # Check for bullet points
-    bullet_points = sum(1 for line in non_empty_lines if line.strip().startswith(('•', '-', '*', '→')))
+    # One pass over the lines for bullet points and length
+    bullet_points = 0
+    line_count = 0
+    for line in doc.iter_lines():
+        line_count += 1
+        if line.strip().startswith(config.bullet_prefixes):
+            bullet_points += 1
     
     # Check for contact information patterns
-    has_email = bool(re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text))
-    has_phone = bool(re.search(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', text))
+    has_email = bool(config.email_pattern.search(doc.text))
+    has_phone = bool(config.phone_pattern.search(doc.text))
     
     # Calculate structure score
     structure_score = 0
-    structure_score += len(set(found_sections)) * 15  # Points for each unique section
+    structure_score += len(found_sections) * 15       # Points for each unique section
     structure_score += min(20, bullet_points * 2)     # Points for bullet points
     structure_score += 10 if has_email else 0         # Email present
     structure_score += 10 if has_phone else 0         # Phone present
-    structure_score += 10 if len(non_empty_lines) > 10 else 0  # Sufficient content
+    structure_score += 10 if line_count > 10 else 0   # Sufficient content
     
     suggestions = []
-    if len(set(found_sections)) < 3:
+    if len(found_sections) < 3:
         suggestions.append("Include key sections: Summary/Objective, Experience, Education, and Skills.")
     if bullet_points < 5:
         suggestions.append("Use bullet points to organize information and improve readability.")
@@ -333,142 +552,849 @@ def analyze_structure(text: str) -> Dict:
         'suggestion': ' '.join(suggestions)
     }
 
-def calculate_overall_score(breakdown: Dict[str, int]) -> int:
+def calculate_overall_score(breakdown: Dict[str, int], config: Optional[ScoringConfig] = None) -> int:
     """Calculate weighted overall score"""
-    weights = {
-        'grammar': 0.25,
-        'readability': 0.25,
-        'keywords': 0.25,
-        'structure': 0.25
-    }
+    weights = (config or scoring_config.current()).weights
     
-    overall = sum(breakdown[category] * weights[category] for category in breakdown)
+    overall = sum(breakdown[category] * weights[category] for category in breakdown) / sum(weights.values())
     return int(round(overall))
 
+def normalize_resume_text(text: str) -> str:
+    """Normalize line endings and trailing whitespace, which never affect scores"""
+    return "\n".join(line.rstrip() for line in text.strip().splitlines())
+
+def validate_resume_text(text: str) -> str:
+    """Normalize resume text and reject input too short to score"""
+    text = normalize_resume_text(text)
+    
+    if not text:
+        raise HTTPException(status_code=400, detail="Resume text cannot be empty")
+    
+    if len(text) < 100:
+        raise HTTPException(status_code=400, detail="Resume text too short for meaningful analysis")
+    
+    return text
+
+def run_analysis_timed(text: str, tokenizer: Optional[str] = None) -> Tuple[Dict, Dict[str, float]]:
+    """Run every analyzer on validated resume text, timing each stage.
+
+    Module-level and free of request state so it can be shipped to a
+    worker process by the analysis executor; the timings travel back with
+    the result because metrics live in the parent process.
+    """
+    config = scoring_config.current()
+    timer = StageTimer()
+    with timer.stage('tokenize'):
+        doc = parse_document(text, tokenizer or TOKENIZER, config.heading_name)
+    return score_document(doc, timer, config=config), timer.timings
+
+def score_document(doc: ParsedDocument, timer: StageTimer,
+                   keyword_hits: Optional[Dict[str, Counter]] = None,
+                   config: Optional[ScoringConfig] = None,
+                   matches: Optional[List[Tuple[str, int, int]]] = None) -> Dict:
+    """Run every analyzer on a parsed document and combine their scores.
+
+    The scoring config is captured once so a concurrent reload never mixes
+    two configs within one result; its version is returned with the scores.
+    ``matches`` may carry keyword spans already found block by block.
+    """
+    config = config or scoring_config.current()
+    with timer.stage('sections'):
+        index = SectionIndex.build(doc, config.sections, config.bullet_prefixes)
+    with timer.stage('grammar'):
+        grammar_result = analyze_grammar(doc)
+    with timer.stage('readability'):
+        readability_result = analyze_readability(doc)
+    with timer.stage('keywords'):
+        # One keyword pass serves both the document totals and the per-section spans
+        if matches is None and (SECTION_DETAILS or keyword_hits is None):
+            matches = list(config.keyword_matcher.iter_matches(lowercase(doc.text)))
+        if keyword_hits is None:
+            keyword_hits = config.keyword_matcher.count(matches)
+        keywords_result = analyze_keywords(doc, keyword_hits, config)
+    with timer.stage('structure'):
+        structure_result = analyze_structure(doc, config, index)
+    sections = []
+    if SECTION_DETAILS:
+        with timer.stage('section_scores'):
+            sections = score_sections(doc, index, matches, config)
+    
+    breakdown = {
+        'grammar': grammar_result['score'],
+        'readability': readability_result['score'],
+        'keywords': keywords_result['score'],
+        'structure': structure_result['score']
+    }
+    
+    suggestions = {
+        'grammar': grammar_result['suggestion'],
+        'readability': readability_result['suggestion'],
+        'keywords': keywords_result['suggestion'],
+        'structure': structure_result['suggestion']
+    }
+    
+    return {
+        'overall_score': calculate_overall_score(breakdown, config),
+        'breakdown': breakdown,
+        'suggestions': suggestions,
+        'sections': sections,
+        'config_version': config.version
+    }
+
+def lowercase(text: str) -> str:
+    """Lowercase text, keeping offsets: characters whose lowercase is longer stay as they are"""
+    lower = text.lower()
+    if len(lower) != len(text):
+        lower = "".join(char if len(char.lower()) != 1 else char.lower() for char in text)
+    return lower
+
+def score_sections(doc: ParsedDocument, index: SectionIndex, matches: List[Tuple[str, int, int]],
+                   config: ScoringConfig) -> List[Dict]:
+    """Grammar, readability and keyword scores of each section, with its matched terms.
+
+    Sections are scored by the document analyzers on a view of the already
+    tokenized document, and keyword matches found for the whole document are
+    assigned to sections by offset, so nothing is tokenized or matched again.
+    """
+    matcher = config.keyword_matcher
+    section_matches: List[List[Tuple[str, int, int]]] = [[] for _ in index]
+    for match in matches:
+        position = index.find(match[1])
+        if position is not None:
+            section_matches[position].append(match)
+    
+    results = []
+    for section, found in zip(index, section_matches):
+        part = doc.span(section.start, section.end)
+        keywords, action_verbs = [], []
+        for term, start, end in found:
+            categories = [category for category in matcher.categories_for(term) if category != ACTION_VERB_CATEGORY]
+            if categories:
+                keywords.append({'term': term, 'start': start, 'end': end, 'categories': categories})
+            if ACTION_VERB_CATEGORY in matcher.categories_for(term):
+                action_verbs.append({'term': term, 'start': start, 'end': end})
+        scores = {'keywords': analyze_keywords(part, matcher.count(found), config)['score']}
+        # A section without sentences has nothing for grammar or readability to judge
+        if part.sentence_count:
+            scores.update(grammar=analyze_grammar(part)['score'], readability=analyze_readability(part)['score'])
+        results.append({
+            'name': section.name,
+            'heading': section.heading,
+            'start': section.start,
+            'end': section.end,
+            'scores': scores,
+            'keywords': keywords,
+            'action_verbs': action_verbs,
+        })
+    return results
+
+def run_analysis(text: str, tokenizer: Optional[str] = None) -> Dict:
+    """Run every analyzer on validated resume text"""
+    return run_analysis_timed(text, tokenizer)[0]
+
+def run_analysis_batch(items: List[Tuple[Optional[str], object]]) -> List[Dict]:
+    """Score a chunk of batch items inside a single executor job.
+
+    Each item is ``(content_type, payload)``: raw text when content_type is
+    None, otherwise file bytes to extract first. Failures are reported per
+    item so one bad resume does not fail the whole batch. File items also
+    report the PDF pages read, for rate limiting.
+    """
+    results = []
+    for content_type, payload in items:
+        try:
+            if content_type is None:
+                results.append({'result': run_analysis(validate_resume_text(payload))})
+                continue
+            extracted = extract_text(content_type, payload)
+            result = run_analysis(validate_resume_text(extracted.text))
+            result.update(truncated=extracted.truncated, truncation_reason=extracted.truncation_reason)
+            results.append({'result': result, 'pages': extracted.pages})
+        except HTTPException as e:
+            results.append({'error': e.detail})
+        except ExtractionError as e:
+            results.append({'error': str(e)})
+        except Exception as e:
+            logger.error(f"Batch item analysis error: {e}")
+            results.append({'error': "Internal server error during analysis"})
+    return results
+
+def analyze_block(block: str, config: ScoringConfig) -> Tuple[TokenizedBlock, List[Tuple[str, int, int]]]:
+    """Per-block session state: tokens plus keyword matches, offsets relative to the block"""
+    tokens = tokenize_block(block, TOKENIZER, config.heading_name)
+    return tokens, list(config.keyword_matcher.iter_matches(lowercase(block)))
+
+def score_session(session: EditSession) -> Tuple[Dict, Dict[str, float]]:
+    """Score a session's current text, re-analyzing only blocks that changed"""
+    try:
+        text = validate_resume_text(session.text)
+    except HTTPException as e:
+        return {'error': e.detail}, {}
+    config = scoring_config.current()
+    timer = StageTimer()
+    with timer.stage('tokenize'):
+        # Cached keyword hits are only valid for the config that produced them
+        states = session.block_states(text, lambda block: analyze_block(block, config),
+                                      config.version, config.heading_name)
+        doc = assemble_document(text, [tokens for tokens, _ in states])
+    with timer.stage('keywords'):
+        # Shift each block's cached matches by where the block starts
+        matches, offset = [], 0
+        for tokens, block_matches in states:
+            matches.extend((term, offset + start, offset + end) for term, start, end in block_matches)
+            offset += tokens.length
+        hits = config.keyword_matcher.count(matches)
+    result = score_document(doc, timer, hits, config, matches)
+    return {'result': result}, timer.timings
+
+def result_cache_key(text: str, config_version: Optional[str] = None) -> str:
+    """Cache key for the analysis of normalized text under a scoring config (default: current)"""
+    config_version = config_version or scoring_config.current().version
+    return content_hash(ANALYZER_VERSION, TOKENIZER, config_version, text)
+
+def analysis_etag(*parts: Union[str, bytes], config_version: Optional[str] = None) -> str:
+    """Strong ETag for an analysis of the given input under a scoring config (default: current)"""
+    config_version = config_version or scoring_config.current().version
+    return '"' + content_hash(ANALYZER_VERSION, TOKENIZER, config_version, *parts)[:32] + '"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an ETag against an If-None-Match header"""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in [candidate.removeprefix("W/") for candidate in candidates]
+
+def not_modified_response(endpoint: str, etag: str) -> Response:
+    not_modified.inc(endpoint=endpoint)
+    return Response(status_code=304, headers={"ETag": etag})
+
+async def read_upload(file: UploadFile, max_bytes: Optional[int] = None) -> bytes:
+    """Read an upload in chunks, rejecting it as soon as it exceeds max_bytes"""
+    max_bytes = max_bytes or MAX_UPLOAD_BYTES
+    chunks = []
+    size = 0
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File too large. The limit is {max_bytes // (1024 * 1024)} MB."
+            )
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+def queue_full_error(e: ExecutorBusyError) -> HTTPException:
+    """Build the 503 backpressure response for a saturated analysis queue"""
+    logger.warning(f"Rejecting analysis request: {e}")
+    return HTTPException(
+        status_code=503,
+        detail="Server is busy analyzing other resumes. Please retry shortly.",
+        headers={"Retry-After": "1"}
+    )
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
     return {"message": "ResumeScore API is running!", "status": "healthy"}
 
+def upload_key(content_type: str, max_pages: Optional[int], data: bytes) -> str:
+    """One digest identifying an upload for both the ETag and the extraction cache"""
+    return content_hash(content_type, DEFAULT_PDF_OPTIONS.backend, str(max_pages or ""), data)
+
+async def extract_upload(content_type: str, data: bytes, limits: Optional[ExtractionLimits],
+                         cache_key: str, timer: StageTimer, client: Optional[str] = None) -> ExtractedText:
+    """Extraction stage: text from upload bytes via the extraction cache, falling back to the extraction executor"""
+    cached = extraction_cache.get(cache_key)
+    if cached is not None:
+        return ExtractedText(**cached)
+    start = time.perf_counter()
+    try:
+        extracted, seconds = await extraction_executor.run(call_timed, extract_text, content_type, data, limits)
+    except ExtractionError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ExecutorBusyError as e:
+        raise queue_full_error(e)
+    timer.add('extract', seconds)
+    timer.add('queue', time.perf_counter() - start - seconds)
+    extraction_cache.set(cache_key, asdict(extracted))
+    await admission.charge_async(client, extracted.pages * RATE_LIMIT_TOKENS_PER_PAGE)
+    return extracted
+
+async def score_text(text: str, timer: StageTimer) -> Dict:
+    """Scoring stage: validated text via the result cache, falling back to the analysis executor"""
+    cache_key = result_cache_key(text)
+    result = result_cache.get(cache_key)
+    if result is None:
+        start = time.perf_counter()
+        try:
+            result, timings = await analysis_executor.run(run_analysis_timed, text)
+        except ExecutorBusyError as e:
+            raise queue_full_error(e)
+        timer.add('queue', time.perf_counter() - start - sum(timings.values()))
+        timer.update(timings)
+        # Keyed by the config that actually scored it, in case it was reloaded meanwhile
+        result_cache.set(result_cache_key(text, result['config_version']), result)
+    return result
+
+def record_timings(timer: StageTimer, file_type: str, response: Response, peak_bytes: Optional[int] = None):
+    """Feed stage timings (and peak memory, when profiled) into the histograms and Server-Timing header"""
+    for stage, seconds in timer.timings.items():
+        stage_duration.observe(seconds, stage=stage, file_type=file_type)
+    if peak_bytes is not None:
+        request_peak_memory.observe(peak_bytes, file_type=file_type)
+    if SERVER_TIMING:
+        response.headers["Server-Timing"] = timer.server_timing()
+
 @app.post("/analyze", response_model=AnalysisResponse)
-async def analyze_resume_text(request: ResumeTextRequest):
-    """Analyze resume text and return scores with suggestions"""
+async def analyze_resume_text(request: ResumeTextRequest, response: Response,
+                              if_none_match: Optional[str] = Header(None)):
+    """Analyze resume text and return scores with suggestions.
+
+    Responses carry an ETag of the input and scoring config; sending it back
+    in If-None-Match returns 304 without running the analyzers.
+    """
+    timer = StageTimer()
     try:
-        text = request.text.strip()
-        
-        if not text:
-            raise HTTPException(status_code=400, detail="Resume text cannot be empty")
-        
-        if len(text) < 100:
-            raise HTTPException(status_code=400, detail="Resume text too short for meaningful analysis")
-        
-        # Perform analysis
-        grammar_result = analyze_grammar(text)
-        readability_result = analyze_readability(text)
-        keywords_result = analyze_keywords(text)
-        structure_result = analyze_structure(text)
+        with timer.stage('total'), memory_profiler.measure() as peak:
+            text = validate_resume_text(request.text)
+            if etag_matches(if_none_match, analysis_etag(text)):
+                return not_modified_response("/analyze", analysis_etag(text))
+            input_size.observe(len(text.encode('utf-8')), file_type='text')
+            result = await score_text(text, timer)
         
-        # Prepare response
-        breakdown = {
-            'grammar': grammar_result['score'],
-            'readability': readability_result['score'],
-            'keywords': keywords_result['score'],
-            'structure': structure_result['score']
-        }
-        
-        suggestions = {
-            'grammar': grammar_result['suggestion'],
-            'readability': readability_result['suggestion'],
-            'keywords': keywords_result['suggestion'],
-            'structure': structure_result['suggestion']
-        }
+        response.headers["ETag"] = analysis_etag(text, config_version=result['config_version'])
+        record_timings(timer, 'text', response, peak.bytes)
+        logger.info(f"Analysis completed. Overall score: {result['overall_score']}")
         
-        overall_score = calculate_overall_score(breakdown)
+        return AnalysisResponse(**result)
         
-        logger.info(f"Analysis completed. Overall score: {overall_score}")
-        
-        return AnalysisResponse(
-            overall_score=overall_score,
-            breakdown=breakdown,
-            suggestions=suggestions
-        )
-        
-    except HTTPException:
+    except HTTPException as e:
+        analysis_errors.inc(endpoint="/analyze", status=e.status_code)
         raise
     except Exception as e:
+        analysis_errors.inc(endpoint="/analyze", status=500)
         logger.error(f"Analysis error: {e}")
         raise HTTPException(status_code=500, detail="Internal server error during analysis")
 
 @app.post("/analyze/file", response_model=AnalysisResponse)
-async def analyze_resume_file(file: UploadFile = File(...)):
-    """Analyze uploaded resume file"""
+async def analyze_resume_file(request: Request, response: Response, file: UploadFile = File(...),
+                              max_pages: Optional[int] = Query(None, ge=1),
+                              if_none_match: Optional[str] = Header(None)):
+    """Analyze uploaded resume file; ``max_pages`` reads only the first pages of a PDF.
+
+    The ETag covers the file bytes, so a matching If-None-Match returns 304
+    before any extraction.
+    """
+    timer = StageTimer()
+    limits = None
+    if max_pages is not None:
+        limits = replace(DEFAULT_LIMITS, max_pdf_pages=min(max_pages, DEFAULT_LIMITS.max_pdf_pages))
     try:
         # Check file type
         if not file.content_type:
             raise HTTPException(status_code=400, detail="Unable to determine file type")
         
-        # Read file content
-        file_content = await file.read()
-        
-        # Extract text based on file type
-        if file.content_type == "application/pdf":
-            text = extract_text_from_pdf(file_content)
-        elif file.content_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-            text = extract_text_from_docx(file_content)
-        elif file.content_type == "text/plain":
-            text = file_content.decode('utf-8')
-        else:
+        if file.content_type not in SUPPORTED_CONTENT_TYPES:
             raise HTTPException(
                 status_code=400, 
                 detail="Unsupported file type. Please upload PDF, DOCX, or TXT files."
             )
+        file_type = FILE_TYPE_LABELS[file.content_type]
         
-        if not text or len(text.strip()) < 100:
-            raise HTTPException(
-                status_code=400, 
-                detail="Unable to extract sufficient text from file for analysis"
-            )
+        with timer.stage('total'), memory_profiler.measure() as peak:
+            # Read file content, enforcing the size limit as chunks arrive
+            with timer.stage('upload'):
+                file_content = await read_upload(file)
+            # Hashing a large upload takes milliseconds, so it happens off the event loop too
+            cache_key = await asyncio.to_thread(upload_key, file.content_type, max_pages, file_content)
+            if etag_matches(if_none_match, analysis_etag(cache_key)):
+                return not_modified_response("/analyze/file", analysis_etag(cache_key))
+            input_size.observe(len(file_content), file_type=file_type)
+            
+            # Extract text based on file type; repeat uploads skip extraction
+            extracted = await extract_upload(file.content_type, file_content, limits, cache_key, timer,
+                                             request.scope.get(CLIENT_SCOPE_KEY))
+            # The upload is not needed while scoring
+            del file_content
+            
+            if not extracted.text or len(extracted.text.strip()) < 100:
+                raise HTTPException(
+                    status_code=400, 
+                    detail="Unable to extract sufficient text from file for analysis"
+                )
+            
+            # Analyze the extracted text
+            result = await score_text(validate_resume_text(extracted.text), timer)
         
-        # Analyze the extracted text
-        return await analyze_resume_text(ResumeTextRequest(text=text))
+        response.headers["ETag"] = analysis_etag(cache_key, config_version=result['config_version'])
+        record_timings(timer, file_type, response, peak.bytes)
+        if extracted.truncated:
+            logger.info(f"Analyzed truncated document: {extracted.truncation_reason}")
+        logger.info(f"File analysis completed. Overall score: {result['overall_score']}")
         
-    except HTTPException:
+        return AnalysisResponse(
+            **result,
+            truncated=extracted.truncated,
+            truncation_reason=extracted.truncation_reason
+        )
+        
+    except HTTPException as e:
+        analysis_errors.inc(endpoint="/analyze/file", status=e.status_code)
         raise
     except Exception as e:
+        analysis_errors.inc(endpoint="/analyze/file", status=500)
         logger.error(f"File analysis error: {e}")
         raise HTTPException(status_code=500, detail="Error processing file")
 
-@app.get("/health")
-async def health_check():
-    """Detailed health check"""
+async def score_batch(items: List[Tuple[Optional[str], object]], filenames: List[Optional[str]],
+                      max_in_flight: Optional[int] = None, client: Optional[str] = None):
+    """Score batch items on the executor, yielding BatchItemResults as chunks finish.
+
+    Files are extracted on the extraction executor first. At most
+    ``max_in_flight`` chunks (default: BATCH_MAX_IN_FLIGHT) are in
+    progress at a time. PDF pages read are charged to ``client``.
+    """
+    # Identical submissions are scored once and fanned out to every index
+    unique: Dict[Tuple[Optional[str], object], List[int]] = {}
+    for index, item in enumerate(items):
+        unique.setdefault(item, []).append(index)
+    
+    # Texts are validated and looked up in the result cache before any work is queued
+    keys = []
+    for key in unique:
+        content_type, payload = key
+        if content_type is None:
+            try:
+                text = validate_resume_text(payload)
+            except HTTPException as e:
+                outcome = {'error': e.detail}
+            else:
+                outcome = result_cache.get(result_cache_key(text))
+                outcome = outcome and {'result': outcome}
+            if outcome:
+                for index in unique[key]:
+                    yield BatchItemResult(index=index, filename=filenames[index], **outcome)
+                continue
+        keys.append(key)
+    chunks = [keys[i:i + BATCH_CHUNK_SIZE] for i in range(0, len(keys), BATCH_CHUNK_SIZE)]
+    
+    # Leave executor capacity for interactive /analyze traffic
+    slots = asyncio.Semaphore(max(1, max_in_flight or BATCH_MAX_IN_FLIGHT))
+    
+    async def extract_item(key) -> Tuple[Optional[str], Dict]:
+        """Text to score for a batch item, or None and its error outcome"""
+        content_type, payload = key
+        if content_type is None:
+            return payload, {}
+        try:
+            extracted = await extract_upload(content_type, payload, None, upload_key(content_type, None, payload),
+                                             StageTimer(), client)
+        except HTTPException as e:
+            return None, {'error': e.detail}
+        except Exception as e:
+            logger.error(f"Batch item extraction error: {e}")
+            return None, {'error': "Internal server error during analysis"}
+        return extracted.text, {'truncated': extracted.truncated, 'truncation_reason': extracted.truncation_reason}
+    
+    async def run_chunk(chunk):
+        async with slots:
+            # Files are extracted on the extraction executor, as for /analyze/file,
+            # so only their text takes up analysis workers
+            prepared = await asyncio.gather(*(extract_item(key) for key in chunk))
+            texts = [(None, text) for text, _ in prepared if text is not None]
+            try:
+                scored = iter(await analysis_executor.run(run_analysis_batch, texts) if texts else [])
+            except ExecutorBusyError:
+                busy = "Server is busy analyzing other resumes. Please retry shortly."
+                return chunk, [{'error': busy}] * len(chunk)
+            outcomes = []
+            for text, extra in prepared:
+                outcome = extra if text is None else next(scored)
+                if text is not None and 'result' in outcome:
+                    outcome['result'].update(extra)
+                outcomes.append(outcome)
+            return chunk, outcomes
+    
+    pending = [asyncio.ensure_future(run_chunk(chunk)) for chunk in chunks]
     try:
-        # Test NLTK tokenizer with fallback
-        nltk_status = "unknown"
+        for finished in asyncio.as_completed(pending):
+            chunk, outcomes = await finished
+            for key, outcome in zip(chunk, outcomes):
+                content_type, payload = key
+                if content_type is None and 'result' in outcome:
+                    cache_key = result_cache_key(normalize_resume_text(payload), outcome['result']['config_version'])
+                    result_cache.set(cache_key, outcome['result'])
+                for index in unique[key]:
+                    yield BatchItemResult(index=index, filename=filenames[index], **outcome)
+    finally:
+        # A cancelled task or a disconnected stream must not leave chunks queued on the executor
+        for future in pending:
+            future.cancel()
+
+def validate_batch_size(count: int):
+    """Reject empty batches and batches over MAX_BATCH_SIZE"""
+    if not count:
+        raise HTTPException(status_code=400, detail="Batch must contain at least one resume")
+    if count > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch too large. Submit at most {MAX_BATCH_SIZE} resumes per request."
+        )
+
+async def charge_batch_items(client: Optional[str], count: int):
+    """Charge every item after the first as a request of its own; admission paid for the first"""
+    await admission.charge_async(client, count - 1)
+
+async def batch_response(request: Request, items: List[Tuple[Optional[str], object]],
+                         filenames: List[Optional[str]], stream: bool):
+    """Return batch results as one JSON document or as streamed NDJSON"""
+    validate_batch_size(len(items))
+    client = request.scope.get(CLIENT_SCOPE_KEY)
+    await charge_batch_items(client, len(items))
+    
+    if stream:
+        async def ndjson():
+            async for item in score_batch(items, filenames, client=client):
+                yield item.model_dump_json() + "\n"
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+    
+    results = [item async for item in score_batch(items, filenames, client=client)]
+    results.sort(key=lambda item: item.index)
+    logger.info(f"Batch analysis completed for {len(results)} resumes")
+    return BatchAnalysisResponse(results=results)
+
+@app.post("/analyze/batch", response_model=BatchAnalysisResponse)
+async def analyze_resume_batch(raw_request: Request, request: BatchTextRequest, stream: bool = False):
+    """Analyze many resume texts in one request.
+
+    With ``stream=true`` results are sent as NDJSON lines in completion order.
+    """
+    items = [(None, text) for text in request.texts]
+    return await batch_response(raw_request, items, [None] * len(items), stream)
+
+@app.post("/analyze/batch/files", response_model=BatchAnalysisResponse)
+async def analyze_resume_batch_files(request: Request, files: List[UploadFile] = File(...), stream: bool = False):
+    """Analyze many uploaded resume files in one request"""
+    validate_batch_size(len(files))
+    items = [(file.content_type or "", await read_upload(file)) for file in files]
+    return await batch_response(request, items, [file.filename for file in files], stream)
+
+def get_session(session_id: str) -> EditSession:
+    """Look up an editing session or raise 404 once it is unknown or expired"""
+    session = edit_sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired session_id")
+    return session
+
+async def session_response(session: EditSession, response: Response) -> SessionResponse:
+    """Re-score a session off the event loop and refresh its expiry"""
+    timer = StageTimer()
+    with timer.stage('total'):
+        # Bounded like /analyze, but never in a worker process: block state lives in this one
         try:
-            test_tokens = word_tokenize("This is a test sentence.")
-            nltk_status = "loaded" if test_tokens else "error"
-        except Exception as nltk_e:
-            nltk_status = f"error: {str(nltk_e)}"
-        
-        # Test textstat
-        textstat_status = "available"
+            outcome, timings = await analysis_executor.run_local(score_session, session)
+        except ExecutorBusyError as e:
+            raise queue_full_error(e)
+    timer.update(timings)
+    record_timings(timer, 'session', response)
+    edit_sessions.set(session.id, session)
+    return SessionResponse(session_id=session.id, revision=session.revision, **outcome)
+
+@app.post("/sessions", response_model=SessionResponse)
+async def create_session(request: SessionCreateRequest, response: Response):
+    """Start a live editing session and score its initial text"""
+    session = EditSession(request.text)
+    async with session.lock:
+        return await session_response(session, response)
+
+@app.patch("/sessions/{session_id}", response_model=SessionResponse)
+async def edit_session(raw_request: Request, session_id: str, request: SessionEditRequest, response: Response):
+    """Apply edits (or a full replacement text) to a session and re-score it.
+
+    ``revision`` must match the session's current revision so edits are
+    never applied to text the client has not seen.
+    """
+    session = get_session(session_id)
+    async with session.lock:
+        if request.revision != session.revision:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Session is at revision {session.revision}, not {request.revision}"
+            )
+        previous = session.text, session.revision
+        if request.text is not None:
+            session.replace(request.text)
+            changed = len(request.text)
+        else:
+            try:
+                session.apply((edit.start, edit.end, edit.text) for edit in request.edits)
+            except EditError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            changed = sum(max(edit.end - edit.start, len(edit.text)) for edit in request.edits)
+        # A full replacement costs a token like /analyze; an edit the share of the text it touched
+        await admission.charge_async(raw_request.scope.get(CLIENT_SCOPE_KEY),
+                                     min(1.0, changed / max(len(session.text), 1)))
         try:
-            textstat.flesch_reading_ease("test")
-        except Exception:
-            textstat_status = "error"
-        
-        return {
-            "status": "healthy",
-            "nltk_tokenizer": nltk_status,
-            "textstat": textstat_status,
+            return await session_response(session, response)
+        except HTTPException:
+            # Not scored (the queue is full): keep the revision the client can retry against
+            session.text, session.revision = previous
+            raise
+
+@app.get("/sessions/{session_id}", response_model=SessionResponse)
+async def session_status(session_id: str, response: Response):
+    """Current scores of an editing session"""
+    session = get_session(session_id)
+    async with session.lock:
+        return await session_response(session, response)
+
+@app.delete("/sessions/{session_id}", status_code=204)
+async def close_session(session_id: str):
+    """End an editing session and free its state"""
+    get_session(session_id)
+    edit_sessions.delete(session_id)
+    return Response(status_code=204)
+
+async def run_task(task: Task):
+    """Task runner: score a queued batch with limited executor capacity"""
+    items, filenames, client = task.payload
+    async for item in score_batch(items, filenames, max_in_flight=TASK_MAX_IN_FLIGHT, client=client):
+        yield item
+
+task_queue = TaskQueue(
+    run_task, workers=TASK_WORKERS, max_pending=TASK_QUEUE_SIZE, result_ttl=TASK_RESULT_TTL
+)
+
+async def submit_task(request: Request, items: List[Tuple[Optional[str], object]],
+                filenames: List[Optional[str]], priority: int) -> JSONResponse:
+    """Queue a batch as a background task and answer 202 with its status"""
+    validate_batch_size(len(items))
+    client = request.scope.get(CLIENT_SCOPE_KEY)
+    try:
+        task = task_queue.submit((items, filenames, client), total=len(items), priority=priority)
+    except TaskQueueFullError as e:
+        logger.warning(f"Rejecting task: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail="Too many analysis tasks are pending. Please retry later.",
+            headers={"Retry-After": "5"}
+        )
+    await charge_batch_items(client, len(items))
+    logger.info(f"Queued task {task.id} with {task.total} resumes")
+    return JSONResponse(
+        status_code=202,
+        content=task.snapshot(),
+        headers={"Location": f"/tasks/{task.id}"}
+    )
+
+def get_task(task_id: str) -> Task:
+    """Look up a task or raise 404 once it is unknown or expired"""
+    task = task_queue.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired task_id")
+    return task
+
+@app.post("/tasks", response_model=TaskStatus, status_code=202)
+async def create_task(raw_request: Request, request: BatchTextRequest, priority: int = 0):
+    """Queue resume texts for background analysis; higher priority runs first"""
+    items = [(None, text) for text in request.texts]
+    return await submit_task(raw_request, items, [None] * len(items), priority)
+
+@app.post("/tasks/files", response_model=TaskStatus, status_code=202)
+async def create_file_task(request: Request, files: List[UploadFile] = File(...), priority: int = 0):
+    """Queue uploaded resume files for background analysis"""
+    validate_batch_size(len(files))
+    items = [(file.content_type or "", await read_upload(file)) for file in files]
+    return await submit_task(request, items, [file.filename for file in files], priority)
+
+@app.get("/tasks/{task_id}", response_model=TaskStatus)
+async def task_status(task_id: str):
+    """Current status and progress of a background task"""
+    return TaskStatus(**get_task(task_id).snapshot())
+
+@app.get("/tasks/{task_id}/events")
+async def task_events(task_id: str):
+    """Stream status snapshots as NDJSON until the task finishes"""
+    task = get_task(task_id)
+    
+    async def ndjson():
+        async for snapshot in task_queue.watch(task):
+            yield json.dumps(snapshot) + "\n"
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+@app.get("/tasks/{task_id}/result", response_model=BatchAnalysisResponse)
+async def task_result(task_id: str):
+    """Results of a finished task; 409 while it is still queued or running"""
+    task = get_task(task_id)
+    if task.status != "succeeded":
+        raise HTTPException(status_code=409, detail=f"Task is {task.status}")
+    return BatchAnalysisResponse(results=sorted(task.results, key=lambda item: item.index))
+
+@app.delete("/tasks/{task_id}", response_model=TaskStatus)
+async def cancel_task(task_id: str):
+    """Cancel a queued or running task"""
+    get_task(task_id)
+    return TaskStatus(**task_queue.cancel(task_id).snapshot())
+
+def validate_job_description(job_description: str):
+    """Reject job descriptions with nothing to match against"""
+    if not job_description.strip():
+        raise HTTPException(status_code=400, detail="Job description cannot be empty")
+
+def validate_match_resumes(resumes: List[str]):
+    """Reject empty or oversized resume lists"""
+    if not resumes:
+        raise HTTPException(status_code=400, detail="Submit at least one resume to match")
+    if len(resumes) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch too large. Submit at most {MAX_BATCH_SIZE} resumes per request."
+        )
+
+async def run_matching(fn, *args) -> List[MatchResult]:
+    """Score resumes against a job on the executor, best match first"""
+    try:
+        outcomes = await analysis_executor.run(fn, *args)
+    except ExecutorBusyError as e:
+        raise queue_full_error(e)
+    results = [MatchResult(index=index, **outcome) for index, outcome in enumerate(outcomes)]
+    results.sort(key=lambda item: item.relevance_score, reverse=True)
+    return results
+
+@app.post("/match", response_model=MatchResponse)
+async def match_resumes(request: MatchRequest):
+    """Rank resumes against a job description given inline.
+
+    IDF weights are learned from the submitted resumes, so terms every
+    candidate lists count for less.
+    """
+    validate_job_description(request.job_description)
+    validate_match_resumes(request.resumes)
+    results = await run_matching(
+        match_job_description, request.job_description, request.resumes,
+        resources.get_stop_words(), MATCH_TOP_TERMS
+    )
+    return MatchResponse(results=results)
+
+@app.post("/jobs", response_model=JobRegistrationResponse)
+async def register_job(request: JobRegistrationRequest):
+    """Compile a job description into a stored vector for repeated matching"""
+    validate_job_description(request.job_description)
+    if len(request.reference_resumes) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many reference resumes. Submit at most {MAX_BATCH_SIZE}."
+        )
+    job_id = content_hash(request.job_description, *request.reference_resumes)[:16]
+    index = job_indexes.get(job_id)
+    if index is None:
+        try:
+            index = await analysis_executor.run(
+                JobIndex.build, request.job_description, resources.get_stop_words(),
+                request.reference_resumes
+            )
+        except ExecutorBusyError as e:
+            raise queue_full_error(e)
+        if not index.terms:
+            raise HTTPException(status_code=400, detail="Job description has no matchable terms")
+        job_indexes.set(job_id, index)
+    logger.info(f"Registered job {job_id} with {len(index.terms)} terms")
+    return JobRegistrationResponse(job_id=job_id, term_count=len(index.terms))
+
+@app.post("/jobs/{job_id}/match", response_model=MatchResponse)
+async def match_resumes_to_job(job_id: str, request: JobMatchRequest):
+    """Rank resumes against a registered job with one matrix-vector product"""
+    index = job_indexes.get(job_id)
+    if index is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job_id. Register the job again.")
+    validate_match_resumes(request.resumes)
+    results = await run_matching(
+        score_against_job, index, request.resumes, resources.get_stop_words(), MATCH_TOP_TERMS
+    )
+    return MatchResponse(job_id=job_id, results=results)
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Check the admin token; admin endpoints are closed until ADMIN_TOKEN is configured"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled; set ADMIN_TOKEN to enable them")
+    if not hmac.compare_digest((x_admin_token or "").encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Invalid or missing X-Admin-Token")
+
+@app.get("/config")
+async def get_scoring_config():
+    """Active scoring config version and summary"""
+    return scoring_config.stats()
+
+@app.post("/config/reload", dependencies=[Depends(require_admin)])
+async def reload_scoring_config():
+    """Reload the scoring config file; an invalid file leaves the active config in place"""
+    try:
+        await asyncio.to_thread(scoring_config.reload)
+    except ConfigError as e:
+        raise HTTPException(status_code=400, detail=f"Scoring config not reloaded: {e}")
+    on_scoring_config_reloaded()
+    return scoring_config.stats()
+
+def require_memory_profiling():
+    if not memory_profiler.enabled:
+        raise HTTPException(status_code=404, detail="Memory profiling is off; start with MEMORY_PROFILING=true")
+
+@app.get("/admin/memory", dependencies=[Depends(require_admin)])
+async def memory_report(limit: int = Query(20, ge=1, le=500), group_by: str = "lineno", compare: bool = True):
+    """Top allocation sites from a tracemalloc snapshot, by default as growth since the baseline"""
+    require_memory_profiling()
+    if group_by not in GROUP_BY:
+        raise HTTPException(status_code=400, detail=f"group_by must be one of {', '.join(GROUP_BY)}")
+    # Snapshots of a large heap take a while; keep them off the event loop
+    return await asyncio.to_thread(memory_profiler.report, limit, group_by, compare)
+
+@app.post("/admin/memory/baseline", dependencies=[Depends(require_admin)])
+async def reset_memory_baseline():
+    """Take a new baseline snapshot for /admin/memory comparisons"""
+    require_memory_profiling()
+    await asyncio.to_thread(memory_profiler.reset_baseline)
+    return {"status": "ok"}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrics for the analysis pipeline"""
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/health")
+async def health_check():
+    """Detailed health check; 503 until the NLTK tokenizers are verified (unless using the fast tokenizer)"""
+    ready = TOKENIZER == "fast" or resources.is_ready()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "healthy" if ready else "unavailable",
+            "ready": ready,
+            "tokenizer": TOKENIZER,
+            "nltk_tokenizer": "loaded" if resources.is_ready() else resources.resource_status.get("punkt", "unknown"),
+            "nltk_resources": resources.resource_status,
+            "offline": resources.NLTK_OFFLINE,
+            "executor": analysis_executor.stats(),
+            "extraction_executor": extraction_executor.stats(),
+            "tasks": task_queue.stats(),
+            "admission": admission.stats(),
+            "scoring_config": scoring_config.current().version,
+            "pdf_extraction": {
+                "backend": DEFAULT_PDF_OPTIONS.backend,
+                "fallback": DEFAULT_PDF_OPTIONS.fallback,
+                "workers": DEFAULT_PDF_OPTIONS.workers,
+                "available": available_pdf_extractors()
+            },
+            "cache": {
+                "analysis": result_cache.stats(),
+                "extraction": extraction_cache.stats()
+            },
             "version": "1.0.0",
             "port": os.environ.get("PORT", "8000")
         }
-    except Exception as e:
-        return JSONResponse(
-            status_code=503,
-            content={"status": "unhealthy", "error": str(e)}
-        )
+    )
 
 if __name__ == "__main__":
     import uvicorn
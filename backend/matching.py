@@ -0,0 +1,132 @@
+"""TF-IDF relevance of resumes against a job description"""
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, List, Optional, Sequence
+
+# numpy is imported where it is used, so importing this module does not load it
+if TYPE_CHECKING:
+    import numpy as np
+
+# Keeps tech terms such as c++, c#, node.js and ci/cd intact
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[./-][a-z0-9+#]+)*")
+
+
+def extract_terms(text: str, stop_words: FrozenSet[str]) -> Counter:
+    """Count unigrams and adjacent-word bigrams, ignoring stop words and single characters"""
+    tokens = [token for token in TOKEN_PATTERN.findall(text.lower())
+              if len(token) > 1 and token not in stop_words]
+    terms = Counter(tokens)
+    terms.update(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+    return terms
+
+
+def _sublinear(counts: "np.ndarray") -> "np.ndarray":
+    """1 + log(tf) for present terms, 0 otherwise"""
+    import numpy as np
+    weights = np.zeros_like(counts, dtype=np.float64)
+    present = counts > 0
+    weights[present] = 1.0 + np.log(counts[present])
+    return weights
+
+
+@dataclass
+class JobIndex:
+    """A job description compiled into a weighted term vector.
+
+    ``idf`` holds smoothed inverse document frequencies learned from the
+    reference resumes given at build time (terms every candidate mentions
+    count for less); without references every term weighs the same. The
+    index is immutable once built, so a resume's score never depends on
+    which other resumes it is scored with.
+    """
+    terms: List[str]
+    vocabulary: Dict[str, int]
+    weights: "np.ndarray"
+    idf: Dict[str, float]
+    default_idf: float
+
+    @classmethod
+    def build(cls, job_description: str, stop_words: FrozenSet[str],
+              reference_texts: Sequence[str] = ()) -> "JobIndex":
+        import numpy as np
+        job_terms = extract_terms(job_description, stop_words)
+        document_frequency: Counter = Counter()
+        for text in reference_texts:
+            document_frequency.update(set(extract_terms(text, stop_words)))
+
+        total = len(reference_texts)
+        idf = {term: math.log((1 + total) / (1 + df)) + 1 for term, df in document_frequency.items()}
+        default_idf = math.log(1 + total) + 1
+
+        terms = sorted(job_terms)
+        counts = np.array([job_terms[term] for term in terms], dtype=np.float64)
+        term_idf = np.array([idf.get(term, default_idf) for term in terms])
+        weights = _sublinear(counts) * term_idf
+        norm = np.linalg.norm(weights)
+        return cls(
+            terms=terms,
+            vocabulary={term: column for column, term in enumerate(terms)},
+            weights=weights / norm if norm else weights,
+            idf=idf,
+            default_idf=default_idf,
+        )
+
+    def vectorize(self, texts: Iterable[str], stop_words: FrozenSet[str]) -> "np.ndarray":
+        """L2-normalized TF-IDF rows restricted to the job's vocabulary.
+
+        Each row is normalized by the resume's full vector norm, so terms
+        outside the job description still dilute the score as usual for
+        cosine similarity.
+        """
+        import numpy as np
+        rows = []
+        for text in texts:
+            counts = extract_terms(text, stop_words)
+            row = np.zeros(len(self.terms))
+            norm_sq = 0.0
+            for term, count in counts.items():
+                weight = (1.0 + math.log(count)) * self.idf.get(term, self.default_idf)
+                norm_sq += weight * weight
+                column = self.vocabulary.get(term)
+                if column is not None:
+                    row[column] = weight
+            rows.append(row / math.sqrt(norm_sq) if norm_sq else row)
+        return np.vstack(rows) if rows else np.zeros((0, len(self.terms)))
+
+    def score(self, texts: Sequence[str], stop_words: FrozenSet[str],
+              top_terms: int = 20) -> List[Dict]:
+        """Relevance (0-100) plus matched and missing job terms for each resume.
+
+        All resumes are scored with one matrix-vector product against the
+        stored job vector.
+        """
+        import numpy as np
+        matrix = self.vectorize(texts, stop_words)
+        similarities = matrix @ self.weights
+        # Job terms ranked by importance, used to order matched/missing lists
+        ranked = np.argsort(-self.weights, kind="stable")
+        results = []
+        for row, similarity in zip(matrix, similarities):
+            present = row[ranked] > 0
+            results.append({
+                'relevance_score': int(round(float(np.clip(similarity, 0.0, 1.0)) * 100)),
+                'matched_terms': [self.terms[i] for i in ranked[present][:top_terms]],
+                'missing_terms': [self.terms[i] for i in ranked[~present][:top_terms]],
+            })
+        return results
+
+
+def score_against_job(index: JobIndex, texts: Sequence[str], stop_words: FrozenSet[str],
+                      top_terms: int = 20) -> List[Dict]:
+    """Module-level wrapper so scoring can run on the analysis executor"""
+    return index.score(texts, stop_words, top_terms)
+
+
+def match_job_description(job_description: str, texts: Sequence[str], stop_words: FrozenSet[str],
+                          top_terms: int = 20, reference_texts: Optional[Sequence[str]] = None) -> List[Dict]:
+    """Build a one-off index (IDF learned from the submitted resumes) and score them"""
+    references = texts if reference_texts is None else reference_texts
+    index = JobIndex.build(job_description, stop_words, references)
+    return index.score(texts, stop_words, top_terms)
@@ -0,0 +1,161 @@
+"""ASGI middleware shared by the API"""
+import gzip
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class BodySizeLimitMiddleware:
+    """Reject request bodies over a byte limit while they stream in.
+
+    Requests that declare a larger Content-Length are refused before any of
+    the body is read. Otherwise the bytes are counted as they arrive and
+    the request is aborted with 413 the moment the limit is crossed, so an
+    oversized upload is never spooled to disk or memory in full.
+    """
+
+    def __init__(self, app, max_body_bytes: int, path_limits: Optional[Dict[str, int]] = None):
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+        self.path_limits = path_limits or {}
+
+    def _too_large(self, limit: int) -> HTTPException:
+        return HTTPException(
+            status_code=413,
+            detail=f"Request body too large. The limit is {limit // (1024 * 1024)} MB."
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.path_limits.get(scope["path"], self.max_body_bytes)
+        for name, value in scope.get("headers", []):
+            if name == b"content-length" and value.isdigit() and int(value) > limit:
+                error = self._too_large(limit)
+                response = JSONResponse(status_code=error.status_code, content={"detail": error.detail})
+                await response(scope, receive, send)
+                return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise self._too_large(limit)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Map each coding in an Accept-Encoding header to its q-value"""
+    codings = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            codings[coding.strip().lower()] = quality
+    return codings
+
+
+class CompressionMiddleware:
+    """Compress complete responses of at least ``minimum_size`` bytes with brotli or gzip.
+
+    The coding is negotiated from Accept-Encoding; brotli is offered only
+    when the brotli package is installed. Streamed responses (NDJSON
+    progress, task events) pass through untouched so each line still
+    reaches the client as soon as it is written.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.encodings = ("br", "gzip") if brotli is not None else ("gzip",)
+
+    def choose_encoding(self, accept_encoding: str) -> Optional[str]:
+        codings = parse_accept_encoding(accept_encoding)
+        wildcard = codings.get("*", 0.0)
+        best, best_quality = None, 0.0
+        for encoding in self.encodings:
+            quality = codings.get(encoding, wildcard)
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def compress(self, encoding: str, body: bytes) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.minimum_size <= 0:
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = ""
+        for name, value in scope.get("headers", []):
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+        encoding = self.choose_encoding(accept_encoding)
+
+        start: Optional[dict] = None
+        passthrough = False
+
+        async def compressing_send(message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            headers: List[Tuple[bytes, bytes]] = list(start["headers"])
+            names = {name.lower() for name, _ in headers}
+            body = message.get("body", b"")
+            if message.get("more_body", False) or b"content-encoding" in names or start["status"] < 200 \
+                    or start["status"] in (204, 304):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            headers.append((b"vary", b"Accept-Encoding"))
+            if encoding is not None and len(body) >= self.minimum_size:
+                body = self.compress(encoding, body)
+                headers = [(name, value) for name, value in headers if name.lower() != b"content-length"]
+                headers += [(b"content-encoding", encoding.encode("latin-1")),
+                            (b"content-length", str(len(body)).encode("latin-1"))]
+                # A strong validator names one exact representation
+                headers = [(name, _weaken(value) if name.lower() == b"etag" else value)
+                           for name, value in headers]
+            await send({**start, "headers": headers})
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, compressing_send)
+
+
+def _weaken(etag: bytes) -> bytes:
+    return etag if etag.startswith(b"W/") else b"W/" + etag
@@ -0,0 +1,117 @@
+"""Pluggable PDF text extraction backends.
+
+PyPDF2 is the default and the only backend in requirements.txt. pypdf,
+pdfminer.six and PyMuPDF are used when installed; each library is imported
+only when its backend opens a document.
+"""
+import importlib.util
+import io
+from typing import Any, Dict, List
+
+
+class PdfExtractor:
+    """Opens a PDF and extracts text one page at a time"""
+    name = ""
+    requires = ""
+
+    def available(self) -> bool:
+        return importlib.util.find_spec(self.requires) is not None
+
+    def open(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+    def page_count(self, document: Any) -> int:
+        raise NotImplementedError
+
+    def page_text(self, document: Any, index: int) -> str:
+        raise NotImplementedError
+
+
+class PyPDF2Extractor(PdfExtractor):
+    name = "pypdf2"
+    requires = "PyPDF2"
+
+    def open(self, data: bytes) -> Any:
+        import PyPDF2
+        return PyPDF2.PdfReader(io.BytesIO(data))
+
+    def page_count(self, document: Any) -> int:
+        return len(document.pages)
+
+    def page_text(self, document: Any, index: int) -> str:
+        return document.pages[index].extract_text() or ""
+
+
+class PypdfExtractor(PyPDF2Extractor):
+    """PyPDF2's maintained successor, with better layout handling"""
+    name = "pypdf"
+    requires = "pypdf"
+
+    def open(self, data: bytes) -> Any:
+        import pypdf
+        return pypdf.PdfReader(io.BytesIO(data))
+
+
+class PdfminerExtractor(PdfExtractor):
+    """pdfminer.six layout analysis: slower, but keeps reading order on multi-column pages"""
+    name = "pdfminer"
+    requires = "pdfminer"
+
+    def open(self, data: bytes) -> Any:
+        from pdfminer.pdfdocument import PDFDocument
+        from pdfminer.pdfpage import PDFPage
+        from pdfminer.pdfparser import PDFParser
+        document = PDFDocument(PDFParser(io.BytesIO(data)))
+        return list(PDFPage.create_pages(document))
+
+    def page_count(self, document: Any) -> int:
+        return len(document)
+
+    def page_text(self, document: Any, index: int) -> str:
+        from pdfminer.converter import TextConverter
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        output = io.StringIO()
+        resources = PDFResourceManager()
+        device = TextConverter(resources, output, laparams=LAParams())
+        try:
+            PDFPageInterpreter(resources, device).process_page(document[index])
+        finally:
+            device.close()
+        return output.getvalue()
+
+
+class PyMuPDFExtractor(PdfExtractor):
+    """MuPDF bindings: the fastest backend, AGPL-licensed"""
+    name = "pymupdf"
+    requires = "pymupdf"
+
+    def open(self, data: bytes) -> Any:
+        import pymupdf
+        return pymupdf.open(stream=data, filetype="pdf")
+
+    def page_count(self, document: Any) -> int:
+        return document.page_count
+
+    def page_text(self, document: Any, index: int) -> str:
+        return document[index].get_text()
+
+
+PDF_EXTRACTORS: Dict[str, PdfExtractor] = {
+    extractor.name: extractor
+    for extractor in (PyPDF2Extractor(), PypdfExtractor(), PdfminerExtractor(), PyMuPDFExtractor())
+}
+
+
+def get_pdf_extractor(name: str) -> PdfExtractor:
+    """Look up an installed backend by name"""
+    extractor = PDF_EXTRACTORS.get(name)
+    if extractor is None:
+        raise ValueError(f"Unknown PDF extractor '{name}', expected one of {tuple(PDF_EXTRACTORS)}")
+    if not extractor.available():
+        raise ValueError(f"PDF extractor '{name}' needs the '{extractor.requires}' package")
+    return extractor
+
+
+def available_pdf_extractors() -> List[str]:
+    return [name for name, extractor in PDF_EXTRACTORS.items() if extractor.available()]
@@ -0,0 +1,143 @@
+"""Opt-in allocation profiling with tracemalloc.
+
+Tracing slows allocation-heavy code down noticeably, so it only runs when
+enabled (MEMORY_PROFILING). It covers this process: with the process
+executor, analysis allocations happen in worker processes and only show
+up here as the results they send back.
+"""
+import os
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+GROUP_BY = ("lineno", "filename", "traceback")
+
+# Allocations made by the profiler itself and by the import machinery are noise
+_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Resident set size of this process, where /proc is available"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+@dataclass
+class PeakMemory:
+    """Traced bytes allocated above the starting point while a block ran"""
+    bytes: Optional[int] = None
+
+
+class MemoryProfiler:
+    """Starts tracemalloc and reports the largest allocation sites.
+
+    ``start`` records a baseline snapshot; reports can show growth since
+    then, which is what points at a leak in a long-running worker.
+    """
+
+    def __init__(self, frames: int = 1):
+        self.frames = frames
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._lock = threading.Lock()
+        # Measurements in progress; the shared peak is only reset when there are none
+        self._measuring = 0
+        self.enabled = False
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self.enabled = True
+        self.reset_baseline()
+
+    def stop(self):
+        tracemalloc.stop()
+        self.enabled = False
+        self._baseline = None
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(_FILTERS)
+
+    def reset_baseline(self):
+        """Compare future reports against the heap as it is now"""
+        snapshot = self._snapshot()
+        with self._lock:
+            self._baseline = snapshot
+
+    @contextmanager
+    def measure(self) -> Iterator[PeakMemory]:
+        """Peak traced memory of the enclosed block, when tracing.
+
+        tracemalloc keeps one process-wide peak, so with concurrent requests
+        this is an upper bound that includes their allocations too. The peak
+        is not reset while another measurement is running, which would hide
+        that one's own peak.
+        """
+        peak = PeakMemory()
+        # Leave tracing started by someone else (such as the benchmarks) alone
+        if not self.enabled:
+            yield peak
+            return
+        with self._lock:
+            start, _ = tracemalloc.get_traced_memory()
+            if not self._measuring:
+                tracemalloc.reset_peak()
+            self._measuring += 1
+        try:
+            yield peak
+        finally:
+            with self._lock:
+                self._measuring -= 1
+                peak.bytes = max(0, tracemalloc.get_traced_memory()[1] - start)
+
+    def report(self, limit: int = 20, group_by: str = "lineno", compare: bool = True) -> Dict[str, Any]:
+        """Traced totals plus the top allocation sites, or their growth since the baseline"""
+        if group_by not in GROUP_BY:
+            raise ValueError(f"group_by must be one of {GROUP_BY}")
+        snapshot = self._snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        with self._lock:
+            baseline = self._baseline
+        top: List[Dict[str, Any]] = []
+        if compare and baseline is not None:
+            for stat in snapshot.compare_to(baseline, group_by)[:limit]:
+                top.append({
+                    "location": _location(stat.traceback, group_by),
+                    "size_bytes": stat.size,
+                    "size_diff_bytes": stat.size_diff,
+                    "count": stat.count,
+                    "count_diff": stat.count_diff,
+                })
+        else:
+            for stat in snapshot.statistics(group_by)[:limit]:
+                top.append({
+                    "location": _location(stat.traceback, group_by),
+                    "size_bytes": stat.size,
+                    "count": stat.count,
+                })
+        return {
+            "traced_bytes": current,
+            "peak_traced_bytes": peak,
+            "rss_bytes": current_rss_bytes(),
+            "tracemalloc_overhead_bytes": tracemalloc.get_tracemalloc_memory(),
+            "group_by": group_by,
+            "compared_to_baseline": compare and baseline is not None,
+            "top": top,
+        }
+
+
+def _location(traceback: tracemalloc.Traceback, group_by: str) -> str:
+    if group_by == "filename":
+        return traceback[0].filename
+    if group_by == "lineno":
+        return f"{traceback[0].filename}:{traceback[0].lineno}"
+    return " <- ".join(f"{frame.filename}:{frame.lineno}" for frame in reversed(traceback))
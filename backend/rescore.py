@@ -0,0 +1,327 @@
+"""Re-score a corpus of resumes offline with the API's scoring pipeline.
+
+Reads a directory, a .zip/.tar(.gz) archive or a JSONL file (one
+``{"id": ..., "text": ...}`` object per line), scores resumes in parallel
+across worker processes and appends results to a CSV file or a directory
+of Parquet parts as it goes. From ``backend/``::
+
+    python rescore.py resumes/ --output scores.csv
+    python rescore.py resumes.zip --output scores.parquet --workers 8
+    python rescore.py export.jsonl --output scores.csv    # rerun to resume
+
+Only a bounded window of resumes is held in memory at a time. Progress is
+checkpointed next to the output after every flush, and rerunning the same
+command continues where an interrupted run stopped; the source must not
+change in between. Pass ``--restart`` to start over.
+"""
+import argparse
+import collections
+import functools
+import itertools
+import json
+import logging
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from extraction import content_type_for
+from main import run_analysis_batch
+
+logger = logging.getLogger("rescore")
+
+SCORE_COLUMNS = ["overall_score", "grammar", "readability", "keywords", "structure"]
+COLUMNS = ["key", *SCORE_COLUMNS, "truncated", "error", "config_version"]
+FORMATS = ("csv", "parquet")
+
+# (key, content type or None for raw text, payload loader)
+Record = Tuple[str, Optional[str], Callable[[], object]]
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def iter_directory(root: str) -> Iterator[Record]:
+    """Supported files under ``root`` in a stable, sorted order"""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            content_type = content_type_for(name)
+            if content_type:
+                path = os.path.join(dirpath, name)
+                yield os.path.relpath(path, root), content_type, functools.partial(_read_file, path)
+
+
+def iter_zip(path: str) -> Iterator[Record]:
+    """Supported members of a zip archive in archive order"""
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            content_type = content_type_for(info.filename)
+            if content_type and not info.is_dir():
+                yield info.filename, content_type, functools.partial(archive.read, info)
+
+
+def iter_tar(path: str) -> Iterator[Record]:
+    """Supported members of a (compressed) tar archive in archive order"""
+    with tarfile.open(path) as archive:
+        for member in archive:
+            content_type = content_type_for(member.name)
+            if content_type and member.isfile():
+                yield member.name, content_type, lambda member=member: archive.extractfile(member).read()
+            # TarFile remembers every member it has seen; forget them to keep memory flat
+            archive.members = []
+
+
+def _parse_jsonl_text(line: str) -> str:
+    text = json.loads(line).get("text")
+    if not isinstance(text, str):
+        raise ValueError("missing 'text' field")
+    return text
+
+
+def iter_jsonl(path: str) -> Iterator[Record]:
+    """One resume per line; the key is the ``id`` field or the line number"""
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                key = str(json.loads(line).get("id", number))
+            except (ValueError, AttributeError):
+                key = str(number)
+            yield key, None, functools.partial(_parse_jsonl_text, line)
+
+
+def iter_source(path: str) -> Iterator[Record]:
+    """Records from a directory, zip, tar or JSONL source"""
+    if os.path.isdir(path):
+        return iter_directory(path)
+    if path.lower().endswith((".jsonl", ".ndjson")):
+        return iter_jsonl(path)
+    if zipfile.is_zipfile(path):
+        return iter_zip(path)
+    if tarfile.is_tarfile(path):
+        return iter_tar(path)
+    raise ValueError(f"Unsupported source {path}: expected a directory, .zip, .tar(.gz) or .jsonl")
+
+
+def to_row(key: str, outcome: Dict) -> Dict:
+    """Flatten one batch outcome into an output row"""
+    result = outcome.get("result") or {}
+    breakdown = result.get("breakdown", {})
+    return {
+        "key": key,
+        "overall_score": result.get("overall_score"),
+        **{category: breakdown.get(category) for category in SCORE_COLUMNS[1:]},
+        "truncated": bool(result.get("truncated")),
+        "error": outcome.get("error"),
+        "config_version": result.get("config_version"),
+    }
+
+
+def to_frame(rows: List[Dict]) -> pd.DataFrame:
+    """Rows as a DataFrame; scores stay integers even beside an error row's empty ones"""
+    return pd.DataFrame(rows, columns=COLUMNS).astype({column: "Int64" for column in SCORE_COLUMNS})
+
+
+class CsvWriter:
+    """Append rows to one CSV file; the position is its size in bytes"""
+
+    def __init__(self, path: str, position: int = 0):
+        self.path = path
+        self._file = open(path, "a+b")
+        # Drop rows written after the last checkpoint
+        self._file.truncate(position)
+        self._file.seek(position)
+
+    @property
+    def position(self) -> int:
+        return self._file.tell()
+
+    def write(self, rows: List[Dict]):
+        frame = to_frame(rows)
+        self._file.write(frame.to_csv(index=False, header=self.position == 0).encode("utf-8"))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetWriter:
+    """Write each flush as a numbered part file; the position is the part count"""
+
+    def __init__(self, path: str, position: int = 0):
+        self.path = path
+        self.position = position
+        os.makedirs(path, exist_ok=True)
+        # Drop parts written after the last checkpoint
+        for name in os.listdir(path):
+            if name.startswith("part-") and int(name[5:10]) >= position:
+                os.remove(os.path.join(path, name))
+
+    def write(self, rows: List[Dict]):
+        frame = to_frame(rows)
+        frame.to_parquet(os.path.join(self.path, f"part-{self.position:05d}.parquet"), index=False)
+        self.position += 1
+
+    def close(self):
+        pass
+
+
+def checkpoint_path(output: str) -> str:
+    return output.rstrip(os.sep) + ".checkpoint.json"
+
+
+def load_checkpoint(output: str, source: str, fmt: str) -> Dict:
+    """Progress of a previous run writing ``output`` from the same source"""
+    fresh = {"source": os.path.abspath(source), "format": fmt, "records": 0, "position": 0}
+    try:
+        with open(checkpoint_path(output)) as f:
+            checkpoint = json.load(f)
+    except FileNotFoundError:
+        return fresh
+    if (checkpoint.get("source"), checkpoint.get("format")) != (fresh["source"], fmt):
+        raise ValueError(
+            f"{checkpoint_path(output)} belongs to a run over {checkpoint.get('source')} "
+            f"({checkpoint.get('format')}); use --restart to overwrite it"
+        )
+    return checkpoint
+
+
+def save_checkpoint(output: str, checkpoint: Dict):
+    """Write the checkpoint atomically so a crash never leaves it half-written"""
+    path = checkpoint_path(output)
+    with open(path + ".tmp", "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(path + ".tmp", path)
+
+
+def _load_chunk(records: Iterable[Record]) -> Tuple[List[str], List[Tuple[Optional[str], object]], List[Optional[Dict]]]:
+    """Read payloads for a chunk; unreadable records get an error outcome up front.
+
+    Each payload is read before the source advances, which archive
+    sources rely on.
+    """
+    keys, items, outcomes = [], [], []
+    for key, content_type, load in records:
+        keys.append(key)
+        try:
+            items.append((content_type, load()))
+            outcomes.append(None)
+        except Exception as e:
+            outcomes.append({"error": f"Unable to read resume: {e}"})
+    return keys, items, outcomes
+
+
+def _loaded_chunks(records: Iterator[Record], size: int) -> Iterator[Tuple]:
+    while True:
+        keys, items, outcomes = _load_chunk(itertools.islice(records, size))
+        if not keys:
+            return
+        yield keys, items, outcomes
+
+
+def rescore(source: str, output: str, fmt: Optional[str] = None, workers: Optional[int] = None,
+            chunk_size: int = 16, flush_every: int = 1000, restart: bool = False) -> Dict[str, int]:
+    """Score every resume in ``source`` into ``output``, resuming from a checkpoint.
+
+    ``workers=0`` scores in this process. At most two chunks per worker
+    are in flight, and results are written in source order so the
+    checkpoint only needs the number of records done.
+    """
+    fmt = fmt or ("parquet" if output.rstrip(os.sep).endswith(".parquet") else "csv")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format '{fmt}', expected one of {FORMATS}")
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    if restart and os.path.exists(checkpoint_path(output)):
+        os.remove(checkpoint_path(output))
+    checkpoint = load_checkpoint(output, source, fmt)
+    writer = (ParquetWriter if fmt == "parquet" else CsvWriter)(output, checkpoint["position"])
+
+    records = itertools.islice(iter_source(source), checkpoint["records"], None)
+    pool = ProcessPoolExecutor(max_workers=workers) if workers else None
+    window = workers * 2 if pool is not None else 1
+    in_flight: "collections.deque" = collections.deque()
+    rows: List[Dict] = []
+    stats = {"skipped": checkpoint["records"], "scored": 0, "errors": 0}
+    started = time.perf_counter()
+
+    def flush():
+        if not rows:
+            return
+        writer.write(rows)
+        checkpoint["records"] += len(rows)
+        checkpoint["position"] = writer.position
+        save_checkpoint(output, checkpoint)
+        rate = stats["scored"] / max(time.perf_counter() - started, 1e-9)
+        logger.info(f"{checkpoint['records']} resumes done ({rate:.1f}/s)")
+        rows.clear()
+
+    def collect():
+        keys, outcomes, future = in_flight.popleft()
+        scored = iter(future.result())
+        for key, outcome in zip(keys, outcomes):
+            outcome = outcome or next(scored)
+            stats["scored"] += 1
+            stats["errors"] += "error" in outcome
+            rows.append(to_row(key, outcome))
+        if len(rows) >= flush_every:
+            flush()
+
+    try:
+        for keys, items, outcomes in _loaded_chunks(records, chunk_size):
+            if pool is not None:
+                future = pool.submit(run_analysis_batch, items)
+            else:
+                future = Future()
+                future.set_result(run_analysis_batch(items))
+            in_flight.append((keys, outcomes, future))
+            while len(in_flight) >= window:
+                collect()
+        while in_flight:
+            collect()
+        flush()
+    finally:
+        writer.close()
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Re-score a corpus of resumes offline")
+    parser.add_argument("source", help="directory, .zip/.tar(.gz) archive or .jsonl file")
+    parser.add_argument("--output", required=True,
+                        help="CSV file, or a directory of Parquet parts when ending in .parquet")
+    parser.add_argument("--format", choices=FORMATS, help="override the format implied by --output")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count, 0 = in-process)")
+    parser.add_argument("--chunk-size", type=int, default=16, help="resumes per worker job")
+    parser.add_argument("--flush-every", type=int, default=1000, help="resumes per write and checkpoint")
+    parser.add_argument("--restart", action="store_true", help="ignore any checkpoint and start over")
+    args = parser.parse_args(argv)
+
+    logging.getLogger().setLevel(logging.WARNING)
+    logger.setLevel(logging.INFO)
+    if args.format == "parquet" or (not args.format and args.output.rstrip(os.sep).endswith(".parquet")):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            parser.error("Parquet output needs pyarrow: pip install pyarrow")
+
+    stats = rescore(args.source, args.output, args.format, args.workers, args.chunk_size,
+                    args.flush_every, args.restart)
+    print(f"Scored {stats['scored']} resumes ({stats['errors']} errors), "
+          f"skipped {stats['skipped']} already in {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
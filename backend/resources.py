@@ -0,0 +1,92 @@
+"""NLTK data discovery, optional download and readiness state"""
+import logging
+import os
+from functools import lru_cache
+from typing import Dict, FrozenSet, Optional, Tuple
+
+import nltk
+from nltk.tokenize import punkt
+
+logger = logging.getLogger(__name__)
+
+# Offline mode never touches the network: resources must already be on disk
+# (e.g. baked into the image at build time) or they are reported missing.
+NLTK_OFFLINE = os.environ.get("NLTK_OFFLINE", "false").lower() in ("1", "true", "yes")
+
+# NLTK 3.9+ loads punkt from the plain-text punkt_tab tables; older releases
+# unpickle the punkt model instead.
+if hasattr(punkt, "PunktTokenizer"):
+    _PUNKT = ("tokenizers/punkt_tab/english/", "punkt_tab")
+else:
+    _PUNKT = ("tokenizers/punkt/english.pickle", "punkt")
+
+# name -> (nltk.data path, downloader package, required for analysis)
+NLTK_RESOURCES: Dict[str, Tuple[str, str, bool]] = {
+    "punkt": (_PUNKT[0], _PUNKT[1], True),
+    "stopwords": ("corpora/stopwords", "stopwords", False),
+}
+
+FALLBACK_STOP_WORDS = frozenset([
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'
+])
+
+# name -> "ready" | "missing" | "error: ..."
+resource_status: Dict[str, str] = {}
+
+
+def find_nltk_resource(path: str) -> Optional[str]:
+    """Location of an NLTK resource on disk, or None"""
+    try:
+        return str(nltk.data.find(path))
+    except LookupError:
+        return None
+
+
+def _verify_tokenizers():
+    """Load punkt and tokenize a sentence so the first request pays nothing"""
+    from nltk.tokenize import sent_tokenize, word_tokenize
+    word_tokenize(sent_tokenize("Resume scoring is ready. Tokenizers loaded.")[0])
+
+
+def ensure_nltk_resources(offline: bool = NLTK_OFFLINE) -> Dict[str, str]:
+    """Locate NLTK data, downloading only what is missing unless running offline"""
+    for name, (path, package, _) in NLTK_RESOURCES.items():
+        if find_nltk_resource(path) is None and not offline:
+            logger.info(f"NLTK resource '{name}' not found, downloading '{package}'")
+            try:
+                nltk.download(package, quiet=True, raise_on_error=True)
+            except Exception as e:
+                logger.warning(f"Could not download NLTK resource '{package}': {e}")
+        resource_status[name] = "ready" if find_nltk_resource(path) else "missing"
+
+    if resource_status["punkt"] == "ready":
+        try:
+            _verify_tokenizers()
+        except Exception as e:
+            resource_status["punkt"] = f"error: {e}"
+
+    for name, status in resource_status.items():
+        if status != "ready":
+            logger.warning(f"NLTK resource '{name}' unavailable ({status})")
+    get_stop_words.cache_clear()
+    return resource_status
+
+
+def is_ready() -> bool:
+    """True once every resource the analyzers need has been verified"""
+    return all(
+        resource_status.get(name) == "ready"
+        for name, (_, _, required) in NLTK_RESOURCES.items() if required
+    )
+
+
+@lru_cache(maxsize=1)
+def get_stop_words() -> FrozenSet[str]:
+    """English stop words, loaded on first use, with a small built-in fallback"""
+    if resource_status.get("stopwords") != "ready":
+        return FALLBACK_STOP_WORDS
+    from nltk.corpus import stopwords
+    try:
+        return frozenset(stopwords.words('english'))
+    except LookupError:
+        return FALLBACK_STOP_WORDS
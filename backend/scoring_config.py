@@ -0,0 +1,177 @@
+"""Versioned scoring configuration, compiled once and swapped atomically"""
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Pattern, Tuple
+
+from keyword_matcher import KeywordMatcher
+from sections import heading_name
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scoring_config.json")
+SCORE_CATEGORIES = ("grammar", "readability", "keywords", "structure")
+ACTION_VERB_CATEGORY = "action_verbs"
+
+
+class ConfigError(ValueError):
+    """Raised when a scoring config file cannot be read or is invalid"""
+
+
+def _strings(data: Dict[str, Any], key: str) -> Tuple[str, ...]:
+    values = data.get(key)
+    if not isinstance(values, list) or not all(isinstance(value, str) and value for value in values):
+        raise ConfigError(f"'{key}' must be a list of non-empty strings")
+    return tuple(values)
+
+
+def _pattern(data: Dict[str, Any], key: str) -> Pattern:
+    try:
+        return re.compile(data[key])
+    except (KeyError, TypeError, re.error) as e:
+        raise ConfigError(f"'{key}' must be a valid regular expression: {e}")
+
+
+@dataclass(frozen=True)
+class ScoringConfig:
+    """Keywords, sections, patterns and weights with their compiled matchers.
+
+    Never mutated after construction: a reload builds a new instance, so a
+    request that captured one keeps a consistent view until it finishes.
+    """
+    version: str
+    industry_keywords: Mapping[str, Tuple[str, ...]]
+    action_verbs: Tuple[str, ...]
+    sections: Tuple[str, ...]
+    bullet_prefixes: Tuple[str, ...]
+    weights: Mapping[str, float]
+    email_pattern: Pattern
+    phone_pattern: Pattern
+    keyword_matcher: KeywordMatcher
+    source: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], source: Optional[str] = None) -> "ScoringConfig":
+        """Validate a parsed config and compile its matchers"""
+        if not isinstance(data, dict):
+            raise ConfigError("Scoring config must be a JSON object")
+        version = data.get("version")
+        if not isinstance(version, (str, int)) or str(version) == "":
+            raise ConfigError("'version' is required")
+
+        keywords = data.get("industry_keywords")
+        if not isinstance(keywords, dict) or not keywords:
+            raise ConfigError("'industry_keywords' must map industries to keyword lists")
+        if ACTION_VERB_CATEGORY in keywords:
+            raise ConfigError(f"'{ACTION_VERB_CATEGORY}' is reserved and cannot be an industry")
+        industry_keywords = {industry: _strings(keywords, industry) for industry in keywords}
+        action_verbs = _strings(data, "action_verbs")
+
+        weights = data.get("weights")
+        if not isinstance(weights, dict) or set(weights) != set(SCORE_CATEGORIES):
+            raise ConfigError(f"'weights' must have exactly the keys {SCORE_CATEGORIES}")
+        if not all(isinstance(value, (int, float)) and value >= 0 for value in weights.values()):
+            raise ConfigError("'weights' must be non-negative numbers")
+        if not sum(weights.values()) > 0:
+            raise ConfigError("'weights' must not all be zero")
+
+        return cls(
+            version=str(version),
+            industry_keywords=MappingProxyType(industry_keywords),
+            action_verbs=action_verbs,
+            sections=tuple(section.lower() for section in _strings(data, "sections")),
+            bullet_prefixes=_strings(data, "bullet_prefixes"),
+            weights=MappingProxyType({key: float(value) for key, value in weights.items()}),
+            email_pattern=_pattern(data, "email_pattern"),
+            phone_pattern=_pattern(data, "phone_pattern"),
+            keyword_matcher=KeywordMatcher({**industry_keywords, ACTION_VERB_CATEGORY: action_verbs}),
+            source=source,
+        )
+
+    def heading_name(self, line: str) -> Optional[str]:
+        """Section ``line`` heads under this config, else None"""
+        return heading_name(line, self.sections, self.bullet_prefixes)
+
+    @classmethod
+    def load(cls, path: str) -> "ScoringConfig":
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ConfigError(f"Unable to read scoring config {path}: {e}")
+        return cls.from_dict(data, source=path)
+
+
+class ConfigStore:
+    """Holds the active ScoringConfig and replaces it on reload.
+
+    Readers call ``current()`` once per request; swapping is a single
+    reference assignment, so in-flight requests finish on the config they
+    started with. A config that fails validation is rejected and the
+    previous one stays active.
+    """
+
+    def __init__(self, path: str = DEFAULT_CONFIG_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._config = ScoringConfig.load(path)
+        self._mtime = self._read_mtime()
+        self.loaded_at = time.time()
+        self.reloads = 0
+        self.last_error: Optional[str] = None
+
+    def _read_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def current(self) -> ScoringConfig:
+        return self._config
+
+    def reload(self) -> ScoringConfig:
+        """Load, validate and compile the config file, then swap it in"""
+        with self._lock:
+            mtime = self._read_mtime()
+            try:
+                config = ScoringConfig.load(self.path)
+            except ConfigError as e:
+                self.last_error = str(e)
+                self._mtime = mtime
+                logger.error(f"Keeping scoring config {self._config.version}: {e}")
+                raise
+            previous, self._config = self._config, config
+            self._mtime = mtime
+            self.loaded_at = time.time()
+            self.reloads += 1
+            self.last_error = None
+        logger.info(f"Scoring config reloaded: version {previous.version} -> {config.version}")
+        return config
+
+    def reload_if_changed(self) -> bool:
+        """Reload when the file's modification time changed; True if a new config is active"""
+        if self._read_mtime() == self._mtime:
+            return False
+        try:
+            self.reload()
+        except ConfigError:
+            return False
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        config = self._config
+        return {
+            "version": config.version,
+            "source": config.source,
+            "loaded_at": self.loaded_at,
+            "reloads": self.reloads,
+            "last_error": self.last_error,
+            "industries": list(config.industry_keywords),
+            "sections": list(config.sections),
+            "weights": dict(config.weights),
+        }
@@ -0,0 +1,93 @@
+"""Section index: where each resume section starts and ends in the text.
+
+A section starts at a heading line: a short line, not a bullet, naming one
+of the configured sections as a whole word ("EXPERIENCE", "Work
+Experience:", "Skills & Tools"). It runs until the next heading or the end
+of the text. Text before the first heading (name, contact details) belongs
+to no section. Offsets are character offsets into the analyzed text.
+"""
+import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, List, Optional, Pattern, Tuple
+
+from document import ParsedDocument
+
+# Longest line, in words, still taken for a heading
+MAX_HEADING_WORDS = 4
+
+
+@dataclass(frozen=True)
+class Section:
+    """One section of a resume"""
+    # Configured section name the heading matched
+    name: str
+    # The heading line as written
+    heading: str
+    # Offsets of the heading's first character and of the end of the section
+    start: int
+    end: int
+
+
+@lru_cache(maxsize=16)
+def heading_pattern(sections: Tuple[str, ...]) -> Pattern:
+    """Compiled whole-word matcher for the section names, built once per config"""
+    names = sorted(sections, key=len, reverse=True)
+    return re.compile(r"(?<!\w)(" + "|".join(re.escape(name) for name in names) + r")(?!\w)")
+
+
+def heading_name(line: str, sections: Tuple[str, ...], bullet_prefixes: Tuple[str, ...]) -> Optional[str]:
+    """Section named by ``line`` if it reads as a heading, else None"""
+    line = line.strip()
+    if not line or line.startswith(bullet_prefixes) or line.endswith((".", "!", "?", ",")):
+        return None
+    if len(line.split()) > MAX_HEADING_WORDS:
+        return None
+    match = heading_pattern(sections).search(line.lower())
+    return match.group(1) if match else None
+
+
+class SectionIndex:
+    """Sections of one document in text order, built once per analysis"""
+
+    def __init__(self, sections: Iterable[Section]):
+        self.sections: List[Section] = list(sections)
+        self._starts = [section.start for section in self.sections]
+
+    @classmethod
+    def build(cls, doc: ParsedDocument, sections: Tuple[str, ...],
+              bullet_prefixes: Tuple[str, ...]) -> "SectionIndex":
+        """Sections from the headings recorded while tokenizing, else one pass over the lines"""
+        headings = []
+        if doc.headings is not None:
+            for start, name in doc.headings:
+                end = doc.text.find("\n", start)
+                headings.append((name, doc.text[start:end if end != -1 else None].strip(), start))
+        else:
+            for start, end in doc.iter_line_spans():
+                line = doc.text[start:end]
+                name = heading_name(line, sections, bullet_prefixes)
+                if name is not None:
+                    indent = len(line) - len(line.lstrip())
+                    headings.append((name, line.strip(), start + indent))
+        ends = [start for _, _, start in headings[1:]] + [len(doc.text)]
+        return cls(Section(name=name, heading=heading, start=start, end=end)
+                   for (name, heading, start), end in zip(headings, ends))
+
+    def __iter__(self):
+        return iter(self.sections)
+
+    def __len__(self) -> int:
+        return len(self.sections)
+
+    def names(self) -> List[str]:
+        """Distinct section names in order of first appearance"""
+        return list(dict.fromkeys(section.name for section in self.sections))
+
+    def find(self, offset: int) -> Optional[int]:
+        """Position in the index of the section containing ``offset``, or None"""
+        position = bisect_right(self._starts, offset) - 1
+        if position >= 0 and offset < self.sections[position].end:
+            return position
+        return None
@@ -1,3 +1,4 @@
 #!/bin/bash
 export PORT=${PORT:-8000}
-exec uvicorn main:app --host 0.0.0.0 --port $PORT
\ No newline at end of file
+# One preloaded worker by default; see gunicorn_conf.py (WEB_CONCURRENCY=auto for one per CPU)
+exec gunicorn -c gunicorn_conf.py main:app
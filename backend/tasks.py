@@ -0,0 +1,193 @@
+"""In-process queue for long-running analysis tasks (submit, poll, fetch)"""
+import asyncio
+import itertools
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TASK_STATUSES = ("queued", "running", "succeeded", "failed", "cancelled")
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled")
+
+
+class TaskQueueFullError(Exception):
+    """Raised when too many tasks are already waiting or running"""
+
+
+@dataclass
+class Task:
+    """A submitted unit of work and its progress"""
+    id: str
+    priority: int
+    total: int
+    payload: Any
+    status: str = "queued"
+    completed: int = 0
+    results: List[Any] = field(default_factory=list)
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    expires_at: Optional[float] = None
+    changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def notify(self):
+        """Wake everyone watching this task"""
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "task_id": self.id,
+            "status": self.status,
+            "priority": self.priority,
+            "total": self.total,
+            "completed": self.completed,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "expires_at": self.expires_at,
+        }
+
+
+# Produces one result per finished item so progress can be tracked
+TaskRunner = Callable[[Task], AsyncIterator[Any]]
+
+
+class TaskQueue:
+    """Priority queue of tasks drained by a fixed number of asyncio workers.
+
+    ``workers`` bounds how many tasks run at once and ``max_pending`` how
+    many may be queued or running before ``submit`` refuses more. Higher
+    ``priority`` runs first; ties run in submission order. Finished tasks
+    keep their results for ``result_ttl`` seconds.
+    """
+
+    def __init__(self, runner: TaskRunner, workers: int = 1, max_pending: int = 100,
+                 result_ttl: float = 3600.0):
+        self.runner = runner
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self._tasks: Dict[str, Task] = {}
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._order = itertools.count()
+        self._workers: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}
+
+    def start(self):
+        """Start the worker coroutines on the running event loop"""
+        self._queue = asyncio.PriorityQueue()
+        self._workers = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Cancel workers and running tasks; queued tasks are dropped"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        for task in self._tasks.values():
+            if not task.finished:
+                self._finish(task, "cancelled", "Server shut down before the task finished")
+
+    def _pending(self) -> int:
+        return sum(1 for task in self._tasks.values() if not task.finished)
+
+    def _purge(self):
+        now = time.time()
+        expired = [task_id for task_id, task in self._tasks.items()
+                   if task.expires_at is not None and task.expires_at <= now]
+        for task_id in expired:
+            del self._tasks[task_id]
+
+    def submit(self, payload: Any, total: int, priority: int = 0) -> Task:
+        """Queue a task and return it immediately"""
+        if self._queue is None:
+            raise RuntimeError("TaskQueue.start() has not been called")
+        self._purge()
+        if self._pending() >= self.max_pending:
+            raise TaskQueueFullError(f"Task queue is full ({self.max_pending} tasks pending)")
+        task = Task(id=uuid.uuid4().hex, priority=priority, total=total, payload=payload)
+        self._tasks[task.id] = task
+        self._queue.put_nowait((-priority, next(self._order), task))
+        return task
+
+    def get(self, task_id: str) -> Optional[Task]:
+        self._purge()
+        return self._tasks.get(task_id)
+
+    def cancel(self, task_id: str) -> Optional[Task]:
+        """Cancel a queued or running task; finished tasks are left as they are"""
+        task = self.get(task_id)
+        if task is None or task.finished:
+            return task
+        running = self._running.get(task_id)
+        if running is not None:
+            running.cancel()
+        else:
+            self._finish(task, "cancelled")
+        return task
+
+    async def watch(self, task: Task) -> AsyncIterator[Dict[str, Any]]:
+        """Yield a snapshot now and after every change until the task finishes"""
+        while True:
+            changed = task.changed
+            yield task.snapshot()
+            if task.finished:
+                return
+            await changed.wait()
+
+    def _finish(self, task: Task, status: str, error: Optional[str] = None):
+        task.status = status
+        task.error = error
+        task.payload = None
+        task.finished_at = time.time()
+        task.expires_at = task.finished_at + self.result_ttl
+        task.notify()
+
+    async def _work(self):
+        while True:
+            _, _, task = await self._queue.get()
+            if task.status != "queued":
+                continue
+            running = asyncio.create_task(self._run(task))
+            self._running[task.id] = running
+            # asyncio.wait does not raise when only the inner task is cancelled
+            await asyncio.wait([running])
+            self._running.pop(task.id, None)
+
+    async def _run(self, task: Task):
+        task.status = "running"
+        task.started_at = time.time()
+        task.notify()
+        try:
+            async for result in self.runner(task):
+                task.results.append(result)
+                task.completed += 1
+                task.notify()
+        except asyncio.CancelledError:
+            self._finish(task, "cancelled")
+        except Exception as e:
+            logger.error(f"Task {task.id} failed: {e}")
+            self._finish(task, "failed", "Internal server error during analysis")
+        else:
+            self._finish(task, "succeeded")
+
+    def counts(self) -> Dict[str, int]:
+        """Number of retained tasks in each status"""
+        self._purge()
+        counts = dict.fromkeys(TASK_STATUSES, 0)
+        for task in self._tasks.values():
+            counts[task.status] += 1
+        return counts
+
+    def stats(self) -> Dict[str, Any]:
+        return {"workers": self.workers, "max_pending": self.max_pending, **self.counts()}
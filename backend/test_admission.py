@@ -0,0 +1,128 @@
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from admission import AdmissionControlMiddleware, AdmissionController, LocalTokenBucketStore
+
+def test_bucket_refills_over_time(monkeypatch):
+    """Test that tokens are charged by cost and refill at the configured rate"""
+    now = [100.0]
+    monkeypatch.setattr("admission.time.monotonic", lambda: now[0])
+    store = LocalTokenBucketStore()
+    assert store.take("a", 8, rate=2, burst=10) == 0
+    assert store.take("a", 4, rate=2, burst=10) == 1.0
+    now[0] += 1
+    assert store.take("a", 4, rate=2, burst=10) == 0
+    # Forced charges go into debt and delay the next request
+    store.take("a", 5, rate=2, burst=10, force=True)
+    assert store.take("a", 1, rate=2, burst=10) == 3.0
+    assert store.take("b", 10, rate=2, burst=10) == 0
+    assert len(store) == 2
+
+def test_idle_buckets_expire_once_refilled(monkeypatch):
+    """Test that an idle bucket is dropped only after it would be full again, debt included"""
+    now = [100.0]
+    monkeypatch.setattr("admission.time.monotonic", lambda: now[0])
+    monkeypatch.setattr("cache.time.monotonic", lambda: now[0])
+    store = LocalTokenBucketStore()
+    store.take("a", 15, rate=1, burst=10, force=True)
+    # Still in debt after longer than an empty bucket takes to refill
+    now[0] += 12
+    assert store.take("a", 10, rate=1, burst=10) == 3.0
+    now[0] += 5
+    assert store._buckets.get("a") is None
+
+def test_in_flight_limits():
+    """Test global and per-client concurrency limits"""
+    controller = AdmissionController(rate=0, max_in_flight=3, max_in_flight_per_client=2)
+    assert controller.admit("a", 1) is None
+    assert controller.admit("a", 1) is None
+    assert controller.admit("a", 1).reason == "client_in_flight"
+    assert controller.admit("b", 1) is None
+    assert controller.admit("c", 1).reason == "in_flight"
+    controller.release("a")
+    assert controller.admit("c", 1) is None
+    assert controller.stats()["in_flight"] == 3
+    assert controller.rejections == {"rate": 0, "in_flight": 1, "client_in_flight": 1}
+
+controller = AdmissionController(store=LocalTokenBucketStore(), rate=1, burst=5, max_in_flight_per_client=0)
+app = FastAPI()
+app.add_middleware(AdmissionControlMiddleware, controller=controller, path_prefixes=("/analyze",),
+                   bytes_per_token=100, api_keys=["secret"])
+
+@app.post("/analyze")
+@app.get("/analyze")
+@app.post("/other")
+async def endpoint():
+    return {"ok": True}
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def reset_controller():
+    controller.reset()
+
+def test_cost_by_body_size():
+    """Test that large bodies drain the bucket and get 429 with Retry-After"""
+    assert client.post("/analyze", content=b"x" * 300).status_code == 200
+    response = client.post("/analyze", content=b"x" * 300)
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 3
+    # Other paths, GETs and known API keys are not charged to the same bucket
+    assert client.post("/other", content=b"x" * 300).status_code == 200
+    assert client.get("/analyze").status_code == 200
+    assert client.post("/analyze", content=b"x" * 300, headers={"X-API-Key": "secret"}).status_code == 200
+    assert client.post("/analyze", content=b"x" * 300, headers={"X-API-Key": "made-up"}).status_code == 429
+
+def test_spoofed_forwarded_for_does_not_get_a_new_bucket():
+    """Test that only the X-Forwarded-For entry added by the trusted proxy identifies the client"""
+    middleware = AdmissionControlMiddleware(None, controller, path_prefixes=("/analyze",), trusted_proxies=1)
+    scope = {"client": ("10.0.0.2", 1234), "headers": [(b"x-forwarded-for", b"1.2.3.4, 203.0.113.7")]}
+    assert middleware.client_id(scope)[0] == "ip:203.0.113.7"
+    scope["headers"] = [(b"x-forwarded-for", b"5.6.7.8"), (b"x-forwarded-for", b"203.0.113.7")]
+    assert middleware.client_id(scope)[0] == "ip:203.0.113.7"
+    # Two proxies: the entry the outer one added; too few entries fall back to the peer
+    middleware.trusted_proxies = 2
+    scope["headers"] = [(b"x-forwarded-for", b"9.9.9.9, 203.0.113.7, 10.0.0.1")]
+    assert middleware.client_id(scope)[0] == "ip:203.0.113.7"
+    scope["headers"] = [(b"x-forwarded-for", b"203.0.113.7")]
+    assert middleware.client_id(scope)[0] == "ip:10.0.0.2"
+
+    proxied = FastAPI()
+    proxied.add_middleware(AdmissionControlMiddleware, controller=controller, path_prefixes=("/analyze",),
+                           bytes_per_token=100, trusted_proxies=1)
+    proxied.post("/analyze")(endpoint)
+    proxied_client = TestClient(proxied)
+    for spoofed in ("1.1.1.1", "2.2.2.2"):
+        response = proxied_client.post("/analyze", content=b"x" * 300,
+                                       headers={"X-Forwarded-For": f"{spoofed}, 203.0.113.7"})
+    assert response.status_code == 429
+
+def test_blocking_store_runs_off_the_event_loop():
+    """Test that a store doing network I/O is never called on the event loop thread"""
+    class BlockingStore(LocalTokenBucketStore):
+        blocking = True
+
+        def take(self, *args, **kwargs):
+            threads.append(threading.get_ident())
+            return super().take(*args, **kwargs)
+
+    threads = []
+    blocking_controller = AdmissionController(store=BlockingStore())
+    blocking_app = FastAPI()
+    blocking_app.add_middleware(AdmissionControlMiddleware, controller=blocking_controller,
+                                path_prefixes=("/analyze",))
+
+    @blocking_app.post("/analyze")
+    async def analyze():
+        threads.append(threading.get_ident())
+        await blocking_controller.charge_async("ip:testclient", 1)
+        return {"ok": True}
+
+    assert TestClient(blocking_app).post("/analyze").status_code == 200
+    admit_thread, loop_thread, charge_thread = threads
+    assert loop_thread not in (admit_thread, charge_thread)
+
+if __name__ == "__main__":
+    pytest.main([__file__])
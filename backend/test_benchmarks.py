@@ -0,0 +1,68 @@
+import json
+import pytest
+import main
+from benchmarks import run
+from benchmarks.fixtures import resume_docx, resume_pdf, synthetic_resume
+from extraction import DOCX_CONTENT_TYPE, PDF_CONTENT_TYPE, extract_text
+
+def test_summarize_percentiles():
+    """Test latency percentiles and throughput"""
+    stats = run.summarize([0.001 * i for i in range(1, 101)], peak_bytes=2048)
+    assert stats["iterations"] == 100
+    assert stats["p50_ms"] == pytest.approx(50.5)
+    assert stats["p99_ms"] == pytest.approx(99.01)
+    assert stats["peak_memory_kib"] == 2.0
+    assert stats["throughput_per_s"] == pytest.approx(100 / 5.05, rel=1e-3)
+
+def test_compare_to_baseline():
+    """Test that only p50 slowdowns past the tolerance are reported"""
+    baseline = {"a": {"p50_ms": 10.0}, "b": {"p50_ms": 10.0}}
+    results = {"a": {"p50_ms": 12.0}, "b": {"p50_ms": 13.0}, "new": {"p50_ms": 1.0}}
+    regressions = run.compare_to_baseline(results, baseline, tolerance=0.25)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("b:")
+
+def test_fixtures_round_trip():
+    """Test that generated PDF and DOCX fixtures extract back to the resume text"""
+    text = synthetic_resume(12)
+    lines = [line for line in text.split("\n") if line]
+    assert extract_text(PDF_CONTENT_TYPE, resume_pdf(text, lines_per_page=10)).text.split("\n") == lines
+    assert [line for line in extract_text(DOCX_CONTENT_TYPE, resume_docx(text)).text.split("\n") if line] == lines
+
+def test_run_writes_results_and_fails_on_regression(tmp_path):
+    """Test a tiny end-to-end benchmark run against a baseline"""
+    output = tmp_path / "results.json"
+    args = ["--sizes", "small", "--iterations", "2", "--filter", "analyze_structure"]
+    rate = main.admission.rate
+    assert run.main(args + ["--output", str(output)]) == 0
+    # Admission control is only off while the benchmarks run
+    assert main.admission.rate == rate
+    
+    report = json.loads(output.read_text())
+    assert set(report["results"]) == {"analyze_structure/small"}
+    
+    report["results"]["analyze_structure/small"]["p50_ms"] = 1e-6
+    output.write_text(json.dumps(report))
+    assert run.main(args + ["--baseline", str(output)]) == 1
+
+if __name__ == "__main__":
+    pytest.main([__file__])
+
+def test_gunicorn_conf_worker_count(monkeypatch):
+    """Test that gunicorn preloads one unrecycled worker by default and can size workers from the CPUs"""
+    import importlib
+    import gunicorn_conf
+    monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+    monkeypatch.delenv("MAX_REQUESTS", raising=False)
+    conf = importlib.reload(gunicorn_conf)
+    assert conf.preload_app
+    assert conf.workers == 1 and conf.max_requests == 0
+
+    monkeypatch.setenv("WEB_CONCURRENCY", "auto")
+    assert importlib.reload(gunicorn_conf).workers == conf.available_cpus() >= 1
+
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    monkeypatch.setenv("MAX_REQUESTS", "500")
+    conf = importlib.reload(gunicorn_conf)
+    assert conf.workers == 3
+    assert conf.max_requests_jitter == 50
@@ -0,0 +1,53 @@
+import pytest
+from cache import LocalCache, ResultCache, content_hash
+
+def test_local_cache_evicts_least_recently_used():
+    """Test LRU eviction once maxsize is reached"""
+    cache = LocalCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+def test_local_cache_ttl(monkeypatch):
+    """Test that entries expire after the TTL"""
+    now = [1000.0]
+    monkeypatch.setattr("cache.time.monotonic", lambda: now[0])
+    cache = LocalCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    
+    now[0] += 59
+    assert cache.get("a") == 1
+    now[0] += 2
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+def test_local_cache_disabled():
+    """Test that a zero maxsize stores nothing"""
+    cache = LocalCache(maxsize=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+def test_result_cache_counters():
+    """Test hit/miss counting"""
+    cache = ResultCache("test", LocalCache(maxsize=10))
+    assert cache.get("k") is None
+    cache.set("k", {"score": 1})
+    assert cache.get("k") == {"score": 1}
+    
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+def test_content_hash_separates_parts():
+    """Test that part boundaries are part of the hash"""
+    assert content_hash("ab", "c") != content_hash("a", "bc")
+    assert content_hash("text") == content_hash(b"text")
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,182 @@
+import io
+import zipfile
+import pytest
+import extraction
+from docx import Document
+from benchmarks.fixtures import make_docx, make_pdf
+from extraction import ExtractionError, ExtractionLimits, PdfOptions, extract_text, extract_text_from_pdf
+from pdf_extractors import PDF_EXTRACTORS
+
+def test_pdf_extracts_all_pages():
+    """Test that every page is extracted when within limits"""
+    result = extract_text_from_pdf(make_pdf(["Page one", "Page two"]))
+    assert result.text == "Page one\nPage two"
+    assert not result.truncated
+
+def test_pdf_page_limit():
+    """Test that extraction stops at the page limit"""
+    pdf = make_pdf([f"Page {i}" for i in range(5)])
+    result = extract_text_from_pdf(pdf, ExtractionLimits(max_pdf_pages=2))
+    assert result.text == "Page 0\nPage 1"
+    assert result.truncated
+    assert "first 2 of 5 pages" in result.truncation_reason
+
+def test_pdf_character_limit():
+    """Test that extraction stops once enough text is collected"""
+    pdf = make_pdf(["a" * 50, "b" * 50, "c" * 50])
+    result = extract_text_from_pdf(pdf, ExtractionLimits(max_chars=60))
+    assert result.text == "a" * 50 + "\n" + "b" * 10
+    assert result.truncated
+
+def test_pdf_timeout():
+    """Test that an exhausted time budget fails extraction with no text"""
+    with pytest.raises(ExtractionError):
+        extract_text_from_pdf(make_pdf(["Page one"]), ExtractionLimits(timeout=-1))
+
+def test_invalid_pdf():
+    """Test that a corrupt PDF raises ExtractionError"""
+    with pytest.raises(ExtractionError):
+        extract_text_from_pdf(b"not a pdf")
+
+def test_pdf_fallback_per_page(monkeypatch):
+    """Test that a page the primary backend fails on is read with the fallback"""
+    pytest.importorskip("pypdf")
+    primary = PDF_EXTRACTORS["pypdf2"]
+    original = primary.page_text
+    def flaky(document, index):
+        if index == 1:
+            raise ValueError("broken page")
+        return original(document, index)
+    monkeypatch.setattr(primary, "page_text", flaky)
+    pdf = make_pdf(["Page one", "Page two", "Page three"])
+    
+    result = extract_text_from_pdf(pdf, options=PdfOptions(backend="pypdf2", fallback="pypdf"))
+    assert result.text == "Page one\nPage two\nPage three"
+    # Without a fallback the failed page is skipped, not fatal
+    result = extract_text_from_pdf(pdf, options=PdfOptions(backend="pypdf2"))
+    assert result.text == "Page one\n\nPage three"
+
+def test_pdf_parallel_matches_sequential():
+    """Test that splitting pages across workers keeps text and order"""
+    pdf = make_pdf([f"Page {i}" for i in range(10)])
+    sequential = extract_text_from_pdf(pdf)
+    try:
+        parallel = extract_text_from_pdf(pdf, options=PdfOptions(workers=3, parallel_min_pages=4))
+    finally:
+        extraction.shutdown_page_pool()
+    assert parallel == sequential
+
+def test_pdf_timeout_interrupts_a_slow_page(monkeypatch):
+    """Test that the time limit holds while a single page is still being read"""
+    import time
+    primary = PDF_EXTRACTORS["pypdf2"]
+    original = primary.page_text
+    def slow(document, index):
+        if index == 1:
+            time.sleep(2)
+        return original(document, index)
+    monkeypatch.setattr(primary, "page_text", slow)
+    
+    start = time.monotonic()
+    result = extract_text_from_pdf(make_pdf(["Page one", "Page two", "Page three"]), ExtractionLimits(timeout=0.3))
+    assert time.monotonic() - start < 1.5
+    assert result.text == "Page one"
+    assert "after 1 of 3 pages" in result.truncation_reason
+
+def test_pdf_parallel_counts_only_pages_read_as_failed(monkeypatch):
+    """Test that failures on pages skipped after the character limit do not fail the PDF"""
+    primary = PDF_EXTRACTORS["pypdf2"]
+    original = primary.page_text
+    def flaky(document, index):
+        if index >= 2:
+            raise ValueError("broken page")
+        return original(document, index)
+    # Page workers are forked after the patch, so they see it too
+    extraction.shutdown_page_pool()
+    monkeypatch.setattr(primary, "page_text", flaky)
+    pdf = make_pdf(["a" * 50, "b" * 50, "c" * 50, "d" * 50])
+    try:
+        result = extract_text_from_pdf(pdf, ExtractionLimits(max_chars=60),
+                                       PdfOptions(workers=2, parallel_min_pages=2))
+    finally:
+        extraction.shutdown_page_pool()
+    assert result.text == "a" * 50 + "\n" + "b" * 10
+
+@pytest.mark.parametrize("backend", ["pypdf", "pdfminer", "pymupdf"])
+def test_optional_pdf_backends(backend):
+    """Test that each installed optional backend extracts the same pages"""
+    pytest.importorskip(PDF_EXTRACTORS[backend].requires)
+    result = extract_text_from_pdf(make_pdf(["Page one", "Page two"]), options=PdfOptions(backend=backend))
+    assert "Page one" in result.text and "Page two" in result.text
+    assert result.text.index("Page one") < result.text.index("Page two")
+
+def test_unknown_pdf_backend():
+    """Test that configuring an unknown backend is rejected"""
+    with pytest.raises(ValueError):
+        PdfOptions(backend="nope").check()
+
+def test_docx_character_limit():
+    """Test DOCX extraction with a character limit"""
+    docx = make_docx(["First paragraph", "Second paragraph"])
+    assert extract_text(extraction.DOCX_CONTENT_TYPE, docx).text == "First paragraph\nSecond paragraph"
+    
+    result = extract_text(extraction.DOCX_CONTENT_TYPE, docx, ExtractionLimits(max_chars=10))
+    assert result.text == "First para"
+    assert result.truncated
+
+def test_docx_tables_headers_and_footers():
+    """Test that table cells, headers and footers are extracted in reading order"""
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = "Jane Doe - jane@example.com"
+    doc.sections[0].footer.paragraphs[0].text = "Page footer"
+    doc.add_paragraph("Skills")
+    table = doc.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "Python"
+    table.cell(0, 1).text = "Kubernetes"
+    table.cell(1, 0).text = "SQL"
+    doc.add_paragraph("Experience")
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    
+    result = extract_text(extraction.DOCX_CONTENT_TYPE, buffer.getvalue())
+    assert result.text.split("\n") == [
+        "Jane Doe - jane@example.com", "Skills", "Python\tKubernetes", "SQL\t", "Experience", "Page footer"
+    ]
+
+def test_docx_text_box_and_skipped_media(monkeypatch):
+    """Test that text boxes are read once and media parts are never opened"""
+    w = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+    mc = 'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"'
+    body = (
+        f'<w:document {w} {mc}><w:body><w:p><w:r><w:t>Summary</w:t></w:r></w:p>'
+        '<w:p><w:r><mc:AlternateContent><mc:Choice Requires="wps"><w:drawing><w:txbxContent>'
+        '<w:p><w:r><w:t>Boxed</w:t><w:tab/><w:t>skills</w:t></w:r></w:p>'
+        '</w:txbxContent></w:drawing></mc:Choice><mc:Fallback><w:pict><w:txbxContent>'
+        '<w:p><w:r><w:t>Boxed</w:t><w:tab/><w:t>skills</w:t></w:r></w:p>'
+        '</w:txbxContent></w:pict></mc:Fallback></mc:AlternateContent></w:r></w:p>'
+        '</w:body></w:document>'
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("word/document.xml", body)
+        archive.writestr("word/media/image1.png", b"\x89PNG" + b"0" * 1000)
+    
+    opened = []
+    original = zipfile.ZipFile.open
+    def tracking_open(self, name, *args, **kwargs):
+        opened.append(getattr(name, "filename", name))
+        return original(self, name, *args, **kwargs)
+    monkeypatch.setattr(zipfile.ZipFile, "open", tracking_open)
+    
+    result = extract_text(extraction.DOCX_CONTENT_TYPE, buffer.getvalue())
+    assert result.text == "Summary\nBoxed\tskills"
+    assert not any(name.startswith("word/media/") for name in opened)
+
+def test_text_character_limit():
+    """Test plain text truncation"""
+    result = extract_text(extraction.TEXT_CONTENT_TYPE, b"x" * 20, ExtractionLimits(max_chars=5))
+    assert result.text == "xxxxx"
+    assert result.truncated
+
+if __name__ == "__main__":
+    pytest.main([__file__])
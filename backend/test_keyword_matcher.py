@@ -0,0 +1,44 @@
+import pytest
+from keyword_matcher import KeywordMatcher
+
+def test_matches_whole_words_only():
+    """Test that terms do not match inside other words"""
+    matcher = KeywordMatcher({'tech': ['ai'], 'verbs': ['led']})
+    hits = matcher.match("maintained and compiled code")
+    assert not hits['tech']
+    assert not hits['verbs']
+    
+    hits = matcher.match("led an ai-first team")
+    assert hits['tech']['ai'] == 1
+    assert hits['verbs']['led'] == 1
+
+def test_punctuated_and_multiword_terms():
+    """Test terms containing punctuation and spaces"""
+    matcher = KeywordMatcher({'tech': ['node.js', 'ci/cd', 'c++', 'machine learning', 'machine']})
+    hits = matcher.match("node.js, ci/cd pipelines, c++ and machine learning")
+    assert set(hits['tech']) == {'node.js', 'ci/cd', 'c++', 'machine learning'}
+
+def test_term_in_several_categories():
+    """Test that a shared term is counted for every category it belongs to"""
+    matcher = KeywordMatcher({'business': ['planning'], 'finance': ['planning', 'audit']})
+    hits = matcher.match("financial planning and audit")
+    assert hits['business']['planning'] == 1
+    assert hits['finance'] == {'planning': 1, 'audit': 1}
+
+def test_iter_matches_offsets():
+    """Test that match offsets point at the matched text"""
+    matcher = KeywordMatcher({'tech': ['python', 'sql']})
+    text = "python and sql"
+    spans = list(matcher.iter_matches(text))
+    assert [(text[start:end], term) for term, start, end in spans] == [("python", "python"), ("sql", "sql")]
+
+def test_large_vocabulary():
+    """Test a taxonomy with thousands of terms"""
+    terms = [f"skill{i}" for i in range(10000)]
+    matcher = KeywordMatcher({'skills': terms})
+    assert len(matcher) == 10000
+    hits = matcher.match("skill1 skill9999 skill10000 skill42x")
+    assert set(hits['skills']) == {'skill1', 'skill9999'}
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -1,27 +1,27 @@
 import pytest
 import asyncio
+import json
 from fastapi.testclient import TestClient
+import main
 from main import app
+from executor import AnalysisExecutor
+from keyword_matcher import KeywordMatcher
+from document import parse_document
+import extraction
+from extraction import ExtractionLimits
+from tasks import Task
+from benchmarks.fixtures import make_pdf
 
 client = TestClient(app)
 
-def test_root_endpoint():
-    """Test the root endpoint"""
-    response = client.get("/")
-    assert response.status_code == 200
-    assert response.json()["status"] == "healthy"
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Start every test with empty result caches and rate limit buckets"""
+    main.result_cache.clear()
+    main.extraction_cache.clear()
+    main.admission.reset()
 
-def test_health_check():
-    """Test the health check endpoint"""
-    response = client.get("/health")
-    assert response.status_code == 200
-    data = response.json()
-    assert "status" in data
-    assert "version" in data
-
-def test_analyze_text_endpoint():
-    """Test text analysis endpoint"""
-    test_resume = """
+SAMPLE_RESUME = """
     John Doe
     Software Engineer
     john.doe@email.com
@@ -43,8 +43,32 @@ def test_analyze_text_endpoint():
     • Git, Docker, AWS
     • Agile, Scrum, Test-Driven Development
     """
-    
-    response = client.post("/analyze", json={"text": test_resume})
+
+def test_root_endpoint():
+    """Test the root endpoint"""
+    response = client.get("/")
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
+
+def test_health_check():
+    """Test the health check endpoint"""
+    response = client.get("/health")
+    assert response.status_code == 200
+    data = response.json()
+    assert "status" in data
+    assert "version" in data
+    assert data["ready"] is True
+
+def test_health_check_not_ready(monkeypatch):
+    """Test that /health reports 503 while the tokenizers are unavailable"""
+    monkeypatch.setitem(main.resources.resource_status, "punkt", "missing")
+    response = client.get("/health")
+    assert response.status_code == 503
+    assert response.json()["ready"] is False
+
+def test_analyze_text_endpoint():
+    """Test text analysis endpoint"""
+    response = client.post("/analyze", json={"text": SAMPLE_RESUME})
     assert response.status_code == 200
     
     data = response.json()
@@ -81,5 +105,569 @@ def test_analyze_file_endpoint_unsupported_type():
     response = client.post("/analyze/file", files=files)
     assert response.status_code == 400
 
+def test_analyze_text_process_executor(monkeypatch):
+    """Test that process-pool scoring matches in-process scoring"""
+    expected = client.post("/analyze", json={"text": SAMPLE_RESUME}).json()
+    
+    executor = AnalysisExecutor(mode="process", max_workers=2)
+    monkeypatch.setattr(main, "analysis_executor", executor)
+    try:
+        response = client.post("/analyze", json={"text": SAMPLE_RESUME})
+    finally:
+        executor.shutdown()
+    
+    assert response.status_code == 200
+    assert response.json() == expected
+
+def test_analyze_queue_full_returns_503(monkeypatch):
+    """Test backpressure when the analysis queue is saturated"""
+    executor = AnalysisExecutor(mode="inline", max_queue=1)
+    executor._pending = 1
+    monkeypatch.setattr(main, "analysis_executor", executor)
+    
+    response = client.post("/analyze", json={"text": SAMPLE_RESUME})
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert executor.stats()["rejected"] == 1
+
+def test_session_scoring_uses_the_bounded_executor(monkeypatch):
+    """Test that sessions are scored under the analysis queue bound, in this process even in process mode"""
+    executor = AnalysisExecutor(mode="process", max_workers=1, max_queue=1)
+    monkeypatch.setattr(main, "analysis_executor", executor)
+    response = client.post("/sessions", json={"text": SAMPLE_RESUME})
+    assert response.status_code == 200 and executor._pool is None
+    
+    executor._pending = 1
+    session_id = response.json()["session_id"]
+    response = client.patch(f"/sessions/{session_id}", json={"revision": 0, "text": SAMPLE_RESUME + "!"})
+    assert response.status_code == 503
+    assert executor.stats()["rejected"] == 1
+    assert main.edit_sessions.get(session_id).revision == 0
+
+def test_slow_extraction_does_not_block_text_analysis(monkeypatch):
+    """Test that uploads being extracted never hold the workers that score text"""
+    import threading
+    started, release = threading.Event(), threading.Event()
+    
+    def slow_extract(*args):
+        started.set()
+        release.wait(10)
+        return extraction.extract_text(*args)
+    
+    monkeypatch.setattr(main, "extract_text", slow_extract)
+    monkeypatch.setattr(main, "analysis_executor", AnalysisExecutor(mode="thread", max_workers=1))
+    monkeypatch.setattr(main, "extraction_executor", AnalysisExecutor(mode="thread", max_workers=1, name="extraction"))
+    upload = {}
+    files = {"file": ("resume.txt", SAMPLE_RESUME.encode(), "text/plain")}
+    uploader = threading.Thread(target=lambda: upload.update(response=client.post("/analyze/file", files=files)))
+    uploader.start()
+    try:
+        assert started.wait(10)
+        response = client.post("/analyze", json={"text": SAMPLE_RESUME})
+        assert response.status_code == 200
+        assert "response" not in upload
+    finally:
+        release.set()
+        uploader.join(10)
+    assert upload["response"].status_code == 200
+    assert upload["response"].json()["overall_score"] == response.json()["overall_score"]
+
+def test_analyze_keywords_word_boundaries():
+    """Test that keyword scoring ignores substrings of longer words"""
+    result = main.analyze_keywords(parse_document("Maintained and compiled legacy reports for the team."))
+    assert result['industry_hits']['technology'] == 0
+    
+    result = main.analyze_keywords(parse_document("Led AI and machine learning projects in Python with Docker."))
+    assert result['industry_hits']['technology'] == 4
+
+def test_analyze_batch_endpoint():
+    """Test batch analysis with per-item errors"""
+    response = client.post("/analyze/batch", json={"texts": [SAMPLE_RESUME, "Short text", SAMPLE_RESUME]})
+    assert response.status_code == 200
+    
+    results = response.json()["results"]
+    assert [item["index"] for item in results] == [0, 1, 2]
+    assert results[0]["result"]["overall_score"] == results[2]["result"]["overall_score"]
+    assert results[1]["result"] is None
+    assert "too short" in results[1]["error"]
+
+def test_analyze_batch_stream():
+    """Test NDJSON streaming of batch results"""
+    response = client.post("/analyze/batch?stream=true", json={"texts": [SAMPLE_RESUME, ""]})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(item["index"] for item in lines) == [0, 1]
+
+def test_analyze_batch_files():
+    """Test batch analysis of uploaded files"""
+    files = [
+        ("files", ("resume.txt", SAMPLE_RESUME.encode(), "text/plain")),
+        ("files", ("resume.xyz", b"some content", "application/xyz")),
+    ]
+    response = client.post("/analyze/batch/files", files=files)
+    assert response.status_code == 200
+    
+    results = response.json()["results"]
+    assert results[0]["filename"] == "resume.txt"
+    assert results[0]["result"] is not None
+    assert "Unsupported file type" in results[1]["error"]
+
+def test_batch_files_are_extracted_on_the_extraction_executor(monkeypatch):
+    """Test that batch uploads are extracted off the analysis executor, then scored as text"""
+    import threading
+    threads = []
+    def record_extract(*args):
+        threads.append(threading.current_thread().name)
+        return extraction.extract_text(*args)
+    
+    monkeypatch.setattr(main, "extract_text", record_extract)
+    monkeypatch.setattr(main, "extraction_executor", AnalysisExecutor(mode="thread", max_workers=1, name="extraction"))
+    files = [("files", ("resume.txt", SAMPLE_RESUME.encode() + b"\nBatch", "text/plain"))]
+    try:
+        response = client.post("/analyze/batch/files", files=files)
+    finally:
+        main.extraction_executor.shutdown()
+    assert response.status_code == 200
+    assert response.json()["results"][0]["result"]["truncated"] is False
+    assert len(threads) == 1 and threads[0].startswith("extraction")
+
+def test_analyze_batch_empty():
+    """Test that an empty batch is rejected"""
+    response = client.post("/analyze/batch", json={"texts": []})
+    assert response.status_code == 400
+
+def test_analyze_repeat_is_cached():
+    """Test that resubmitting the same resume is served from the cache"""
+    first = client.post("/analyze", json={"text": SAMPLE_RESUME})
+    # Trailing whitespace and line endings normalize to the same cache key
+    second = client.post("/analyze", json={"text": SAMPLE_RESUME.replace("\n", "  \r\n")})
+    
+    assert second.json() == first.json()
+    assert main.result_cache.stats()["hits"] == 1
+    assert main.result_cache.stats()["misses"] == 1
+
+def test_analyze_file_repeat_skips_extraction(monkeypatch):
+    """Test that re-uploading identical bytes reuses the extracted text"""
+    files = {"file": ("resume.txt", SAMPLE_RESUME.encode(), "text/plain")}
+    assert client.post("/analyze/file", files=files).status_code == 200
+    
+    def fail_extract(content_type, file_content):
+        raise AssertionError("extraction should be cached")
+    monkeypatch.setattr(main, "extract_text", fail_extract)
+    
+    assert client.post("/analyze/file", files=files).status_code == 200
+    assert main.extraction_cache.stats()["hits"] == 1
+
+def test_analyze_readability_from_shared_counts():
+    """Test that readability uses the document's precomputed counts"""
+    doc = parse_document("The cat sat on the mat. The dog ran to the park.")
+    assert doc.sentence_count == 2
+    assert doc.word_count == 12
+    assert doc.syllable_count == 12
+    
+    assert list(doc.sentence_lengths) == [7, 7]
+    assert len(list(doc.iter_lines())) == 1
+    
+    result = main.analyze_readability(doc)
+    assert result['score'] == 100
+    assert result['grade_level'] < 2
+
+def test_analyze_file_reports_truncation(monkeypatch):
+    """Test that the response says when a document was cut short"""
+    monkeypatch.setattr(extraction, "DEFAULT_LIMITS", ExtractionLimits(max_chars=400))
+    files = {"file": ("resume.txt", (SAMPLE_RESUME * 3).encode(), "text/plain")}
+    response = client.post("/analyze/file", files=files)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["truncated"] is True
+    assert "400 characters" in data["truncation_reason"]
+
+def test_analyze_file_too_large(monkeypatch):
+    """Test that oversized uploads are rejected with 413"""
+    monkeypatch.setattr(main, "MAX_UPLOAD_BYTES", 100)
+    files = {"file": ("resume.txt", SAMPLE_RESUME.encode(), "text/plain")}
+    response = client.post("/analyze/file", files=files)
+    assert response.status_code == 413
+
+def test_body_limit_response_has_cors_headers():
+    """Test that the body size middleware's 413 reaches browsers with CORS headers"""
+    files = {"file": ("resume.txt", b"x" * (main.MAX_UPLOAD_BYTES + main.MULTIPART_OVERHEAD_BYTES), "text/plain")}
+    response = client.post("/analyze/file", files=files, headers={"Origin": "http://localhost:3000"})
+    assert response.status_code == 413
+    assert response.headers["access-control-allow-origin"] == "http://localhost:3000"
+
+def test_analyze_file_max_pages():
+    """Test that max_pages stops PDF extraction early and is part of the cache key"""
+    pages = [SAMPLE_RESUME[:len(SAMPLE_RESUME) // 2], SAMPLE_RESUME[len(SAMPLE_RESUME) // 2:], "Appendix"]
+    files = {"file": ("resume.pdf", make_pdf(pages), "application/pdf")}
+    
+    response = client.post("/analyze/file?max_pages=2", files=files)
+    assert response.status_code == 200
+    assert "first 2 of 3 pages" in response.json()["truncation_reason"]
+    
+    response = client.post("/analyze/file", files=files)
+    assert response.status_code == 200
+    assert response.json()["truncated"] is False
+    assert client.post("/analyze/file?max_pages=0", files=files).status_code == 422
+
+def test_analyze_etag_not_modified(monkeypatch):
+    """Test that a matching If-None-Match returns 304 without analyzing"""
+    first = client.post("/analyze", json={"text": SAMPLE_RESUME})
+    # Compressed responses carry the weak form of the ETag
+    etag = first.headers["etag"].removeprefix("W/")
+    assert client.post("/analyze", json={"text": SAMPLE_RESUME}).headers["etag"].removeprefix("W/") == etag
+    
+    def fail_score(text, timer):
+        raise AssertionError("analyzers should not run")
+    monkeypatch.setattr(main, "score_text", fail_score)
+    response = client.post("/analyze", json={"text": SAMPLE_RESUME}, headers={"If-None-Match": f"W/{etag}"})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert 'resumescore_not_modified_total{endpoint="/analyze"} 1' in client.get("/metrics").text
+
+def test_analyze_file_etag_depends_on_input():
+    """Test that file ETags change with the upload and options, and 304 on a match"""
+    files = {"file": ("resume.txt", SAMPLE_RESUME.encode(), "text/plain")}
+    etag = client.post("/analyze/file", files=files).headers["etag"]
+    other = {"file": ("resume.txt", (SAMPLE_RESUME + " More.").encode(), "text/plain")}
+    assert client.post("/analyze/file", files=other).headers["etag"] != etag
+    assert client.post("/analyze/file?max_pages=1", files=files).headers["etag"] != etag
+    
+    response = client.post("/analyze/file", files=files, headers={"If-None-Match": f'"stale", {etag}'})
+    assert response.status_code == 304
+
+def test_rate_limit_charges_pages(monkeypatch):
+    """Test that PDF pages are charged after extraction and the next request gets 429"""
+    monkeypatch.setattr(main.admission, "rate", 1)
+    monkeypatch.setattr(main.admission, "burst", 10)
+    monkeypatch.setattr(main, "RATE_LIMIT_TOKENS_PER_PAGE", 4)
+    pages = [SAMPLE_RESUME[:len(SAMPLE_RESUME) // 2], SAMPLE_RESUME[len(SAMPLE_RESUME) // 2:]]
+    files = {"file": ("resume.pdf", make_pdf(pages), "application/pdf")}
+    assert client.post("/analyze/file", files=files).status_code == 200
+    
+    response = client.post("/analyze", json={"text": SAMPLE_RESUME}, headers={"Origin": "http://localhost:3000"})
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) > 0
+    # Browsers can only read the 429 and Retry-After when CORS headers are present
+    assert response.headers["access-control-allow-origin"] == "http://localhost:3000"
+    assert "Retry-After" in response.headers["access-control-expose-headers"]
+    # Polling and health checks are never limited
+    assert client.get("/health").status_code == 200
+    assert 'resumescore_admission_rejections_total{reason="rate"} 1' in client.get("/metrics").text
+
+def test_rate_limit_charges_batch_items_and_pages(monkeypatch):
+    """Test that batches and tasks are charged per item and per PDF page read"""
+    monkeypatch.setattr(main.admission, "rate", 0.01)
+    monkeypatch.setattr(main.admission, "burst", 10)
+    monkeypatch.setattr(main, "RATE_LIMIT_TOKENS_PER_PAGE", 4)
+    texts = [f"{SAMPLE_RESUME}\nReference {i}" for i in range(10)]
+    assert client.post("/analyze/batch", json={"texts": texts}).status_code == 200
+    assert client.post("/analyze", json={"text": SAMPLE_RESUME}).status_code == 429
+    
+    main.admission.reset()
+    pages = [SAMPLE_RESUME[:len(SAMPLE_RESUME) // 2], SAMPLE_RESUME[len(SAMPLE_RESUME) // 2:]]
+    with TestClient(app) as task_client:
+        files = [("files", ("resume.pdf", make_pdf(pages), "application/pdf"))]
+        task_id = task_client.post("/tasks/files", files=files).json()["task_id"]
+        task_client.get(f"/tasks/{task_id}/events")
+        assert task_client.post("/analyze", json={"text": SAMPLE_RESUME}).status_code == 429
+
+def test_admin_memory_report(monkeypatch):
+    """Test the opt-in tracemalloc report and per-request peak memory"""
+    monkeypatch.setattr(main, "ADMIN_TOKEN", "secret")
+    admin = {"X-Admin-Token": "secret"}
+    assert client.get("/admin/memory", headers=admin).status_code == 404
+    main.memory_profiler.start()
+    try:
+        client.post("/analyze", json={"text": SAMPLE_RESUME})
+        response = client.get("/admin/memory?limit=5", headers=admin)
+        assert response.status_code == 200
+        report = response.json()
+        assert report["compared_to_baseline"] is True
+        assert 0 < len(report["top"]) <= 5
+        assert {"location", "size_bytes", "size_diff_bytes"} <= set(report["top"][0])
+        assert client.get("/admin/memory?group_by=nope", headers=admin).status_code == 400
+        assert client.post("/admin/memory/baseline", headers=admin).status_code == 200
+        assert "resumescore_request_peak_memory_bytes_count{file_type=\"text\"} 1" in client.get("/metrics").text
+        
+        assert client.get("/admin/memory").status_code == 403
+        assert client.get("/admin/memory", headers={"X-Admin-Token": "wrong"}).status_code == 403
+        # Without a configured token admin endpoints are closed, not open
+        monkeypatch.setattr(main, "ADMIN_TOKEN", None)
+        assert client.get("/admin/memory", headers=admin).status_code == 403
+    finally:
+        main.memory_profiler.stop()
+
+def test_overlapping_measurements_keep_their_peaks():
+    """Test that a measurement starting inside another does not reset the outer one's peak"""
+    profiler = main.MemoryProfiler()
+    profiler.start()
+    try:
+        with profiler.measure() as outer:
+            block = bytearray(1 << 20)
+            del block
+            with profiler.measure():
+                pass
+        assert outer.bytes >= 1 << 19
+    finally:
+        profiler.stop()
+
+def test_metrics_endpoint():
+    """Test that stage timings and errors are exported on /metrics"""
+    client.post("/analyze", json={"text": SAMPLE_RESUME})
+    client.post("/analyze", json={"text": "Short text"})
+    
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    body = response.text
+    assert 'resumescore_stage_duration_seconds_count{stage="tokenize",file_type="text"}' in body
+    assert 'resumescore_analysis_errors_total{endpoint="/analyze",status="400"}' in body
+    assert 'resumescore_cache_misses_total{cache="analysis"}' in body
+    assert "resumescore_queue_depth 0" in body
+
+def test_server_timing_header(monkeypatch):
+    """Test the optional Server-Timing breakdown"""
+    monkeypatch.setattr(main, "SERVER_TIMING", True)
+    files = {"file": ("resume.txt", SAMPLE_RESUME.encode(), "text/plain")}
+    response = client.post("/analyze/file", files=files)
+    assert response.status_code == 200
+    stages = [part.split(";")[0] for part in response.headers["server-timing"].split(", ")]
+    assert {"upload", "extract", "tokenize", "keywords", "total"} <= set(stages)
+
 if __name__ == "__main__":
-    pytest.main([__file__])
\ No newline at end of file
+    pytest.main([__file__])
+JOB_DESCRIPTION = "Python developer with PostgreSQL, Docker and AWS experience. Kubernetes is a plus."
+
+def test_match_endpoint_ranks_resumes():
+    """Test ranking inline resumes against a job description"""
+    response = client.post("/match", json={
+        "job_description": JOB_DESCRIPTION,
+        "resumes": ["Sales manager focused on negotiation", SAMPLE_RESUME]
+    })
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [item["index"] for item in results] == [1, 0]
+    assert results[0]["relevance_score"] > results[1]["relevance_score"]
+    assert "postgresql" in results[0]["matched_terms"]
+    assert "kubernetes" in results[0]["missing_terms"]
+
+def test_registered_job_matching():
+    """Test registering a job once and matching resumes against its stored vector"""
+    response = client.post("/jobs", json={"job_description": JOB_DESCRIPTION})
+    assert response.status_code == 200
+    job_id = response.json()["job_id"]
+    assert response.json()["term_count"] > 0
+    assert client.post("/jobs", json={"job_description": JOB_DESCRIPTION}).json()["job_id"] == job_id
+    
+    response = client.post(f"/jobs/{job_id}/match", json={"resumes": [SAMPLE_RESUME] * 3})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["job_id"] == job_id
+    assert len({item["relevance_score"] for item in data["results"]}) == 1
+
+def test_match_errors():
+    """Test validation of matching requests"""
+    assert client.post("/match", json={"job_description": " ", "resumes": ["x"]}).status_code == 400
+    assert client.post("/match", json={"job_description": JOB_DESCRIPTION, "resumes": []}).status_code == 400
+    assert client.post("/jobs", json={"job_description": "the and of"}).status_code == 400
+    assert client.post("/jobs/unknown/match", json={"resumes": ["x"]}).status_code == 404
+
+def test_background_task_flow():
+    """Test submitting a task, streaming its progress and fetching the results"""
+    with TestClient(app) as task_client:
+        response = task_client.post("/tasks?priority=2", json={"texts": [SAMPLE_RESUME, "short"]})
+        assert response.status_code == 202
+        task_id = response.json()["task_id"]
+        assert response.headers["location"] == f"/tasks/{task_id}"
+        
+        events = task_client.get(f"/tasks/{task_id}/events")
+        snapshots = [json.loads(line) for line in events.text.splitlines()]
+        assert snapshots[-1]["status"] == "succeeded"
+        assert snapshots[-1]["completed"] == 2
+        
+        results = task_client.get(f"/tasks/{task_id}/result").json()["results"]
+        assert results[0]["result"]["overall_score"] > 0
+        assert results[1]["error"]
+        assert task_client.delete(f"/tasks/{task_id}").json()["status"] == "succeeded"
+
+def test_background_task_errors(monkeypatch):
+    """Test task lookups, unfinished results and a full task queue"""
+    with TestClient(app) as task_client:
+        assert task_client.get("/tasks/missing").status_code == 404
+        assert task_client.post("/tasks", json={"texts": []}).status_code == 400
+        
+        monkeypatch.setitem(main.task_queue._tasks, "pending", Task(id="pending", priority=0, total=1, payload=None))
+        assert task_client.get("/tasks/pending/result").status_code == 409
+        assert task_client.get("/tasks/pending").json()["status"] == "queued"
+        
+        monkeypatch.setattr(main.task_queue, "max_pending", 0)
+        response = task_client.post("/tasks", json={"texts": [SAMPLE_RESUME]})
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "5"
+
+def test_batch_leaves_an_executor_worker_free(monkeypatch):
+    """Test that a batch runs at most BATCH_MAX_IN_FLIGHT chunks at once"""
+    import threading
+    import time
+    running, peak, lock = [0], [0], threading.Lock()
+    
+    def slow_batch(items):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+        return [{'error': 'skipped'}] * len(items)
+    
+    executor = AnalysisExecutor(mode="thread", max_workers=3)
+    monkeypatch.setattr(main, "run_analysis_batch", slow_batch)
+    monkeypatch.setattr(main, "BATCH_CHUNK_SIZE", 1)
+    monkeypatch.setattr(main, "BATCH_MAX_IN_FLIGHT", 2)
+    monkeypatch.setattr(main, "analysis_executor", executor)
+    try:
+        response = client.post("/analyze/batch", json={"texts": [SAMPLE_RESUME + str(i) for i in range(6)]})
+    finally:
+        executor.shutdown()
+    assert response.status_code == 200
+    assert peak[0] == 2
+
+def test_score_batch_stops_chunks_when_closed(monkeypatch):
+    """Test that chunks not yet started are cancelled once the consumer stops"""
+    import time
+    calls = []
+    
+    def slow_batch(items):
+        calls.append(len(items))
+        time.sleep(0.05)
+        return [{'error': 'skipped'}] * len(items)
+    
+    monkeypatch.setattr(main, "run_analysis_batch", slow_batch)
+    monkeypatch.setattr(main, "BATCH_CHUNK_SIZE", 1)
+    executor = AnalysisExecutor(mode="thread", max_workers=2)
+    monkeypatch.setattr(main, "analysis_executor", executor)
+    items = [(None, SAMPLE_RESUME + f" Item {i}.") for i in range(20)]
+    
+    async def consume_one():
+        batch = main.score_batch(items, [None] * len(items))
+        await batch.__anext__()
+        await batch.aclose()
+        await asyncio.sleep(0.3)
+    try:
+        asyncio.run(consume_one())
+    finally:
+        executor.shutdown()
+    assert len(calls) <= 4
+
+def test_edit_session_matches_full_analysis():
+    """Test that incremental session scores equal a full /analyze of the same text"""
+    response = client.post("/sessions", json={"text": SAMPLE_RESUME})
+    assert response.status_code == 200
+    data = response.json()
+    session_id = data["session_id"]
+    assert data["result"] == client.post("/analyze", json={"text": SAMPLE_RESUME}).json()
+    
+    offset = SAMPLE_RESUME.index("Django")
+    response = client.patch(f"/sessions/{session_id}", json={
+        "revision": 0,
+        "edits": [{"start": offset, "end": offset + len("Django"), "text": "FastAPI"}]
+    })
+    edited = SAMPLE_RESUME.replace("Django", "FastAPI")
+    assert response.json()["revision"] == 1
+    assert response.json()["result"] == client.post("/analyze", json={"text": edited}).json()
+    assert main.edit_sessions.get(session_id).analyzed == 1
+
+def test_edit_session_without_blank_lines_reuses_other_sections():
+    """Test that a resume with no blank lines is re-analyzed one heading section at a time"""
+    text = "\n".join(line for line in SAMPLE_RESUME.splitlines() if line.strip())
+    session_id = client.post("/sessions", json={"text": text}).json()["session_id"]
+    offset = text.index("Django")
+    response = client.patch(f"/sessions/{session_id}", json={
+        "revision": 0,
+        "edits": [{"start": offset, "end": offset + len("Django"), "text": "FastAPI"}]
+    })
+    session = main.edit_sessions.get(session_id)
+    assert (session.analyzed, session.reused > 1) == (1, True)
+    edited = text.replace("Django", "FastAPI")
+    assert response.json()["result"] == client.post("/analyze", json={"text": edited}).json()
+
+def test_edit_session_matches_keywords_per_block(monkeypatch):
+    """Test that a session edit only matches keywords in the changed block"""
+    session_id = client.post("/sessions", json={"text": SAMPLE_RESUME}).json()["session_id"]
+    matched = []
+    iter_matches = KeywordMatcher.iter_matches
+    monkeypatch.setattr(KeywordMatcher, "iter_matches",
+                        lambda self, text: matched.append(text) or iter_matches(self, text))
+    offset = SAMPLE_RESUME.index("Django")
+    result = client.patch(f"/sessions/{session_id}", json={
+        "revision": 0,
+        "edits": [{"start": offset, "end": offset + len("Django"), "text": "Kubernetes"}]
+    }).json()["result"]
+    assert len(matched) == 1 and "kubernetes" in matched[0] and len(matched[0]) < len(SAMPLE_RESUME)
+    assert any(hit['term'] == "kubernetes" for section in result['sections'] for hit in section['keywords'])
+
+def test_edit_session_charges_changed_text(monkeypatch):
+    """Test that full-text session replacements are rate limited like /analyze while keystrokes stay cheap"""
+    monkeypatch.setattr(main.admission, "rate", 0.01)
+    monkeypatch.setattr(main.admission, "burst", 10)
+    session_id = client.post("/sessions", json={"text": SAMPLE_RESUME}).json()["session_id"]
+    end = len(SAMPLE_RESUME.strip())
+    for revision in range(30):
+        response = client.patch(f"/sessions/{session_id}", json={
+            "revision": revision, "edits": [{"start": end, "end": end, "text": "!"}]
+        })
+        assert response.status_code == 200
+        end += 1
+    
+    statuses = []
+    for revision in range(30, 45):
+        text = f"{SAMPLE_RESUME}\nRevision {revision}"
+        statuses.append(client.patch(f"/sessions/{session_id}", json={"revision": revision, "text": text}).status_code)
+        if statuses[-1] != 200:
+            break
+    assert statuses[-1] == 429 and len(statuses) < 15
+
+def test_edit_session_errors():
+    """Test stale revisions, bad edits, short text and unknown sessions"""
+    session_id = client.post("/sessions", json={"text": SAMPLE_RESUME}).json()["session_id"]
+    assert client.patch(f"/sessions/{session_id}", json={"revision": 5, "edits": []}).status_code == 409
+    bad_edit = {"revision": 0, "edits": [{"start": 0, "end": 10**6, "text": ""}]}
+    assert client.patch(f"/sessions/{session_id}", json=bad_edit).status_code == 400
+    
+    data = client.patch(f"/sessions/{session_id}", json={"revision": 0, "text": "too short"}).json()
+    assert data["result"] is None
+    assert data["error"] == "Resume text too short for meaningful analysis"
+    
+    assert client.delete(f"/sessions/{session_id}").status_code == 204
+    assert client.get(f"/sessions/{session_id}").status_code == 404
+
+def test_scoring_config_hot_reload(tmp_path, monkeypatch):
+    """Test that a reloaded config changes scores, versions and cache keys"""
+    with open(main.SCORING_CONFIG_PATH) as f:
+        data = json.load(f)
+    before = client.post("/analyze", json={"text": SAMPLE_RESUME}).json()
+    assert before["config_version"] == data["version"]
+    assert client.get("/config").json()["version"] == data["version"]
+    
+    data.update(version="test-2", weights={"grammar": 0, "readability": 0, "keywords": 0, "structure": 1})
+    path = tmp_path / "scoring.json"
+    path.write_text(json.dumps(data))
+    monkeypatch.setattr(main.scoring_config, "path", str(path))
+    monkeypatch.setattr(main.scoring_config, "_config", main.scoring_config.current())
+    
+    monkeypatch.setattr(main, "ADMIN_TOKEN", "secret")
+    admin = {"X-Admin-Token": "secret"}
+    assert client.post("/config/reload", headers=admin).json()["version"] == "test-2"
+    after = client.post("/analyze", json={"text": SAMPLE_RESUME}).json()
+    assert after["config_version"] == "test-2"
+    assert after["overall_score"] == after["breakdown"]["structure"]
+    
+    path.write_text(json.dumps({**data, "weights": {}}))
+    assert client.post("/config/reload", headers=admin).status_code == 400
+    assert client.get("/config").json()["version"] == "test-2"
+    
+    assert client.post("/config/reload").status_code == 403
+    monkeypatch.setattr(main, "ADMIN_TOKEN", None)
+    assert client.post("/config/reload", headers=admin).status_code == 403
@@ -0,0 +1,53 @@
+from matching import JobIndex, extract_terms, match_job_description
+
+STOP_WORDS = frozenset(['and', 'with', 'the', 'in', 'of', 'a'])
+
+JOB = "Senior Python engineer with Kubernetes and machine learning experience. Python and AWS required."
+
+def test_extract_terms_keeps_tech_tokens():
+    """Test that punctuated tech terms survive tokenization and bigrams skip stop words"""
+    terms = extract_terms("Node.js, C++ and CI/CD. Machine learning in the cloud.", STOP_WORDS)
+    assert {'node.js', 'c++', 'ci/cd', 'machine learning'} <= set(terms)
+    assert 'and' not in terms
+
+def test_relevance_orders_resumes():
+    """Test that closer resumes score higher and report matched and missing terms"""
+    index = JobIndex.build(JOB, STOP_WORDS)
+    strong, weak, empty = index.score([
+        "Python engineer: machine learning on Kubernetes and AWS.",
+        "Accountant experienced with audits and budgeting.",
+        ""
+    ], STOP_WORDS)
+    assert strong['relevance_score'] > weak['relevance_score'] == 0
+    assert empty['relevance_score'] == 0
+    assert 'python' in strong['matched_terms']
+    assert 'kubernetes' in weak['missing_terms']
+    assert not weak['matched_terms']
+
+def test_identical_text_scores_100():
+    """Test that a resume identical to the job description is a perfect match"""
+    index = JobIndex.build(JOB, STOP_WORDS)
+    assert index.score([JOB], STOP_WORDS)[0]['relevance_score'] == 100
+
+def test_scores_independent_of_batch():
+    """Test that a registered index scores each resume the same alone or in bulk"""
+    index = JobIndex.build(JOB, STOP_WORDS, ["Python developer", "Python and AWS"])
+    resumes = ["Python and Kubernetes", "AWS machine learning", "Java"]
+    together = index.score(resumes, STOP_WORDS)
+    alone = [index.score([resume], STOP_WORDS)[0] for resume in resumes]
+    assert together == alone
+
+def test_reference_idf_downweights_common_terms():
+    """Test that terms every reference resume mentions count for less"""
+    references = ["Python developer", "Python analyst", "Python tester"]
+    index = JobIndex.build(JOB, STOP_WORDS, references)
+    weights = dict(zip(index.terms, index.weights))
+    assert weights['python'] < weights['kubernetes']
+    assert index.score(["Kubernetes"], STOP_WORDS)[0]['relevance_score'] > \
+        index.score(["Python"], STOP_WORDS)[0]['relevance_score']
+
+def test_match_job_description_one_off():
+    """Test matching without registering a job first"""
+    results = match_job_description(JOB, ["Python and AWS", "Gardening"], STOP_WORDS, top_terms=2)
+    assert results[0]['relevance_score'] > results[1]['relevance_score']
+    assert len(results[1]['missing_terms']) == 2
@@ -0,0 +1,53 @@
+import pytest
+from metrics import Registry, StageTimer, call_timed
+
+def test_histogram_render():
+    """Test cumulative buckets, sum and count in the text format"""
+    registry = Registry()
+    histogram = registry.histogram("latency_seconds", "Latency", ("stage",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, stage="parse")
+    histogram.observe(0.5, stage="parse")
+    histogram.observe(5, stage="parse")
+    
+    lines = registry.render().splitlines()
+    assert "# TYPE latency_seconds histogram" in lines
+    assert 'latency_seconds_bucket{stage="parse",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{stage="parse",le="1"} 2' in lines
+    assert 'latency_seconds_bucket{stage="parse",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{stage="parse"} 3' in lines
+    assert histogram.count(stage="parse") == 3
+
+def test_counter_and_collector():
+    """Test counters, label validation and scrape-time collectors"""
+    registry = Registry()
+    errors = registry.counter("errors_total", "Errors", ("status",))
+    depth = registry.gauge("depth", "Depth")
+    registry.add_collector(lambda: depth.set(7))
+    errors.inc(status=400)
+    errors.inc(status=400)
+    
+    with pytest.raises(ValueError):
+        errors.inc(code=500)
+    
+    output = registry.render()
+    assert 'errors_total{status="400"} 2' in output
+    assert "depth 7" in output
+
+def test_stage_timer():
+    """Test stage accumulation and the Server-Timing rendering"""
+    timer = StageTimer()
+    timer.add("extract", 0.0125)
+    timer.add("extract", 0.0125)
+    with timer.stage("tokenize"):
+        pass
+    assert timer.timings["extract"] == pytest.approx(0.025)
+    assert timer.server_timing().startswith("extract;dur=25.0, tokenize;dur=")
+
+def test_call_timed():
+    """Test that call_timed returns the result and a duration"""
+    result, seconds = call_timed(sum, [1, 2, 3])
+    assert result == 6
+    assert seconds >= 0
+
+if __name__ == "__main__":
+    pytest.main([__file__])
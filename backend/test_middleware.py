@@ -0,0 +1,77 @@
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from middleware import BodySizeLimitMiddleware, CompressionMiddleware, parse_accept_encoding
+
+app = FastAPI()
+app.add_middleware(BodySizeLimitMiddleware, max_body_bytes=10, path_limits={"/big": 1000})
+
+@app.post("/echo")
+@app.post("/big")
+async def echo(request: Request):
+    return {"size": len(await request.body())}
+
+client = TestClient(app)
+
+def test_body_within_limit():
+    """Test that small bodies pass through"""
+    response = client.post("/echo", content=b"x" * 10)
+    assert response.status_code == 200
+    assert response.json()["size"] == 10
+
+def test_declared_content_length_rejected():
+    """Test rejection based on Content-Length before reading the body"""
+    response = client.post("/echo", content=b"x" * 11)
+    assert response.status_code == 413
+
+def test_streamed_body_rejected():
+    """Test rejection of a chunked body once it crosses the limit"""
+    def chunks():
+        for _ in range(5):
+            yield b"xxxx"
+    response = client.post("/echo", content=chunks())
+    assert response.status_code == 413
+
+def test_path_specific_limit():
+    """Test that per-path limits override the default"""
+    response = client.post("/big", content=b"x" * 500)
+    assert response.status_code == 200
+
+compressed_app = FastAPI()
+compressed_app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+@compressed_app.get("/text/{size}")
+async def text(size: int):
+    return {"text": "x" * size}
+
+@compressed_app.get("/stream")
+async def stream():
+    async def lines():
+        for _ in range(3):
+            yield b"y" * 200 + b"\n"
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+compressed_client = TestClient(compressed_app)
+
+def test_large_response_gzipped():
+    """Test that responses over the threshold are gzip encoded when accepted"""
+    response = compressed_client.get("/text/500", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < 500
+    assert response.json()["text"] == "x" * 500
+
+def test_small_streamed_and_unaccepted_responses_not_compressed():
+    """Test the size threshold, streamed bodies and clients that refuse gzip"""
+    assert "content-encoding" not in compressed_client.get("/text/10", headers={"Accept-Encoding": "gzip"}).headers
+    assert "content-encoding" not in compressed_client.get("/stream", headers={"Accept-Encoding": "gzip"}).headers
+    response = compressed_client.get("/text/500", headers={"Accept-Encoding": "gzip;q=0, identity"})
+    assert "content-encoding" not in response.headers
+
+def test_parse_accept_encoding():
+    """Test q-value parsing of Accept-Encoding"""
+    assert parse_accept_encoding("br;q=0.5, GZIP, *;q=0") == {"br": 0.5, "gzip": 1.0, "*": 0.0}
+
+if __name__ == "__main__":
+    pytest.main([__file__])
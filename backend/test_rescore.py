@@ -0,0 +1,91 @@
+import pytest
+import json
+import tarfile
+import zipfile
+import pandas as pd
+import rescore
+from benchmarks.fixtures import resume_docx, synthetic_resume
+
+def write_jsonl(path, count):
+    with open(path, "w") as f:
+        for i in range(count):
+            f.write(json.dumps({"id": f"r{i}", "text": synthetic_resume(8, seed=i)}) + "\n")
+        f.write("not json\n")
+    return str(path)
+
+def test_sources(tmp_path):
+    """Test reading resumes from a directory, a zip archive and a JSONL file"""
+    folder = tmp_path / "resumes"
+    (folder / "nested").mkdir(parents=True)
+    (folder / "a.txt").write_text(synthetic_resume(8))
+    (folder / "nested" / "b.docx").write_bytes(resume_docx(synthetic_resume(8, seed=1)))
+    (folder / "notes.md").write_text("ignored")
+    assert [key for key, _, _ in rescore.iter_source(str(folder))] == ["a.txt", "nested/b.docx"]
+    
+    archive = tmp_path / "resumes.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("one.txt", "text")
+        zf.writestr("skip.png", b"")
+    records = [(key, load()) for key, _, load in rescore.iter_source(str(archive))]
+    assert records == [("one.txt", b"text")]
+    
+    bundle = tmp_path / "resumes.tar.gz"
+    with tarfile.open(bundle, "w:gz") as tf:
+        tf.add(folder / "a.txt", arcname="a.txt")
+        tf.add(folder / "notes.md", arcname="notes.md")
+    records = [(key, load()) for key, _, load in rescore.iter_source(str(bundle))]
+    assert records == [("a.txt", (folder / "a.txt").read_bytes())]
+    
+    keys = [key for key, _, _ in rescore.iter_source(write_jsonl(tmp_path / "r.jsonl", 2))]
+    assert keys == ["r0", "r1", "3"]
+
+def test_rescore_to_csv(tmp_path):
+    """Test scoring a corpus in-process, including per-record errors"""
+    output = str(tmp_path / "scores.csv")
+    stats = rescore.rescore(write_jsonl(tmp_path / "r.jsonl", 3), output, workers=0, chunk_size=2)
+    assert stats == {"skipped": 0, "scored": 4, "errors": 1}
+    
+    frame = pd.read_csv(output)
+    assert list(frame["key"].astype(str)) == ["r0", "r1", "r2", "4"]
+    assert frame["overall_score"][:3].notna().all()
+    assert frame["error"][3].startswith("Unable to read resume")
+    with open(output) as f:
+        assert f.read().splitlines()[1].split(",")[1].isdigit()
+    assert rescore.to_frame([rescore.to_row("x", {"error": "failed"})])["overall_score"].dtype == "Int64"
+
+def test_resume_after_interruption(tmp_path, monkeypatch):
+    """Test that a rerun continues from the checkpoint without duplicate rows"""
+    source = write_jsonl(tmp_path / "r.jsonl", 5)
+    output = str(tmp_path / "scores.csv")
+    calls = []
+    real_batch = rescore.run_analysis_batch
+    
+    def crash_on_third_chunk(items):
+        calls.append(items)
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+        return real_batch(items)
+    
+    monkeypatch.setattr(rescore, "run_analysis_batch", crash_on_third_chunk)
+    with pytest.raises(KeyboardInterrupt):
+        rescore.rescore(source, output, workers=0, chunk_size=1, flush_every=2)
+    monkeypatch.setattr(rescore, "run_analysis_batch", real_batch)
+    
+    stats = rescore.rescore(source, output, workers=0, chunk_size=1, flush_every=2)
+    assert stats["skipped"] == 2
+    assert list(pd.read_csv(output)["key"].astype(str)) == ["r0", "r1", "r2", "r3", "r4", "6"]
+
+def test_rescore_with_worker_processes(tmp_path):
+    """Test that worker processes produce the same scores as in-process scoring"""
+    source = write_jsonl(tmp_path / "r.jsonl", 4)
+    rescore.rescore(source, str(tmp_path / "inline.csv"), workers=0)
+    rescore.rescore(source, str(tmp_path / "pool.csv"), workers=2, chunk_size=1)
+    assert pd.read_csv(tmp_path / "inline.csv").equals(pd.read_csv(tmp_path / "pool.csv"))
+
+def test_checkpoint_from_other_source(tmp_path):
+    """Test that a checkpoint is not reused for a different source"""
+    output = str(tmp_path / "scores.csv")
+    rescore.rescore(write_jsonl(tmp_path / "a.jsonl", 1), output, workers=0)
+    with pytest.raises(ValueError):
+        rescore.rescore(write_jsonl(tmp_path / "b.jsonl", 1), output, workers=0)
+    assert rescore.rescore(str(tmp_path / "b.jsonl"), output, workers=0, restart=True)["skipped"] == 0
@@ -0,0 +1,53 @@
+import pytest
+import resources
+
+@pytest.fixture(autouse=True)
+def restore_status():
+    """Keep the module's readiness state intact across tests"""
+    saved = dict(resources.resource_status)
+    yield
+    resources.resource_status.clear()
+    resources.resource_status.update(saved)
+    resources.get_stop_words.cache_clear()
+
+def test_offline_never_downloads(monkeypatch):
+    """Test that offline startup reports missing data without downloading"""
+    def fail_download(*args, **kwargs):
+        raise AssertionError("offline mode must not download")
+    monkeypatch.setattr(resources.nltk, "download", fail_download)
+    monkeypatch.setattr(resources, "find_nltk_resource", lambda path: None)
+    
+    status = resources.ensure_nltk_resources(offline=True)
+    assert status == {"punkt": "missing", "stopwords": "missing"}
+    assert not resources.is_ready()
+
+def test_present_resources_skip_download(monkeypatch):
+    """Test that resources already on disk are not downloaded again"""
+    def fail_download(*args, **kwargs):
+        raise AssertionError("resource is already present")
+    monkeypatch.setattr(resources.nltk, "download", fail_download)
+    monkeypatch.setattr(resources, "find_nltk_resource", lambda path: "/data/" + path)
+    monkeypatch.setattr(resources, "_verify_tokenizers", lambda: None)
+    
+    resources.ensure_nltk_resources(offline=False)
+    assert resources.is_ready()
+
+def test_broken_tokenizer_is_not_ready(monkeypatch):
+    """Test that a punkt model that fails to load is reported as an error"""
+    def broken():
+        raise LookupError("corrupt model")
+    monkeypatch.setattr(resources, "find_nltk_resource", lambda path: "/data/" + path)
+    monkeypatch.setattr(resources, "_verify_tokenizers", broken)
+    
+    status = resources.ensure_nltk_resources(offline=True)
+    assert status["punkt"].startswith("error")
+    assert not resources.is_ready()
+
+def test_stop_words_fallback():
+    """Test the built-in stop words when the corpus is unavailable"""
+    resources.resource_status["stopwords"] = "missing"
+    resources.get_stop_words.cache_clear()
+    assert resources.get_stop_words() == resources.FALLBACK_STOP_WORDS
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,63 @@
+import pytest
+import json
+import os
+from scoring_config import DEFAULT_CONFIG_PATH, ConfigError, ConfigStore, ScoringConfig
+
+def default_data():
+    with open(DEFAULT_CONFIG_PATH) as f:
+        return json.load(f)
+
+def write_config(path, **changes):
+    data = {**default_data(), **changes}
+    path.write_text(json.dumps(data))
+    return str(path)
+
+def test_default_config_compiles():
+    """Test that the shipped config loads into compiled matchers"""
+    config = ScoringConfig.load(DEFAULT_CONFIG_PATH)
+    assert config.email_pattern.search("jane@example.com")
+    assert config.keyword_matcher.match("led python work")["action_verbs"]["led"] == 1
+    assert sum(config.weights.values()) == pytest.approx(1.0)
+    with pytest.raises(TypeError):
+        config.weights["grammar"] = 1.0
+
+@pytest.mark.parametrize("changes", [
+    {"weights": {"grammar": 1}},
+    {"weights": {"grammar": 0, "readability": 0, "keywords": 0, "structure": 0}},
+    {"email_pattern": "(unclosed"},
+    {"sections": "experience"},
+    {"industry_keywords": {"action_verbs": ["x"]}},
+    {"version": ""},
+])
+def test_invalid_config_rejected(changes):
+    """Test that invalid configs fail validation"""
+    with pytest.raises(ConfigError):
+        ScoringConfig.from_dict({**default_data(), **changes})
+
+def test_reload_swaps_and_keeps_previous_on_error(tmp_path):
+    """Test that reload swaps in a new config but keeps the old one when the file is bad"""
+    path = tmp_path / "scoring.json"
+    store = ConfigStore(write_config(path, version="a"))
+    first = store.current()
+    
+    write_config(path, version="b")
+    assert store.reload().version == "b"
+    assert first.version == "a"
+    
+    path.write_text("{not json")
+    with pytest.raises(ConfigError):
+        store.reload()
+    assert store.current().version == "b"
+    assert store.stats()["last_error"]
+
+def test_reload_if_changed(tmp_path):
+    """Test that only a modified file triggers a reload"""
+    path = tmp_path / "scoring.json"
+    store = ConfigStore(write_config(path, version="a"))
+    assert not store.reload_if_changed()
+    
+    write_config(path, version="b")
+    os.utime(path, (1, 1))
+    assert store.reload_if_changed()
+    assert store.current().version == "b"
+    assert store.reloads == 1
@@ -0,0 +1,61 @@
+import main
+from document import parse_document
+from sections import SectionIndex
+
+RESUME = """Jane Roe
+jane@example.com
+
+Work Experience:
+• Led migration of billing services to Python.
+Developed skills in leadership and project planning across teams.
+
+Education
+B.S. Computer Science
+
+Skills & Tools
+• Python, Docker, SQL"""
+
+def test_section_index_uses_headings_only():
+    """Test that sections start at heading lines, not at any mention of a section name"""
+    config = main.scoring_config.current()
+    index = SectionIndex.build(parse_document(RESUME), config.sections, config.bullet_prefixes)
+    assert [section.name for section in index] == ["experience", "education", "skills"]
+    experience, education, skills = index
+    assert RESUME[experience.start:].startswith("Work Experience:")
+    assert experience.end == education.start and skills.end == len(RESUME)
+    assert index.find(RESUME.index("leadership")) == 0
+    assert index.find(RESUME.index("jane@")) is None
+
+def test_document_span_keeps_sentences():
+    """Test that a span of the document holds the sentences starting inside it"""
+    doc = parse_document(RESUME)
+    start = RESUME.index("Education")
+    part = doc.span(start, RESUME.index("Skills &"))
+    assert part.text.startswith("Education")
+    assert part.word_count == sum(part.sentence_words) > 0
+    assert sum(doc.span(0, start).sentence_words) + part.word_count + \
+        doc.span(RESUME.index("Skills &"), len(RESUME)).word_count == doc.word_count
+
+def test_section_scores_and_spans():
+    """Test per-section scores with offsets of keywords and action verbs"""
+    result = main.run_analysis(RESUME)
+    sections = {section['name']: section for section in result['sections']}
+    assert set(sections) == {"experience", "education", "skills"}
+    experience = sections["experience"]
+    assert set(experience['scores']) == {"grammar", "readability", "keywords"}
+    assert [RESUME[verb['start']:verb['end']] for verb in experience['action_verbs']] == ["Led", "Developed"]
+    skills = [RESUME[hit['start']:hit['end']] for hit in sections["skills"]['keywords']]
+    assert skills == ["Python", "Docker", "SQL"]
+    assert "technology" in sections["skills"]['keywords'][0]['categories']
+
+def test_sections_without_blank_lines_get_their_sentences():
+    """Test that a heading right under the previous section's text still starts its own sentences"""
+    text = RESUME.replace("\n\n", "\n").replace("• ", "")
+    result = main.run_analysis(text)
+    sections = {section['name']: section for section in result['sections']}
+    assert set(sections) == {"experience", "education", "skills"}
+    for section in sections.values():
+        assert set(section['scores']) == {"grammar", "readability", "keywords"}
+    doc = parse_document(text, "nltk", main.scoring_config.current().heading_name)
+    education = text.index("Education")
+    assert education in doc.sentence_starts and text.index("Skills &") in doc.sentence_starts
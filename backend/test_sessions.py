@@ -0,0 +1,45 @@
+import pytest
+from sessions import EditError, EditSession
+
+def test_apply_edits_in_order():
+    """Test that each edit applies to the text left by the previous one"""
+    session = EditSession("hello world")
+    session.apply([(0, 5, "goodbye"), (8, 13, "moon")])
+    assert session.text == "goodbye moon"
+    assert session.revision == 1
+
+def test_invalid_edit_leaves_text_unchanged():
+    """Test that an out-of-range edit is rejected without partial changes"""
+    session = EditSession("hello")
+    with pytest.raises(EditError):
+        session.apply([(0, 1, "J"), (3, 99, "")])
+    assert session.text == "hello"
+    assert session.revision == 0
+
+def test_only_changed_blocks_are_analyzed():
+    """Test that block state is reused for blocks an edit did not touch"""
+    analyzed = []
+    def analyze(block):
+        analyzed.append(block)
+        return block.upper()
+    
+    session = EditSession("")
+    assert session.block_states("one\n\ntwo\n\nthree", analyze) == ["ONE\n\n", "TWO\n\n", "THREE"]
+    analyzed.clear()
+    
+    assert session.block_states("one\n\ntwo!\n\nthree", analyze) == ["ONE\n\n", "TWO!\n\n", "THREE"]
+    assert analyzed == ["two!\n\n"]
+    assert (session.reused, session.analyzed) == (2, 1)
+    
+    session.block_states("one\n\ntwo!\n\nthree", analyze, version="2")
+    assert session.analyzed == 3
+
+def test_blocks_end_at_headings_without_blank_lines():
+    """Test that text with no blank lines is still cached per heading section"""
+    heading_name = lambda line: line.lower() if line.isupper() else None
+    session = EditSession("")
+    text = "SKILLS\nPython\nEXPERIENCE\nEngineer\nEDUCATION\nBSc"
+    assert session.block_states(text, str.upper, heading_name=heading_name) == [
+        "SKILLS\nPYTHON\n", "EXPERIENCE\nENGINEER\n", "EDUCATION\nBSC"]
+    session.block_states(text.replace("Engineer", "Lead engineer"), str.upper, heading_name=heading_name)
+    assert (session.reused, session.analyzed) == (2, 1)
@@ -0,0 +1,102 @@
+import pytest
+import asyncio
+from tasks import TaskQueue, TaskQueueFullError
+
+async def echo_runner(task):
+    """Yield each payload item after an optional per-item delay"""
+    delay, items = task.payload
+    for item in items:
+        await asyncio.sleep(delay)
+        yield item
+
+async def wait_finished(queue, task):
+    async for _ in queue.watch(task):
+        pass
+    return task
+
+def test_priority_order():
+    """Test that higher-priority tasks run before earlier, lower-priority ones"""
+    order = []
+    
+    async def recording_runner(task):
+        order.append(task.payload)
+        yield task.payload
+    
+    async def scenario():
+        queue = TaskQueue(recording_runner, workers=1)
+        queue.start()
+        tasks = [queue.submit(name, total=1, priority=priority)
+                 for name, priority in [("low", 0), ("high", 5), ("normal", 1)]]
+        for task in tasks:
+            await wait_finished(queue, task)
+        await queue.stop()
+    
+    asyncio.run(scenario())
+    assert order == ["high", "normal", "low"]
+
+def test_progress_and_results():
+    """Test that watchers see progress until the task succeeds"""
+    async def scenario():
+        queue = TaskQueue(echo_runner)
+        queue.start()
+        task = queue.submit((0, [1, 2, 3]), total=3)
+        snapshots = [snapshot async for snapshot in queue.watch(task)]
+        await queue.stop()
+        return task, snapshots
+    
+    task, snapshots = asyncio.run(scenario())
+    assert task.status == "succeeded"
+    assert task.results == [1, 2, 3]
+    assert task.payload is None
+    assert snapshots[-1]["completed"] == 3
+    assert snapshots[0]["status"] == "queued"
+
+def test_cancel_queued_and_running():
+    """Test cancelling a running task and a task still waiting for a worker"""
+    async def scenario():
+        queue = TaskQueue(echo_runner, workers=1)
+        queue.start()
+        running = queue.submit((10, [1]), total=1)
+        waiting = queue.submit((0, [1]), total=1)
+        await asyncio.sleep(0.01)
+        assert running.status == "running"
+        queue.cancel(waiting.id)
+        queue.cancel(running.id)
+        await wait_finished(queue, running)
+        await queue.stop()
+        return running, waiting
+    
+    running, waiting = asyncio.run(scenario())
+    assert running.status == waiting.status == "cancelled"
+    assert not waiting.results
+
+def test_bounded_queue_and_expiry():
+    """Test that submissions beyond max_pending are refused and results expire"""
+    async def scenario():
+        queue = TaskQueue(echo_runner, max_pending=1, result_ttl=0)
+        queue.start()
+        task = queue.submit((0, [1]), total=1)
+        with pytest.raises(TaskQueueFullError):
+            queue.submit((0, [1]), total=1)
+        await wait_finished(queue, task)
+        assert queue.get(task.id) is None
+        await queue.stop()
+    
+    asyncio.run(scenario())
+
+def test_failed_runner():
+    """Test that runner errors mark the task failed without stopping the worker"""
+    async def failing_runner(task):
+        raise ValueError("boom")
+        yield
+    
+    async def scenario():
+        queue = TaskQueue(failing_runner)
+        queue.start()
+        first = await wait_finished(queue, queue.submit(None, total=1))
+        second = await wait_finished(queue, queue.submit(None, total=1))
+        await queue.stop()
+        return first, second
+    
+    first, second = asyncio.run(scenario())
+    assert first.status == second.status == "failed"
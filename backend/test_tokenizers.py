@@ -0,0 +1,53 @@
+import json
+import pytest
+import compare_tokenizers
+from benchmarks.fixtures import synthetic_resume
+from document import parse_document
+from tokenizers import fast_sentences, resolve_tokenizer
+
+def test_fast_tokenizer_splits_bullets():
+    """Test that bullets end each other's sentences while headings stay attached"""
+    block = ("EXPERIENCE\n"
+             "• Led a team at Acme Inc. and shipped v2.0 to the U.S. market.\n"
+             "• Built data pipelines\n"
+             "• Mentored engineers, e.g. new hires. Ran hiring!")
+    starts, sentences = zip(*fast_sentences(block))
+    assert block[starts[1]:].startswith("• Built") and block[starts[3]:].startswith("Ran hiring")
+    assert sentences[0][:3] == ["EXPERIENCE", "•", "Led"]
+    assert sentences[0][-3:] == ["U.S.", "market", "."]
+    assert sentences[1] == ["•", "Built", "data", "pipelines"]
+    assert sentences[2][-2:] == ["hires", "."]
+    assert sentences[3] == ["Ran", "hiring", "!"]
+
+def test_fast_tokenizer_splits_unpunctuated_bullets_under_heading():
+    """Test that bullet fragments without closing punctuation stay separate sentences"""
+    block = "EXPERIENCE\n• Led migration of billing\n• Built data pipelines\n• Mentored engineers"
+    sentences = [tokens for _, tokens in fast_sentences(block)]
+    assert sentences == [
+        ["EXPERIENCE", "•", "Led", "migration", "of", "billing"],
+        ["•", "Built", "data", "pipelines"],
+        ["•", "Mentored", "engineers"],
+    ]
+    assert len(list(fast_sentences(block.split("\n", 1)[1]))) == 3
+
+def test_resolve_tokenizer():
+    """Test that auto falls back to the fast tokenizer without punkt"""
+    assert resolve_tokenizer("auto", punkt_ready=True) == "nltk"
+    assert resolve_tokenizer("auto", punkt_ready=False) == "fast"
+    assert resolve_tokenizer("FAST", punkt_ready=True) == "fast"
+    with pytest.raises(ValueError):
+        resolve_tokenizer("spacy", punkt_ready=True)
+
+def test_fast_tokenizer_agrees_with_nltk(tmp_path):
+    """Test that both tokenizers count the same words and close to the same sentences"""
+    text = synthetic_resume(30)
+    nltk_doc, fast_doc = parse_document(text, "nltk"), parse_document(text, "fast")
+    assert abs(fast_doc.word_count - nltk_doc.word_count) <= nltk_doc.word_count * 0.02
+    assert abs(fast_doc.sentence_count - nltk_doc.sentence_count) <= 2
+
+    corpus = tmp_path / "corpus.jsonl"
+    corpus.write_text("\n".join(json.dumps({"id": i, "text": synthetic_resume(10, seed=i)}) for i in range(5))
+                      + "\n" + json.dumps({"id": "short", "text": "too short"}))
+    report = compare_tokenizers.compare(str(corpus))
+    assert report["compared"] == 5 and report["skipped"] == 1
+    assert report["categories"]["overall"]["max_abs_diff"] <= 2
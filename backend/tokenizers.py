@@ -0,0 +1,137 @@
+"""Sentence and word tokenizers for resume text.
+
+Every tokenizer turns a block of text into the tokens of each sentence,
+punctuation included, one sentence at a time, along with the offset in
+the block where the sentence starts:
+
+- ``nltk``: punkt sentences, then ``word_tokenize`` per sentence
+- ``fast``: precompiled regular expressions that know about bullets and
+  line breaks; no NLTK data needed
+
+Resumes are mostly bullet fragments without closing punctuation, which
+punkt runs together into one long sentence. The fast tokenizer starts a
+new sentence at every bullet instead. Scores from the two can differ;
+compare them on a corpus with ``compare_tokenizers.py`` before switching.
+"""
+import re
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import nltk
+from nltk.tokenize import word_tokenize
+
+try:
+    from nltk.tokenize import _get_punkt_tokenizer
+
+    def _punkt():
+        return _get_punkt_tokenizer("english")
+except ImportError:  # NLTK < 3.9 unpickles the punkt model
+    def _punkt():
+        return nltk.data.load("tokenizers/punkt/english.pickle")
+
+# (offset of the sentence in the block, its tokens)
+Sentence = Tuple[int, List[str]]
+SentenceTokenizer = Callable[[str], Iterator[Sentence]]
+
+# A bullet marker or list number at the start of a line
+_BULLET = re.compile(r"\s*(?:[-*•◦▪▫‣⁃●○■□➢➤►✓✔–—]|\d{1,2}[.)])\s")
+# Sentence-ending punctuation (plus closing quotes or brackets) followed by whitespace
+_SENTENCE_END = re.compile(r"[.!?]+[\"'”’)\]]*\s+")
+# Roughly what word_tokenize keeps together: acronyms, hyphenated words, decimals,
+# dotted names like node.js; every other non-space character is a token of its own
+_TOKEN = re.compile(r"(?:[A-Za-z]\.){2,}|\w+(?:[-'’.&]\w+)*|\.\.\.|[^\w\s]")
+
+# Words after which a period does not end the sentence
+ABBREVIATIONS = frozenset([
+    "e.g", "i.e", "etc", "vs", "inc", "ltd", "co", "corp", "jr", "sr", "dr", "mr", "mrs", "ms",
+    "prof", "st", "no", "approx", "dept", "est", "fig", "jan", "feb", "mar", "apr", "jun",
+    "jul", "aug", "sep", "sept", "oct", "nov", "dec", "u.s", "b.s", "b.a", "m.s", "m.a", "ph.d",
+])
+
+
+def nltk_sentences(block: str) -> Iterator[Sentence]:
+    """Tokens of each punkt sentence; the same sentences ``sent_tokenize`` returns"""
+    for start, end in _punkt().span_tokenize(block):
+        yield start, word_tokenize(block[start:end])
+
+
+def _ends_sentence(text: str) -> bool:
+    """True if ``text`` ends with sentence punctuation that is not an abbreviation or initial"""
+    text = text.rstrip().rstrip("\"'”’)]")
+    if not text.endswith((".", "!", "?")):
+        return False
+    if not text.endswith("."):
+        return True
+    word = text.rsplit(None, 1)[-1].rstrip(".").lstrip("\"'(“‘[").lower()
+    return not (word in ABBREVIATIONS or (len(word) == 1 and word.isalpha()))
+
+
+def _split_line(line: str) -> Iterator[Tuple[int, str]]:
+    """Pieces of one line and their offsets, cut after each sentence end"""
+    start = 0
+    for match in _SENTENCE_END.finditer(line):
+        if _ends_sentence(line[start:match.end()]):
+            yield start, line[start:match.end()]
+            start = match.end()
+    if start < len(line):
+        yield start, line[start:]
+
+
+def fast_sentences(block: str) -> Iterator[Sentence]:
+    """Tokens of each sentence, where a bullet ends the previous bullet's sentence.
+
+    Lines without closing punctuation (headings, wrapped text) run on into
+    the next line, as they do with punkt, so a heading stays attached to
+    the first bullet under it.
+    """
+    pending: List[str] = []
+    pending_start = 0
+    bulleted = False
+    line_start = 0
+    for line in block.split("\n"):
+        bullet = _BULLET.match(line)
+        offset = line_start
+        if bullet:
+            if pending and bulleted:
+                yield pending_start, pending
+                pending = []
+            bulleted = True
+            if not pending:
+                pending_start = line_start + len(line) - len(line.lstrip())
+            pending += _TOKEN.findall(bullet.group())
+            offset += bullet.end()
+            line = line[bullet.end():]
+        for start, piece in _split_line(line):
+            tokens = _TOKEN.findall(piece)
+            if tokens and not pending:
+                pending_start = offset + start + len(piece) - len(piece.lstrip())
+            pending += tokens
+            if pending and _ends_sentence(piece):
+                yield pending_start, pending
+                pending = []
+                bulleted = False
+        line_start += len(line) + 1 + (bullet.end() if bullet else 0)
+    if pending:
+        yield pending_start, pending
+
+
+TOKENIZERS: Dict[str, SentenceTokenizer] = {
+    "nltk": nltk_sentences,
+    "fast": fast_sentences,
+}
+
+
+def get_tokenizer(name: str) -> SentenceTokenizer:
+    """The tokenizer registered under ``name``"""
+    try:
+        return TOKENIZERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown tokenizer '{name}', expected one of {sorted(TOKENIZERS)}") from None
+
+
+def resolve_tokenizer(name: str, punkt_ready: bool) -> str:
+    """Concrete tokenizer for a setting; ``auto`` is nltk when punkt is available, else fast"""
+    name = name.lower()
+    if name == "auto":
+        return "nltk" if punkt_ready else "fast"
+    get_tokenizer(name)
+    return name
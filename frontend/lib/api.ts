@@ -2,6 +2,28 @@ import axios from 'axios';
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
 
+export interface TermSpan {
+  term: string;
+  start: number;
+  end: number;
+  categories?: string[];
+}
+
+export interface SectionResult {
+  name: string;
+  heading: string;
+  start: number;
+  end: number;
+  scores: {
+    // Absent for sections without sentences
+    grammar?: number;
+    readability?: number;
+    keywords: number;
+  };
+  keywords: TermSpan[];
+  action_verbs: TermSpan[];
+}
+
 export interface AnalysisResult {
   overall_score: number;
   breakdown: {
@@ -16,6 +38,8 @@ export interface AnalysisResult {
     keywords: string;
     structure: string;
   };
+  // Character offsets into the analyzed text
+  sections?: SectionResult[];
 }
 
 export const api = axios.create({